@@ -5,10 +5,14 @@ from urllib.parse import quote
 from rdflib import Literal, Namespace
 from rdflib.compare import to_isomorphic, graph_diff
 from rdflib.namespace import RDF, XSD, DCTERMS, SOSA
-from pyKRAKEN.kraken import (FST, SDO, QUANTITYKIND, UNIT, Kraken, PhysicalObject, ObservationCollection,
-                             Observation, Quantity, Sensor, Result)
+from pyKRAKEN.kraken import (FST, SDO, QUANTITYKIND, UNIT, Kraken, KrakenPool, PhysicalObject,
+                             ObservationCollection, Observation, Quantity, Sensor, Result)
+from pyKRAKEN.stores import NTriplesLogStore
 import h5py
 
+# the temporary graph of map_actor is reused for every actor instead of binding a new one each time
+actor_krakens = KrakenPool(size=1)
+
 
 def lookup_actor(item_slug):
     match item_slug:  # make this a dictionary in the meantime?
@@ -212,41 +216,41 @@ def map_actor(kraken, equip, testrig, h5actor):
 
     actoriri = FST["actor/" + quote(identifier, safe='')]
 
-    tmp = Kraken()
-    # only use identifying info here, not mapped info!
-    actor = PhysicalObject(tmp, iri=actoriri,
-                           identifier=identifier,
-                           name=actor_props["actorlabel"],
-                           comment=actor_props["actorlabel"],
-                           owner="FST",
-                           manufacturer=manufacturer,
-                           serialNumber=identifier)
-
-    # maybe validate vs shacl profile = essential info for ident?
-    ident = equip.g.value(predicate=SDO.serialNumber, object=Literal(identifier), any=False)
-    # maybe we need to catch the error from any=False, if we want to handle it, or it is too cryptic
-
-    diffs = 0
-    if ident is not None:
-        # we already know that -one- item that fits identification criteria is there
-        # we only need to check for properties from h5 that is there, but different
-        # i.e. diff of tmp ("from h5") versus equip ("in database")
-        _, in_first, _ = graph_diff(to_isomorphic(tmp.g), to_isomorphic(equip.g))
-        for s, p, o in in_first:
-            diffs += 1
-            print(f"inconsistent configuration of equipment with serialnumber \"{identifier}\" found")
-            print(f"{s} {p} {o}")
-
-    if (ident is None) or (diffs != 0):
-        print(f"equipment with {str(SDO.serialNumber)} = \"{identifier}\" not found, adding it")
-        equip.g += tmp.g
-        ident = actor.iri
-        # flag for review via bibo.status "REVIEW"
+    with actor_krakens.kraken() as tmp:
+        # only use identifying info here, not mapped info!
+        actor = PhysicalObject(tmp, iri=actoriri,
+                               identifier=identifier,
+                               name=actor_props["actorlabel"],
+                               comment=actor_props["actorlabel"],
+                               owner="FST",
+                               manufacturer=manufacturer,
+                               serialNumber=identifier)
+
+        # maybe validate vs shacl profile = essential info for ident?
+        ident = equip.find_by_serial_number(identifier, any=False)
+        # maybe we need to catch the error from any=False, if we want to handle it, or it is too cryptic
+
+        diffs = 0
+        if ident is not None:
+            # we already know that -one- item that fits identification criteria is there
+            # we only need to check for properties from h5 that is there, but different
+            # i.e. diff of tmp ("from h5") versus equip ("in database")
+            _, in_first, _ = graph_diff(to_isomorphic(tmp.g), to_isomorphic(equip.g))
+            for s, p, o in in_first:
+                diffs += 1
+                print(f"inconsistent configuration of equipment with serialnumber \"{identifier}\" found")
+                print(f"{s} {p} {o}")
+
+        if (ident is None) or (diffs != 0):
+            print(f"equipment with {str(SDO.serialNumber)} = \"{identifier}\" not found, adding it")
+            equip += tmp
+            ident = actor.iri
+            # flag for review via bibo.status "REVIEW"
 
     for p, o in equip.g.predicate_objects(subject=ident):
         kraken.g.add((ident, p, o))
 
-    actor.g = kraken.g
+    actor.kraken = kraken
     actor.isHostedBy = testrig.iri
     actuatedproperty = Quantity(kraken,
                                 hasQuantityKind=actor_props["propqkind"],
@@ -297,15 +301,23 @@ def map_sensor(kraken, testrig, h5pipeline, h5testrig):
                     manufacturer=manufacturer,
                     serialNumber=serialnumber,
                     location=testrig.name[0]).observes(observedproperty.iri)
+    return sensor.iri, observedproperty.iri
 
 
 filepath_source = "data/KF_80_2900.h5"
 # filepath = filepath_source.removesuffix(".h5") + "_rdf_embedded.h5"
 
-data = Kraken()
-equip = Kraken()
-equip.g.parse("data/equipment.ttl")
+# every triple is streamed to an append-only n-triples log, only the recently used subjects stay in memory,
+# the finished files are written from the log at the end: data/mapped.ttl and data/mapped.json hold the
+# graph of all source files. there are no <source>.setup.ttl / <source>.ttl next to every h5 file anymore
+data =Kraken(store=NTriplesLogStore(working_set=100000), configuration="data/mapped.nt.gz")
+# the registry lives in a persistent store and is updated in place, the ttl only seeds a new store
+equip = Kraken(store="SQLite", configuration="data/equipment.sqlite")
+if len(equip.g) == 0:
+    equip.parse("data/equipment.ttl")
 num_runs = 0
+# (sensor, observed property) of every mapped sensor, the log only keeps the recently used subjects in memory
+observed_pairs = {}
 
 # dirpath = "D:/Daten/Download/fst/data/schaenzle/data_final_appended_meta/"
 dirpath = "data/"
@@ -336,19 +348,17 @@ for root, _, filenames in walk(dirpath):
 
                         for obj in h5run["pipelines/measured"].values():
                             h5pipeline = obj["scaled"]
-                            map_sensor(data, testrig, h5pipeline, h5testrig)
+                            observed_pairs[map_sensor(data, testrig, h5pipeline, h5testrig)] = None
 
                         # ./data/<datasetname> : datasetname > observationCollection
                         # ./data/<datasetname> : dataset > observation, result
                     except LookupError as err:
                         raise LookupError(f"something went wrong in file {filepath}: {err}")
 
-                rdfpath = filepath.removesuffix(".h5") + ".setup.ttl"
-                data.g.serialize(destination=rdfpath, base=FST)
-                print(f"{len(set(data.g.subjects()))} nodes")
+                data.commit()
                 print(f"{len(data.g)} statements")
                 print(f"{num_runs} runs")
-                equip.g.serialize(destination="data/equipment.ttl", base=FST)
+                equip.commit()
 
                 if True:
                     # one collection for the measurement run, also one collection for every operating point of the run
@@ -366,7 +376,7 @@ for root, _, filenames in walk(dirpath):
                     # ALSO - set this more up like workflow along sensor API:
                     # ~ for sensor in sensors > for property in sensor
                     observations = [(sensoriri, prop, data.g.compute_qname(prop)[2]) for (sensoriri, prop)
-                                    in data.g.subject_objects(predicate=SOSA.observes)]
+                                    in observed_pairs]
 
                     dsetnames = []
                     timestamps = []
@@ -402,7 +412,10 @@ for root, _, filenames in walk(dirpath):
                             Observation(data, hasResult=result.iri, observedProperty=prop).isMemberOf(measurement.iri)
                             # member of run?
 
-                    rdfpath = filepath.removesuffix(".h5") + ".ttl"
-                    data.g.serialize(destination=rdfpath, base=TRNS)
-                    print(str(len(set(data.g.subjects()))) + "nodes")
+                    data.commit()
                     print(str(len(data.g)) + "statements")
+
+data.write_log("data/mapped.ttl", base=FST)
+data.write_log("data/mapped.json", format="json-ld")
+data.close()
+equip.close()
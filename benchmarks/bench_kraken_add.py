@@ -0,0 +1,61 @@
+"""
+time of building sensor graphs triple by triple through Kraken.add, the path of all entity constructors
+
+run from the repository root with: python -m benchmarks.bench_kraken_add
+"""
+import time
+
+from rdflib import Literal
+from rdflib.namespace import XSD
+
+from pyKRAKEN.kraken import (
+    FST,
+    QUANTITYKIND,
+    SSN_SYSTEM,
+    UNIT,
+    Kraken,
+    Sensor,
+    SensorCapability,
+    Quantity
+)
+
+
+def build_sensor(kraken: Kraken, number: int) -> None:
+    sensor_id = f"00000000-0000-7000-8000-{number:012d}"
+    sensor = Sensor(kraken, hasSensorCapability=FST[sensor_id + "/SensorCapability"],
+                    iri=FST[sensor_id], identifier=sensor_id, name=f"sensor {number}",
+                    owner="FST", manufacturer="Keller", serialNumber=str(number), location="Lager")
+    sys_capa = SensorCapability(kraken, iri=FST[sensor_id + "/SensorCapability"], name="sensor capabilities",
+                                comment="sensor capabilities not regarding any conditions at this time")
+    Quantity(kraken, isPropertyOf=sys_capa.iri, hasQuantityKind=QUANTITYKIND.Pressure,
+             minValue=Literal("0", datatype=XSD.double), maxValue=Literal("10", datatype=XSD.double),
+             unit=UNIT.BAR, iri=FST[sensor_id + "/MeasurementRange"], name="measurement range",
+             rdftype=SSN_SYSTEM.MeasurementRange)
+    Quantity(kraken, isPropertyOf=sys_capa.iri, hasQuantityKind=QUANTITYKIND.Voltage,
+             minValue=Literal("0", datatype=XSD.double), maxValue=Literal("10", datatype=XSD.double),
+             unit=UNIT.V, iri=FST[sensor_id + "/SensorActuationRange"], name="sensor output voltage range",
+             rdftype=SSN_SYSTEM.ActuationRange)
+    sensor.subjectOf = FST[sensor_id + "/docs/"]
+    sensor.documentation = FST[sensor_id + "/docs/"]
+
+
+def build(number_of_sensors: int, **kwargs) -> Kraken:
+    kraken = Kraken(**kwargs)
+    for number in range(number_of_sensors):
+        build_sensor(kraken, number)
+    return kraken
+
+
+def main(number_of_sensors: int = 5000, repetitions: int = 3):
+    for store in ("default", "AppendOnly"):
+        timings = []
+        for _ in range(repetitions):
+            start = time.perf_counter()
+            kraken = build(number_of_sensors, store=store)
+            timings.append(time.perf_counter() - start)
+        print(f"{store:>10}: {min(timings):.3f} s for {number_of_sensors} sensors "
+              f"({len(kraken.g)} triples, best of {repetitions})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""
+compares creating a new Kraken for every short-lived graph with reusing Krakens from a KrakenPool,
+once for the bare construction and once for a small actor graph like map_actor of the legacy mapper builds
+
+run from the repository root with: python -m benchmarks.bench_kraken_pool
+"""
+import time
+
+from pyKRAKEN.kraken import FST, Kraken, KrakenPool, PhysicalObject
+
+
+def build_actor(kraken: Kraken, number: int) -> None:
+    identifier = f"actor-{number}"
+    PhysicalObject(kraken, iri=FST["actor/" + identifier], identifier=identifier, name="electric motor",
+                   comment="electric motor", owner="FST", manufacturer="Siemens", serialNumber=identifier)
+
+
+def fresh(number_of_graphs: int, build: bool) -> None:
+    for number in range(number_of_graphs):
+        kraken = Kraken()
+        if build:
+            build_actor(kraken, number)
+
+
+def pooled(number_of_graphs: int, build: bool) -> None:
+    pool = KrakenPool(size=1)
+    for number in range(number_of_graphs):
+        with pool.kraken() as kraken:
+            if build:
+                build_actor(kraken, number)
+
+
+def main(number_of_graphs: int = 5000, repetitions: int = 3):
+    for build in (False, True):
+        label = "with actor" if build else "construction only"
+        for name, function in (("new Kraken", fresh), ("KrakenPool", pooled)):
+            timings = []
+            for _ in range(repetitions):
+                start = time.perf_counter()
+                function(number_of_graphs, build)
+                timings.append(time.perf_counter() - start)
+            best = min(timings)
+            print(f"{label:>17}, {name}: {best:.3f} s for {number_of_graphs} graphs "
+                  f"({best / number_of_graphs * 1e6:.1f} µs per graph, best of {repetitions})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+"""
+compares the memory of one graph holding many synthetic sensors with and without a TermPool
+
+run from the repository root with: python -m benchmarks.bench_term_pool
+"""
+import gc
+import time
+import tracemalloc
+
+from benchmarks.bench_kraken_add import build_sensor
+from pyKRAKEN.kraken import Kraken
+from pyKRAKEN.terms import TermPool
+
+STORES = ("default", "AppendOnly")
+
+
+def measure(store: str, terms: bool, number_of_sensors: int) -> tuple:
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    kraken = Kraken(store=store, terms=terms)
+    for number in range(number_of_sensors):
+        build_sensor(kraken, number)
+    seconds = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    pool_size = len(kraken.terms) if kraken.terms is not None else 0
+    return seconds, current, len(kraken.g), pool_size
+
+
+def main(number_of_sensors: int = 10000):
+    for store in STORES:
+        plain_seconds, plain_memory, triples, _ = measure(store, False, number_of_sensors)
+        pooled_seconds, pooled_memory, _, pool_size = measure(store, True, number_of_sensors)
+        print(f"{store:>10} without pool: {plain_seconds:.3f} s, {plain_memory / 2 ** 20:.1f} MiB "
+              f"for {number_of_sensors} sensors ({triples} triples)")
+        print(f"{store:>10}    with pool: {pooled_seconds:.3f} s, {pooled_memory / 2 ** 20:.1f} MiB "
+              f"({pool_size} distinct terms), saved {(plain_memory - pooled_memory) / 2 ** 20:.1f} MiB "
+              f"({1 - pooled_memory / plain_memory:.0%})")
+
+
+if __name__ == '__main__':
+    main()
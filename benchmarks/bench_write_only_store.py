@@ -0,0 +1,62 @@
+"""
+compares the default Memory store with the AppendOnly store for bulk generation:
+the sensor generator on rows of the example sensor table, and the memory of one graph holding many sensors
+
+run from the repository root with: python -m benchmarks.bench_write_only_store
+"""
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import pandas as pd
+
+from benchmarks.bench_kraken_add import build_sensor
+from hardcoded_generate_scripts.gitlab_db_sensor import generate_sensor_files, normalize_sensor_sheet
+from pyKRAKEN.kraken import Kraken
+
+EXAMPLE_TABLE = Path(__file__).parent.resolve() / "../excel_tables/sensor_table_EXAMPLE.xlsx"
+STORES = ("default", "AppendOnly")
+
+
+def example_rows(number_of_rows: int) -> list:
+    df = pd.read_excel(EXAMPLE_TABLE, sheet_name="Druck", skiprows=[1])
+    templates = [row for row in normalize_sensor_sheet(df) if row.range_min is not None]
+    return [templates[number % len(templates)]._replace(uuid=f"00000000-0000-7000-8000-{number:012d}")
+            for number in range(number_of_rows)]
+
+
+def bench_generator(number_of_rows: int = 200):
+    rows = example_rows(number_of_rows)
+    for store in STORES:
+        with tempfile.TemporaryDirectory() as directory:
+            start = time.perf_counter()
+            for row in rows:
+                generate_sensor_files(f"{directory}/", "Druck", row, store=store)
+            seconds = time.perf_counter() - start
+        print(f"generator {store:>10}: {seconds:.3f} s for {number_of_rows} rows "
+              f"({number_of_rows / seconds:.1f} rows/s)")
+
+
+def bench_bulk_graph(number_of_sensors: int = 10000):
+    for store in STORES:
+        tracemalloc.start()
+        start = time.perf_counter()
+        kraken = Kraken(store=store)
+        for number in range(number_of_sensors):
+            build_sensor(kraken, number)
+        seconds = time.perf_counter() - start
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"bulk graph {store:>10}: {seconds:.3f} s, {current / 2 ** 20:.1f} MiB "
+              f"for {number_of_sensors} sensors ({len(kraken.g)} triples)")
+        del kraken
+
+
+def main():
+    bench_generator()
+    bench_bulk_graph()
+
+
+if __name__ == '__main__':
+    main()
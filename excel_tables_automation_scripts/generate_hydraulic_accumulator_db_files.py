@@ -1,10 +1,11 @@
 from pathlib import Path
 import numpy as np
-import pandas as pd
 
 
+from hardcoded_generate_scripts.excel_cache import read_workbook
 from hardcoded_generate_scripts.gitlab_db_hydraulic_accumulator import generate_gitlab_hydraulic_accumulator_files
 from hardcoded_generate_scripts.gitlab_db_mdgen import generate_sensor_md_s_from_directory
+from pyKRAKEN.catalog import CatalogWriter
 
 from fstlabelcreator import script_functions
 
@@ -43,7 +44,7 @@ def main():
     path_to_excel_table = Path(f"{file_directory}/../excel_tables/{sensor_excel_sheet_name}")
 
     print('Start of the generation of the sensor files.')
-    dfs = pd.read_excel(path_to_excel_table, sheet_name=None,) #skiprows=[1])
+    dfs = read_workbook(path_to_excel_table, sheet_names=['Sheet1'], cache_dir=path_for_generated_files / "excel_cache") #skiprows=[1])
     # sensor_dir = "C:/Users/NP/Documents/AIMS/metadata_hub/data/fst_measurement_equipment/"
     try:
         path_for_generated_files.mkdir()
@@ -52,33 +53,37 @@ def main():
 
 
     df = dfs['Sheet1']
-    for idx in df.index:
-        row = df.iloc[idx]
-        row = row.replace({np.nan: None})
-
-        if row['UUID'] is None:
-            continue
-
-        current_serial_number = str(row['Serial_number'])
-        parsed_current_serial_number = current_serial_number.replace('“', '').replace('”', '')
-
-        generate_gitlab_hydraulic_accumulator_files(save_to_dir=path_for_generated_PID_files,
-                                                    hydraulic_accumulator_id=row['UUID'],
-                                                    identifier=row['Product_number'],
-                                                    manufacturer=row['Hersteller:'],
-                                                    serial_number=parsed_current_serial_number,
-                                                    hydraulic_accumulator_comment=row['Kommentar'],
-                                                    hydraulic_accumulator_manufacturing_date=row['Herstellungsdatum'],
-                                                    operating_pressure_value=row['PS'],
-                                                    operating_pressure_unit=row['PS_UNIT'],
-                                                    maximum_pressure_value=row['PT'],
-                                                    maximum_pressure_unit=row['PT_UNIT'],
-                                                    volume_value=row['Volumen'],
-                                                    volume_unit=row['V_UNIT'],
-                                                    volume_accuracy=row['Volumen_Unsicherheit'],
-                                                    operating_temperature_range_minvalue=row['TS_min'],
-                                                    operating_temperature_range_maxvalue=row['TS_max'],
-                                                    operating_temperature_range_unit=row['TS_UNIT'])
+    # all accumulators in one gzip n-triples file with a dcat index for bulk loads, next to the pID directories
+    with CatalogWriter(path_for_generated_files / "catalog" / "hydraulic_accumulators.nt.gz",
+                       title="FST hydraulic accumulators") as catalog:
+        for idx in df.index:
+            row = df.iloc[idx]
+            row = row.replace({np.nan: None})
+
+            if row['UUID'] is None:
+                continue
+
+            current_serial_number = str(row['Serial_number'])
+            parsed_current_serial_number = current_serial_number.replace('“', '').replace('”', '')
+
+            generate_gitlab_hydraulic_accumulator_files(save_to_dir=path_for_generated_PID_files,
+                                                        hydraulic_accumulator_id=row['UUID'],
+                                                        identifier=row['Product_number'],
+                                                        manufacturer=row['Hersteller:'],
+                                                        serial_number=parsed_current_serial_number,
+                                                        hydraulic_accumulator_comment=row['Kommentar'],
+                                                        hydraulic_accumulator_manufacturing_date=row['Herstellungsdatum'],
+                                                        operating_pressure_value=row['PS'],
+                                                        operating_pressure_unit=row['PS_UNIT'],
+                                                        maximum_pressure_value=row['PT'],
+                                                        maximum_pressure_unit=row['PT_UNIT'],
+                                                        volume_value=row['Volumen'],
+                                                        volume_unit=row['V_UNIT'],
+                                                        volume_accuracy=row['Volumen_Unsicherheit'],
+                                                        operating_temperature_range_minvalue=row['TS_min'],
+                                                        operating_temperature_range_maxvalue=row['TS_max'],
+                                                        operating_temperature_range_unit=row['TS_UNIT'],
+                                                        catalog=catalog)
 
     print('Generation of the files successfully finished!')
 
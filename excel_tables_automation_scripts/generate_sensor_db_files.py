@@ -1,13 +1,22 @@
+import argparse
 from importlib import import_module
 from pathlib import Path
 
+from hardcoded_generate_scripts.asset_index import AssetIndex
 from hardcoded_generate_scripts.gitlab_db_sensor import run_script as generate_gitlab_db_sensor_files
 from hardcoded_generate_scripts.gitlab_db_mdgen import generate_sensor_md_s_from_directory
+from pyKRAKEN.catalog import CatalogWriter
 
 from fstlabelcreator import script_functions
 
 
 def main():
+    parser = argparse.ArgumentParser(description="generate the pID files, labels and READMEs of the sensor table")
+    parser.add_argument("--force", action="store_true",
+                        help="regenerate all sensors, also those unchanged since the last run")
+    parser.add_argument("--workers", type=int, default=1, help="number of processes generating sensors")
+    args = parser.parse_args()
+
     file_directory = Path(__file__).parent.resolve()
     path_for_generated_files = Path(f"{file_directory}/../_generated")
     path_for_generated_labels = Path(f"{path_for_generated_files}/pID_label_files")
@@ -39,16 +48,23 @@ def main():
 
 
     path_to_sensor_excel_table = Path(f"{file_directory}/../excel_tables/{sensor_excel_sheet_name}")
+    # the label creator only takes the path, it parses the workbook a second time and does not use the cache
     script_functions.generate_sensor_pID_label_sites_from_excel_sheets(path_for_generated_files= path_for_generated_labels,
                                                                        path_to_sensor_excel_sheet= path_to_sensor_excel_table,
                                                                        responsible_WiMi= responsible_WiMi)
 
     print('Start of the generation of the sensor files.')
-    generate_gitlab_db_sensor_files(sensor_table_path= path_to_sensor_excel_table.resolve(), generated_files_directory_path= path_for_generated_PID_files.resolve())
+    # one walk over img/ and docs/ of all pID directories for the generator and the README builder
+    assets = AssetIndex.scan(path_for_generated_PID_files.resolve(), cache=path_for_generated_files / "asset_index.json")
+    # all sensors in one gzip n-triples file with a dcat index for bulk loads, next to the pID directories
+    with CatalogWriter(path_for_generated_files / "catalog" / "sensors.nt.gz", title="FST sensors") as catalog:
+        generate_gitlab_db_sensor_files(sensor_table_path= path_to_sensor_excel_table.resolve(), generated_files_directory_path= path_for_generated_PID_files.resolve(),
+                                        manifest= path_for_generated_files / "sensor_manifest.json", force= args.force, workers= args.workers,
+                                        cache_dir= path_for_generated_files / "excel_cache", assets= assets, catalog= catalog)
     print('Generation of the sensor files successfully finished!')
 
     print('Start of the generation of the README.md files of the sensor directories.')
-    generate_sensor_md_s_from_directory(sensors_directory_search_path= path_for_generated_PID_files.resolve())
+    generate_sensor_md_s_from_directory(sensors_directory_search_path= path_for_generated_PID_files.resolve(), assets= assets)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
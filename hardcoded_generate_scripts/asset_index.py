@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from collections import namedtuple
+from pathlib import Path
+from typing import Dict, Iterable, List, Set, Tuple
+
+# one walk over the pID_directories tree shared by the generators and the README builder:
+#     assets = AssetIndex.scan("_generated/pID_directories", cache="_generated/asset_index.json")
+#     run_script(..., assets=assets)
+#     generate_sensor_md_s_from_directory("_generated/pID_directories", assets=assets)
+
+FileEntry = namedtuple("FileEntry", "size mtime_ns sha256")
+
+CACHE_VERSION = 1
+SKIPPED_NAMES = {".git"}
+
+
+def file_hash(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class AssetIndex(object):
+    """
+    files (size, modification time, sha256) and folders of every resource directory below root,
+    e.g. resources["<uuid>"]["img/photo.png"]. built by scan in one os.scandir walk, files unchanged
+    in size and modification time since the cached scan are not hashed again.
+    """
+
+    def __init__(self, root: str | Path, resources: Dict[str, Dict[str, FileEntry]] | None = None,
+                 directories: Dict[str, Set[str]] | None = None) -> None:
+        self.root = Path(root)
+        # resource -> path relative to the resource directory -> entry
+        self.resources: Dict[str, Dict[str, FileEntry]] = resources if resources is not None else {}
+        # resource -> folders relative to the resource directory, "" is the resource directory itself
+        self.directories: Dict[str, Set[str]] = directories if directories is not None else {}
+
+    @classmethod
+    def scan(cls, root: str | Path, cache: str | Path | None = None) -> AssetIndex:
+        """
+        walk root once, with cache the hashes of the last scan are reused and the new index is stored there.
+        """
+        root = Path(root)
+        previous: Dict[str, Dict[str, list]] = {}
+        if cache is not None and Path(cache).is_file():
+            with open(cache, encoding="utf-8") as f:
+                content = json.load(f)
+            if content.get("version") == CACHE_VERSION and content.get("root") == str(root.resolve()):
+                previous = content["resources"]
+
+        index = cls(root)
+        try:
+            with os.scandir(root) as it:
+                tops = [entry for entry in it if entry.is_dir() and entry.name not in SKIPPED_NAMES]
+        except FileNotFoundError:
+            tops = []
+        for top in tops:
+            files = index.resources[top.name] = {}
+            folders = index.directories[top.name] = {""}
+            known = previous.get(top.name, {})
+            stack = [(top.path, "")]
+            while stack:
+                path, relative = stack.pop()
+                with os.scandir(path) as it:
+                    for entry in it:
+                        if entry.name in SKIPPED_NAMES:
+                            continue
+                        name = relative + entry.name
+                        if entry.is_dir():
+                            folders.add(name)
+                            stack.append((entry.path, name + "/"))
+                        elif entry.is_file():
+                            stat = entry.stat()
+                            cached = known.get(name)
+                            if cached is not None and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+                                files[name] = FileEntry(*cached)
+                            else:
+                                files[name] = FileEntry(stat.st_size, stat.st_mtime_ns, file_hash(entry.path))
+
+        if cache is not None:
+            index.save(cache)
+        return index
+
+    def save(self, cache: str | Path) -> None:
+        content = {"version": CACHE_VERSION, "root": str(self.root.resolve()),
+                   "resources": {resource: {name: list(entry) for name, entry in sorted(files.items())}
+                                 for resource, files in sorted(self.resources.items())}}
+        temporary = Path(f"{cache}.{os.getpid()}.tmp")
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump(content, f)
+        os.replace(temporary, cache)
+
+    def resource_names(self) -> List[str]:
+        return sorted(self.directories)
+
+    def files(self, resource: str, folder: str = "") -> List[Tuple[str, FileEntry]]:
+        """
+        name and entry of the files directly in folder of resource, sorted by name.
+        """
+        prefix = folder.rstrip("/") + "/" if folder else ""
+        return sorted((name[len(prefix):], entry) for name, entry in self.resources.get(resource, {}).items()
+                      if name.startswith(prefix) and "/" not in name[len(prefix):])
+
+    def has_directory(self, resource: str, folder: str = "") -> bool:
+        return folder.rstrip("/") in self.directories.get(resource, ())
+
+    def make_directory(self, resource: str, folder: str = "") -> None:
+        """
+        create folder of resource (and its parents) unless the index already knows it.
+        """
+        folder = folder.rstrip("/")
+        if self.has_directory(resource, folder):
+            return
+        (self.root / resource / folder).mkdir(parents=True, exist_ok=True)
+        folders = self.directories.setdefault(resource, {""})
+        self.resources.setdefault(resource, {})
+        parts = folder.split("/") if folder else []
+        for end in range(1, len(parts) + 1):
+            folders.add("/".join(parts[:end]))
+
+    def select(self, resources: Iterable[str]) -> AssetIndex:
+        """
+        index of only the given resources, e.g. to hand to a worker process.
+        """
+        resources = [resource for resource in resources if resource in self.directories]
+        return AssetIndex(self.root, {resource: self.resources.get(resource, {}) for resource in resources},
+                          {resource: set(self.directories[resource]) for resource in resources})
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pickle
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+import pandas as pd
+
+# parsed sheets of the excel tables, e.g. one cache in _generated shared by all generators of a run:
+#     run_script(..., cache_dir="_generated/excel_cache")
+# which reads only the sheets and columns the generator uses, like
+#     read_workbook(path, sheet_names=SUPPORTED_SENSOR_TABLE_SHEET_NAMES, columns=SENSOR_TABLE_COLUMNS,
+#                   skiprows=[1], cache_dir="_generated/excel_cache")
+# only the generators of this repository share the cache, the label creator of the fst-label-creator submodule
+# takes the path of the workbook and still parses it on its own
+
+CACHE_VERSION = 2
+
+
+def read_workbook(path: str | Path, sheet_names: Iterable[str] | None = None, columns: Iterable[str] | None = None,
+                  skiprows: List[int] | None = None, cache_dir: str | Path | None = None) -> Dict[str, pd.DataFrame]:
+    """
+    the sheets of an excel workbook as {sheet name: DataFrame} like pd.read_excel(path, sheet_name=None).
+    sheet_names and columns restrict what is parsed, columns missing in a sheet are left out.
+    with cache_dir the parsed sheets are pickled there and reused as long as path, size and
+    modification time of the workbook and the arguments are the same.
+    """
+    path = Path(path).resolve()
+    sheet_names = sorted(sheet_names) if sheet_names is not None else None
+    columns = sorted(columns) if columns is not None else None
+    wanted = set(columns) if columns is not None else None
+    if cache_dir is None:
+        return _parse(path, sheet_names, wanted, skiprows)
+
+    cache_dir = Path(cache_dir)
+    stat = path.stat()
+
+    # one cache file per workbook and arguments, it is replaced whenever the workbook changes
+    arguments = json.dumps([CACHE_VERSION, str(path), sheet_names, columns, skiprows])
+    cache_file = cache_dir / f"{path.stem}-{hashlib.sha256(arguments.encode('utf-8')).hexdigest()[:16]}.pkl"
+    # pickled DataFrames can only be read by the pandas version that wrote them
+    signature = (stat.st_size, stat.st_mtime_ns, pd.__version__)
+    try:
+        with open(cache_file, "rb") as f:
+            # the signature is pickled on its own, a stale cache is recognized without unpickling the sheets
+            if pickle.load(f) == signature:
+                return pickle.load(f)
+    except Exception:
+        pass  # missing, truncated or unreadable for this pandas, the workbook is parsed again
+
+    sheets = _parse(path, sheet_names, wanted, skiprows)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    temporary = cache_file.with_suffix(f".{os.getpid()}.tmp")
+    with open(temporary, "wb") as f:
+        pickle.dump(signature, f, protocol=pickle.HIGHEST_PROTOCOL)
+        pickle.dump(sheets, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temporary, cache_file)
+    return sheets
+
+
+def _parse(path: Path, sheet_names: List[str] | None, wanted: set | None,
+           skiprows: List[int] | None) -> Dict[str, pd.DataFrame]:
+    return pd.read_excel(path, sheet_name=sheet_names, skiprows=skiprows,
+                         usecols=(lambda column: column in wanted) if wanted is not None else None)
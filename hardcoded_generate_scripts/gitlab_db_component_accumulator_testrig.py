@@ -106,10 +106,7 @@ def main():
     except FileExistsError:
         pass
 
-    file_path = f"{dir_path}/rdf"
-    print(data.g.serialize(destination=f"{file_path}.json", format="json-ld", auto_compact=True))
-    print(data.g.serialize(destination=f"{file_path}.ttl", format="longturtle", encoding="utf-8"))
-    print(data.g.serialize(destination=f"{file_path}.xml", format="xml"))
+    data.write_all(dir_path)
 
     gitlab_db_mdgen.generate_sensor_md(f'{dir_path}/')
 
@@ -173,10 +173,7 @@ def main():
     except FileExistsError:
         pass
 
-    file_path = f"{dir_path}/rdf"
-    print(data.g.serialize(destination=f"{file_path}.json", format="json-ld", auto_compact=True))
-    print(data.g.serialize(destination=f"{file_path}.ttl", base=SUBSTANCE, format="longturtle", encoding="utf-8"))
-    print(data.g.serialize(destination=f"{file_path}.xml", base=SUBSTANCE, format="xml"))
+    data.write_all(dir_path, base=SUBSTANCE)
 
 
 if __name__ == '__main__':
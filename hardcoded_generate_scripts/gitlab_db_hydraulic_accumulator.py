@@ -5,10 +5,11 @@ from rdflib.namespace import DCAT, DCMITYPE, DCTERMS, RDF, RDFS, XSD, SSN, SDO,
 from pyKRAKEN.kraken import (
     DBO,
     QUDT,
-    UNIT,
     QUANTITYKIND,
     Kraken
 )
+from pyKRAKEN.catalog import CatalogWriter
+from pyKRAKEN.units import unit_iri
 
 # this should ideally be something like e.g.:
 # https://fst.tu-darmstadt.de/namespaces/components/id/
@@ -22,20 +23,6 @@ from pyKRAKEN.kraken import (
 # SUBSTANCE = Namespace(FST["substance/"])
 schema = Namespace('https://schema.org/')
 
-unit_dict = {"bar": UNIT.BAR,
-             "mbar": UNIT.MilliBAR,
-             "psi": UNIT.PSI,
-             "kPa": UNIT.KiloPA,
-             "MPa": UNIT.MegaPA,
-             "°C": UNIT.DEG_C,
-             "K": UNIT.K,
-             "kN": UNIT.KiloN,
-             "mm": UNIT.MilliM,
-             "cm": UNIT.CentiM,
-             "Liter": UNIT.L,
-             "cm^3": UNIT.CentiM3,
-             "dm^3": UNIT.DeciM3,
-             "m^3": UNIT.M3}
 
 def generate_gitlab_hydraulic_accumulator_files(save_to_dir: [str, Path],
                                    hydraulic_accumulator_id: str,
@@ -53,7 +40,9 @@ def generate_gitlab_hydraulic_accumulator_files(save_to_dir: [str, Path],
                                    volume_accuracy: [int, float],
                                    operating_temperature_range_minvalue: [int, float],
                                    operating_temperature_range_maxvalue: [int, float],
-                                   operating_temperature_range_unit: str):
+                                   operating_temperature_range_unit: str,
+                                   catalog: CatalogWriter | None = None):
+    # with catalog the accumulator is added to the catalog of the run as well
 
 
     SSN_SYSTEM = Namespace("https://www.w3.org/ns/ssn/systems/")
@@ -92,7 +81,7 @@ def generate_gitlab_hydraulic_accumulator_files(save_to_dir: [str, Path],
     data.g.add((operating_pressure, RDFS.label, Literal("operating pressure")))
     data.g.add((operating_pressure, QUDT.symbol, Literal("p_operating")))
     data.g.add((operating_pressure, QUDT.hasQuantityKind, QUANTITYKIND.Pressure))
-    data.g.add((operating_pressure, QUDT.unit, unit_dict[operating_pressure_unit]))
+    data.g.add((operating_pressure, QUDT.unit, unit_iri(operating_pressure_unit)))
     data.g.add((operating_pressure, QUDT.value, Literal(operating_pressure_value)))
 
     maximum_pressure = COMPONENT[hydraulic_accumulator_id + "/p_max"]
@@ -102,7 +91,7 @@ def generate_gitlab_hydraulic_accumulator_files(save_to_dir: [str, Path],
     data.g.add((maximum_pressure, RDFS.label, Literal("maximum working pressure")))
     data.g.add((maximum_pressure, QUDT.symbol, Literal("p_max")))
     data.g.add((maximum_pressure, QUDT.hasQuantityKind, QUANTITYKIND.Pressure))
-    data.g.add((maximum_pressure, QUDT.unit, unit_dict[maximum_pressure_unit]))
+    data.g.add((maximum_pressure, QUDT.unit, unit_iri(maximum_pressure_unit)))
     data.g.add((maximum_pressure, QUDT.value, Literal(maximum_pressure_value)))
 
     volume = COMPONENT[hydraulic_accumulator_id + "/V0"]
@@ -112,7 +101,7 @@ def generate_gitlab_hydraulic_accumulator_files(save_to_dir: [str, Path],
     data.g.add((volume, RDFS.label, Literal("volume")))
     data.g.add((volume, QUDT.symbol, Literal("V0")))
     data.g.add((volume, QUDT.hasQuantityKind, QUANTITYKIND.Volume))
-    data.g.add((volume, QUDT.unit, unit_dict[volume_unit]))
+    data.g.add((volume, QUDT.unit, unit_iri(volume_unit)))
     data.g.add((volume, QUDT.value, Literal(volume_value)))
     # TODO: There might be sophisticated special data types for uncertainties in the future 12.2023
     data.g.add((volume, SSN_SYSTEM.Accuracy, Literal(volume_accuracy)))
@@ -125,7 +114,7 @@ def generate_gitlab_hydraulic_accumulator_files(save_to_dir: [str, Path],
     data.g.add((operating_temperature_range, RDFS.label, Literal("temperature operating range")))
     data.g.add((operating_temperature_range, QUDT.symbol, Literal("T_operating_range")))
     data.g.add((operating_temperature_range, QUDT.hasQuantityKind, QUANTITYKIND.Area))
-    data.g.add((operating_temperature_range, QUDT.unit, unit_dict[operating_temperature_range_unit]))
+    data.g.add((operating_temperature_range, QUDT.unit, unit_iri(operating_temperature_range_unit)))
     data.g.add((operating_temperature_range, schema.minValue, Literal(operating_temperature_range_minvalue, datatype=XSD.double)))
     data.g.add((operating_temperature_range, schema.maxValue, Literal(operating_temperature_range_maxvalue, datatype=XSD.double)))
 
@@ -163,9 +152,8 @@ def generate_gitlab_hydraulic_accumulator_files(save_to_dir: [str, Path],
     except FileExistsError:
         pass
 
-    file_path = f"{dir_path}/rdf"
-    print(data.g.serialize(destination=f"{file_path}.json", format="json-ld", auto_compact=True))
-    print(data.g.serialize(destination=f"{file_path}.ttl", base=SUBSTANCE, format="longturtle", encoding="utf-8"))
-    print(data.g.serialize(destination=f"{file_path}.xml", base=SUBSTANCE, format="xml"))
+    data.write_all(dir_path, base=SUBSTANCE)
+    if catalog is not None:
+        catalog.add_graph(hydraulic_accumulator_id, data.g, base=COMPONENT[hydraulic_accumulator_id + "/"])
 
 
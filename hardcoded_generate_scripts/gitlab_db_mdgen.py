@@ -1,3 +1,5 @@
+from __future__ import annotations
+
 import os
 from pathlib import Path
 from string import Template
@@ -7,9 +9,12 @@ from rdflib import Graph, URIRef
 from rdflib.namespace import RDF, RDFS, DCTERMS, FOAF, SOSA
 
 from pyKRAKEN.kraken import SDO, DBO
+from pyKRAKEN.output import OutputWriter, write_if_changed
+from hardcoded_generate_scripts.asset_index import AssetIndex
 
 
-def generate_sensor_md(resource_dir):
+def generate_sensor_md(resource_dir, writer: OutputWriter | None = None):
+    # the README.md is only replaced if its content changed, with writer by the threads of the writer
     rdfdocname = "rdf.ttl"
     g = Graph().parse(resource_dir + rdfdocname)
 
@@ -145,15 +150,23 @@ def generate_sensor_md(resource_dir):
         s += form_doc.substitute(mapping)
     s += form_addinfo.substitute(mapping_add_info)
 
-    with open(resource_dir + "/README.md", "w") as f:
-        print(s, file=f)
-
-
-def generate_sensor_md_s_from_directory(sensors_directory_search_path: [Path, str]):
-    with os.scandir(sensors_directory_search_path) as it:
-    # TODO: Check whether insidethe directory are the awaited contents
-        for entry in it:
-            if entry.is_dir() and entry.name != ".git":
-                generate_sensor_md(entry.path + "/")
+    if writer is not None:
+        writer.write(resource_dir + "/README.md", s + "\n")
+    else:
+        write_if_changed(resource_dir + "/README.md", s + "\n")
+
+
+def generate_sensor_md_s_from_directory(sensors_directory_search_path: [Path, str], assets: AssetIndex | None = None):
+    # assets is an AssetIndex of sensors_directory_search_path, its resources are used instead of scanning again
+    with OutputWriter() as writer:
+        if assets is not None:
+            for name in assets.resource_names():
+                generate_sensor_md(f"{sensors_directory_search_path}/{name}/", writer)
+        else:
+            with os.scandir(sensors_directory_search_path) as it:
+            # TODO: Check whether insidethe directory are the awaited contents
+                for entry in it:
+                    if entry.is_dir() and entry.name != ".git":
+                        generate_sensor_md(entry.path + "/", writer)
 
     print("Succesfully created all md files")
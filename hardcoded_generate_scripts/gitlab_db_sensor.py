@@ -1,401 +1,585 @@
+from __future__ import annotations
+
+import hashlib
+import json
 import os
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from itertools import repeat
 from pathlib import Path
+from typing import Dict, List, Tuple
 from urllib.parse import quote
 import warnings
 
-import rdflib
 from rdflib import Namespace, Literal, URIRef
 from rdflib.namespace import RDF, FOAF, SOSA, DCTERMS, XSD
-import pandas as pd
 import numpy as np
+import pandas as pd
 
 from pyKRAKEN.kraken import (
     SDO,
     DBO,
-    UNIT,
     QUANTITYKIND,
     SSN_SYSTEM,
+    SERIALIZATION_FORMATS,
     Kraken,
     Sensor,
     SensorCapability,
     Property,
-    Quantity
+    Quantity,
+    Thing
 )
+from pyKRAKEN.catalog import CatalogWriter, resource_member
+from pyKRAKEN.output import OutputWriter
+from pyKRAKEN.profiling import Profiler, instrumented
+from pyKRAKEN.units import find_unit, quantity_kind, unit_iri
+from hardcoded_generate_scripts.asset_index import AssetIndex
+from hardcoded_generate_scripts.excel_cache import read_workbook
 
 
 SENSOR = Namespace("https://w3id.org/fst/resource/")
 
-quantitykind_dict = {"Druck": QUANTITYKIND.Pressure,
-                     "Kraft": QUANTITYKIND.Force,
-                     "Temperatur": QUANTITYKIND.Temperature,
-                     "Weg": QUANTITYKIND.Displacement,
-                     "Leistung": QUANTITYKIND.Power,
-                     "Volumenstrom": QUANTITYKIND.VolumeFlowRate}
-
-unit_dict = {"bar": UNIT.BAR,
-             "mbar": UNIT.MilliBAR,
-             "psi": UNIT.PSI,
-             "Pa": UNIT.PA,
-             "kPa": UNIT.KiloPA,
-             "MPa": UNIT.MegaPA,
-             "°C": UNIT.DEG_C,
-             "K": UNIT.K,
-             "N": UNIT.N,
-             "kN": UNIT.KiloN,
-             "mm": UNIT.MilliM,
-             "cm": UNIT.CentiM,
-             "V": UNIT.V,
-             "mV": UNIT.MilliV,
-             "µV": UNIT.MicroV,
-             "A": UNIT.A,
-             "W": UNIT.W,
-             "m^3/s": UNIT.M3_PER_SEC}
-
-
-def generate_sensor_files(sensor_dir, sheet_name, df_row):
-    if (df_row["Messbereich von"] == None
-            or isinstance(df_row["Messbereich von"], str)):
-        raise ValueError
-
-    if (df_row["Messbereich bis"] == None
-            or isinstance(df_row["Messbereich bis"], str)):
-        raise ValueError
-
-    if (df_row["Ausgabebereich von"] == None
-            or isinstance(df_row["Ausgabebereich von"], str)):
-        raise ValueError
-
-    if (df_row["Ausgabebereich bis"] == None
-            or isinstance(df_row["Ausgabebereich bis"], str)):
-        raise ValueError
-
-
-    data = Kraken()
-    data.g.bind("fst", SENSOR)
-
-    sensor_id = df_row["uuid"]  # str(uuid6())
-    fst_id = df_row["Ident-Nummer"]
+SUPPORTED_SENSOR_TABLE_SHEET_NAMES = ["Druck",
+                                      "Kraft",
+                                      "Temperatur",
+                                      "Weg",
+                                      "Leistung",
+                                      "Volumenstrom"]
+
+# sheet column -> field of SensorRow, columns missing in a sheet are None
+SENSOR_TABLE_COLUMNS = {"uuid": "uuid",
+                        "Ident-Nummer": "ident_number",
+                        "Messbereich von": "range_min",
+                        "Messbereich bis": "range_max",
+                        "Messbereich Einheit": "range_unit",
+                        "absolut/ relativ": "value_reference",
+                        "Ausgabebereich von": "output_min",
+                        "Ausgabebereich bis": "output_max",
+                        "Ausgabebereich Einheit": "output_unit",
+                        "Kennlinie Steigung _ Sensitivity": "sensitivity",
+                        "Kennlinie Offset _ Bias": "bias",
+                        "Sensitivity Uncertainty": "sensitivity_uncertainty",
+                        "Sensitivity Uncertainty Unit": "sensitivity_uncertainty_unit",
+                        "Sensitivity Uncertainty Comment": "sensitivity_uncertainty_comment",
+                        "Sensitivity Uncertainty Keywords": "sensitivity_uncertainty_keywords",
+                        "Bias Uncertainty": "bias_uncertainty",
+                        "Bias Uncertainty Unit": "bias_uncertainty_unit",
+                        "Bias Uncertainty Comment": "bias_uncertainty_comment",
+                        "Bias Uncertainty Keywords": "bias_uncertainty_keywords",
+                        "Linearity Uncertainty": "linearity_uncertainty",
+                        "Linearity Uncertainty Unit": "linearity_uncertainty_unit",
+                        "Linearity Uncertainty Comment": "linearity_uncertainty_comment",
+                        "Linearity Uncertainty Keywords": "linearity_uncertainty_keywords",
+                        "Hysteresis Uncertainty": "hysteresis_uncertainty",
+                        "Hysteresis Uncertainty Unit": "hysteresis_uncertainty_unit",
+                        "Hysteresis Uncertainty Comment": "hysteresis_uncertainty_comment",
+                        "Hysteresis Uncertainty Keywords": "hysteresis_uncertainty_keywords",
+                        "Messprinzip": "measuring_principle",
+                        "Hersteller": "manufacturer",
+                        "Bezeichnung": "name",
+                        "Seriennummer": "serial_number",
+                        "Verantwortlicher WiMi": "maintainer",
+                        "Aufbewahrungsort": "location",
+                        "letzte Prüfung/ Kalibration": "modified",
+                        "Zubehör": "relation",
+                        "Bemerkung": "comment"}
+
+SensorRow = namedtuple("SensorRow", SENSOR_TABLE_COLUMNS.values())
+
+NUMERIC_FIELDS = ("range_min", "range_max", "output_min", "output_max", "sensitivity", "bias",
+                  "sensitivity_uncertainty", "bias_uncertainty", "linearity_uncertainty", "hysteresis_uncertainty")
+KEYWORD_FIELDS = ("sensitivity_uncertainty_keywords", "bias_uncertainty_keywords",
+                  "linearity_uncertainty_keywords", "hysteresis_uncertainty_keywords")
+
+UNCERTAINTY_REFERENCES = [URIRef("https://doi.org/10.1007/978-3-030-78354-9"),
+                          URIRef("https://dx.doi.org/10.2139/ssrn.4452038")]
+
+
+def _to_number(column: pd.Series) -> pd.Series:
+    # numbers written as text (also with decimal comma) become numbers, other text becomes NaN.
+    # numbers stay as they are, their lexical form ends up in the literals (0, not 0.0)
+    text = column.map(type).eq(str)
+    if not text.any():
+        return column
+    numbers = pd.to_numeric(column.where(text).str.replace(",", ".", regex=False).str.strip(), errors="coerce")
+    return column.mask(text, numbers)
+
+
+def normalize_sensor_sheet(df: pd.DataFrame) -> List[SensorRow]:
+    """
+    normalize one sheet of the sensor table column by column and return its rows as SensorRow:
+    NaN and "unknown" become None, keyword columns become lists split at ";",
+    value columns become numbers or None.
+    """
+    df = df.reindex(columns=list(SENSOR_TABLE_COLUMNS)).astype(object)
+    df.columns = list(SENSOR_TABLE_COLUMNS.values())
+
+    for field in df.columns:
+        column = df[field]
+        if column.map(type).eq(str).any():
+            df[field] = column.mask(column.str.lower().eq("unknown"))
+    for field in NUMERIC_FIELDS:
+        df[field] = _to_number(df[field])
+    for field in KEYWORD_FIELDS:
+        column = df[field]
+        df[field] = column.where(column.isna(), column.astype(str).str.split(";"))
+
+    df = df.astype(object).where(df.notna(), None)
+    return [SensorRow._make(values) for values in df.itertuples(index=False, name=None)]
+
+
+# columns every sheet needs, the range columns need numbers and the range units have to be known to pyKRAKEN.units
+REQUIRED_COLUMNS = ("uuid", "Ident-Nummer", "Messbereich von", "Messbereich bis", "Messbereich Einheit",
+                    "Ausgabebereich von", "Ausgabebereich bis", "Ausgabebereich Einheit")
+RANGE_COLUMNS = ("Messbereich von", "Messbereich bis", "Ausgabebereich von", "Ausgabebereich bis")
+UNIT_COLUMNS = ("Messbereich Einheit", "Ausgabebereich Einheit")
+# the header is the first line of a sheet and the second line (descriptions) is skipped
+FIRST_DATA_LINE = 3
+
+
+def validate_sensor_sheets(dfs: Dict[str, pd.DataFrame], sheet_names: List[str]) -> dict:
+    """
+    check all rows of the sheets column by column before anything is generated:
+    required columns, numeric ranges, units known to pyKRAKEN.units and uuids and Ident-Nummern used only once
+    over all sheets. returns a json serializable report, "invalid" holds the positions of the bad rows per sheet.
+    """
+    errors = []
+    invalid: Dict[str, List[int]] = {}
+    missing_sheets = [sheet_name for sheet_name in sheet_names if sheet_name not in dfs]
+    missing_columns = {}
+    identifiers = []
+
+    def flag(sheet_name: str, df: pd.DataFrame, mask: pd.Series, column: str, error: str):
+        for position in np.flatnonzero(mask.to_numpy()):
+            value = df[column].iat[position] if column in df.columns else None
+            errors.append({"sheet": sheet_name, "line": int(position) + FIRST_DATA_LINE,
+                           "uuid": None if pd.isna(df["uuid"].iat[position]) else str(df["uuid"].iat[position]),
+                           "column": column, "value": None if pd.isna(value) else str(value), "error": error})
+            invalid.setdefault(sheet_name, []).append(int(position))
+
+    for sheet_name in sheet_names:
+        if sheet_name in missing_sheets:
+            continue
+        df = dfs[sheet_name]
+        if df.empty:
+            # nothing to generate, e.g. a sheet prepared with other column names
+            continue
+        missing = [column for column in REQUIRED_COLUMNS if column not in df.columns]
+        if missing:
+            missing_columns[sheet_name] = missing
+            invalid[sheet_name] = list(range(len(df)))
+            continue
+        flag(sheet_name, df, df["uuid"].isna(), "uuid", "missing uuid")
+        for column in RANGE_COLUMNS:
+            flag(sheet_name, df, pd.isna(_to_number(df[column].astype(object))), column, "not a number")
+        for column in UNIT_COLUMNS:
+            flag(sheet_name, df, ~df[column].map(lambda value: isinstance(value, str) and find_unit(value) is not None),
+                 column, "unit not in the qudt snapshot")
+        identifiers.append(pd.DataFrame({"sheet": sheet_name, "position": np.arange(len(df)),
+                                         "uuid": df["uuid"].to_numpy(), "Ident-Nummer": df["Ident-Nummer"].to_numpy()}))
+
+    if identifiers:
+        everything = pd.concat(identifiers, ignore_index=True)
+        for column in ("uuid", "Ident-Nummer"):
+            duplicated = everything[column].notna() & everything[column].duplicated(keep=False)
+            for sheet_name, group in everything[duplicated].groupby("sheet", sort=False):
+                mask = pd.Series(False, index=range(len(dfs[sheet_name])))
+                mask.iloc[group["position"].to_numpy()] = True
+                flag(sheet_name, dfs[sheet_name], mask, column, f"{column} used more than once")
+
+    invalid = {sheet_name: sorted(set(positions)) for sheet_name, positions in invalid.items()}
+    number_of_rows = sum(len(dfs[sheet_name]) for sheet_name in sheet_names if sheet_name in dfs)
+    return {"valid": not (errors or missing_sheets or missing_columns),
+            "rows": number_of_rows,
+            "invalid_rows": sum(len(positions) for positions in invalid.values()),
+            "missing_sheets": missing_sheets,
+            "missing_columns": missing_columns,
+            "errors": sorted(errors, key=lambda error: (sheet_names.index(error["sheet"]), error["line"])),
+            "invalid": invalid}
+
+
+def add_uncertainty(data: Kraken, isPropertyOf: URIRef, iri: URIRef, name: str, description: str,
+                    value, unit, comment, keywords: List[str] | None) -> Property:
+    # units found in qudt are referenced, others (e.g. "%MV/°C") are kept as written
+    known_unit = find_unit(unit)
+    return Property(data, isPropertyOf=isPropertyOf, iri=iri, name=name, description=description,
+                    seeAlso=UNCERTAINTY_REFERENCES, conformsTo=UNCERTAINTY_REFERENCES,
+                    value=Literal(str(value), datatype=XSD.double) if value is not None else None,
+                    unit=known_unit.iri if known_unit is not None else unit,
+                    comment=Literal(str(comment)) if comment is not None else None,
+                    keywords_list=keywords)
+
+
+def generate_sensor_files(sensor_dir, sheet_name, row: SensorRow, store: str = "AppendOnly",
+                          profiler: Profiler | None = None, kraken: Kraken | None = None,
+                          quiet: bool = False, serialization_workers: int = 1,
+                          assets: AssetIndex | None = None, writer: OutputWriter | None = None):
+    # row is one SensorRow of normalize_sensor_sheet
+    # the graph is only built and serialized, so the lightweight AppendOnly store is enough by default
+    # with kraken the sensor is only added to that shared graph, files are written by kraken.write_shards
+    # serialization_workers is handed to Kraken.write_all, more than 1 serializes in worker processes
+    # assets is an AssetIndex of sensor_dir, img/ and docs/ are then taken from it instead of scanning them
+    # writer is handed to Kraken.write_all, the files are then written in its threads
+    # returns the Kraken the sensor was added to
+    if None in (row.range_min, row.range_max, row.output_min, row.output_max):
+        raise ValueError("measurement range and output range need numeric values")
+
+    if kraken is None:
+        data = Kraken(store=store, profile=profiler)
+        data.g.bind("fst", SENSOR)
+    else:
+        data = kraken
+
+    sensor_id = row.uuid  # str(uuid6())
+
+    def local(path: str) -> URIRef:
+        # relative iris like <docs/> of all sensors would be one and the same resource in a shared graph
+        return URIRef(path) if kraken is None else SENSOR[f"{sensor_id}/{path}"]
+    fst_id = row.ident_number
     if sheet_name == "Druck":
-        val_ref = df_row["absolut/ relativ"]
+        val_ref = row.value_reference
     else:
         val_ref = None
-    maintainer = df_row["Verantwortlicher WiMi"]
-    meas_tech = df_row["Messprinzip"]
-    modified = df_row["letzte Prüfung/ Kalibration"]
-    rel = df_row["Zubehör"]
+    maintainer = row.maintainer
+    meas_tech = row.measuring_principle
+    modified = row.modified
+    rel = row.relation
 
     # the sensor
     sensor = Sensor(data, hasSensorCapability=SENSOR[sensor_id + "/SensorCapability"],
-                    iri=SENSOR[sensor_id], identifier=sensor_id, name=df_row["Bezeichnung"],
-                    comment=df_row["Bemerkung"], owner="FST", manufacturer=df_row["Hersteller"],
-                    serialNumber=str(df_row["Seriennummer"]), location=df_row["Aufbewahrungsort"])
+                    iri=SENSOR[sensor_id], identifier=sensor_id, name=row.name,
+                    comment=row.comment, owner="FST", manufacturer=row.manufacturer,
+                    serialNumber=str(row.serial_number), location=row.location)
     sensor.identifier = f"fst-inv:{fst_id}"
-    data.g.add((sensor.iri, DBO.maintainedBy, Literal(maintainer)))
-    data.g.add((sensor.iri, SOSA.usedProcedure, Literal(meas_tech)))
-    data.g.add((sensor.iri, SDO.keywords, Literal(sheet_name)))
-    data.g.add((sensor.iri, DCTERMS.modified, Literal(modified)))
+    data.add((sensor.iri, DBO.maintainedBy, Literal(maintainer)))
+    data.add((sensor.iri, SOSA.usedProcedure, Literal(meas_tech)))
+    data.add((sensor.iri, SDO.keywords, Literal(sheet_name)))
+    data.add((sensor.iri, DCTERMS.modified, Literal(modified)))
     if val_ref is not None:
-        data.g.add((sensor.iri, SDO.keywords, Literal(val_ref)))
+        data.add((sensor.iri, SDO.keywords, Literal(val_ref)))
     if meas_tech is not None:
-        data.g.add((sensor.iri, SDO.keywords, Literal(meas_tech)))
+        data.add((sensor.iri, SDO.keywords, Literal(meas_tech)))
     if rel is not None:
-        data.g.add((sensor.iri, DCTERMS.relation, Literal(rel)))
+        data.add((sensor.iri, DCTERMS.relation, Literal(rel)))
 
     # properties
     sys_capa = SensorCapability(data, iri=SENSOR[sensor_id + "/SensorCapability"], name="sensor capabilities",
                                 comment="sensor capabilities not regarding any conditions at this time")
 
-    meas_range = Quantity(data, isPropertyOf=sys_capa.iri, hasQuantityKind=quantitykind_dict[sheet_name],
-                          minValue=Literal(str(df_row["Messbereich von"]), datatype=XSD.double), maxValue=Literal(str(df_row["Messbereich bis"]), datatype=XSD.double), unit=unit_dict[df_row["Messbereich Einheit"]],
+    meas_range = Quantity(data, isPropertyOf=sys_capa.iri, hasQuantityKind=quantity_kind(sheet_name),
+                          minValue=Literal(str(row.range_min), datatype=XSD.double), maxValue=Literal(str(row.range_max), datatype=XSD.double), unit=unit_iri(row.range_unit),
                           iri=SENSOR[sensor_id + "/MeasurementRange"], identifier=None, name="measurement range",
                           rdftype=SSN_SYSTEM.MeasurementRange)
 
     if val_ref is not None:
-        data.g.add((meas_range.iri, SDO.valueReference, Literal(val_ref)))
+        data.add((meas_range.iri, SDO.valueReference, Literal(val_ref)))
 
     sensor_actuation_range = Quantity(data, isPropertyOf=sys_capa.iri, hasQuantityKind=QUANTITYKIND.Voltage,
-                                      minValue=Literal(str(df_row["Ausgabebereich von"]), datatype=XSD.double), maxValue=Literal(str(df_row["Ausgabebereich bis"]), datatype=XSD.double),
-                                      unit=unit_dict[df_row["Ausgabebereich Einheit"]],
+                                      minValue=Literal(str(row.output_min), datatype=XSD.double), maxValue=Literal(str(row.output_max), datatype=XSD.double),
+                                      unit=unit_iri(row.output_unit),
                                       iri=SENSOR[sensor_id + "/SensorActuationRange"], identifier=None, name="sensor output voltage range",
                                       rdftype=SSN_SYSTEM.ActuationRange)
     sensitivity = Property(data, isPropertyOf=sys_capa.iri, iri=SENSOR[sensor_id + "/Sensitivity"],
                            comment="gain", rdftype=SSN_SYSTEM.Sensitivity, name="sensitivity",
-                           value=Literal(str(df_row["Kennlinie Steigung _ Sensitivity"]), datatype=XSD.double),
-                           unit=Literal(f'({str(df_row["Messbereich Einheit"])})/({str(df_row["Ausgabebereich Einheit"])})'),)
+                           value=Literal(str(row.sensitivity), datatype=XSD.double),
+                           unit=Literal(f'({str(row.range_unit)})/({str(row.output_unit)})'),)
 
     bias = Property(data, isPropertyOf=sys_capa.iri, iri=SENSOR[sensor_id + "/Bias"],
                     comment="offset", rdftype=SSN_SYSTEM.SystemProperty, name="bias",
-                    value=Literal(str(df_row["Kennlinie Offset _ Bias"]), datatype=XSD.double),
-                    unit=unit_dict[df_row["Messbereich Einheit"]])
-
-    if (df_row["Bias Uncertainty Unit"] is not None
-            and df_row["Bias Uncertainty Unit"] in unit_dict.keys()):
-        bias_uncertainty_unit = unit_dict[df_row["Bias Uncertainty Unit"]]
-    elif (df_row["Bias Uncertainty Unit"] is None
-          or (isinstance(df_row["Bias Uncertainty"], str)
-              and df_row["Bias Uncertainty"].lower() == 'unknown')):
-        bias_uncertainty_unit = None
-    elif (df_row["Bias Uncertainty Unit"] is not None
-            and df_row["Bias Uncertainty Unit"] not in unit_dict.keys()):
-        bias_uncertainty_unit = df_row["Bias Uncertainty Unit"]
-
-    if (df_row["Bias Uncertainty"] is None
-            or (isinstance(df_row["Bias Uncertainty"], str)
-                and df_row["Bias Uncertainty"].lower() == 'unknown')):
-        bias_uncertainty_value = None
-    else:
-        bias_uncertainty_value = Literal(str(df_row["Bias Uncertainty"]), datatype=XSD.double)
-
-    if (df_row["Bias Uncertainty Comment"] is None
-            or (isinstance(df_row["Bias Uncertainty Comment"], str)
-                and df_row["Bias Uncertainty Comment"].lower() == 'unknown')):
-        bias_uncertainty_comment = None
-    else:
-        bias_uncertainty_comment = Literal(str(df_row["Bias Uncertainty Comment"]))
-
-    if (df_row["Bias Uncertainty Keywords"] is None
-            or (isinstance(df_row["Bias Uncertainty Keywords"], str)
-                and df_row["Bias Uncertainty Keywords"].lower() == 'unknown')):
-        bias_uncertainty_keywords_list = None
-    else:
-        temp_string = str(df_row["Bias Uncertainty Keywords"])
-        bias_uncertainty_keywords_list = temp_string.split(';')
-        del temp_string
-
-    bias_uncertainty = Property(data, isPropertyOf=bias.iri, iri=SENSOR[sensor_id + "/Bias/BiasUncertainty"],
-                    name="bias uncertainty",
-                    description="The bias uncertainty of the sensor of the linear transfer function of a sensor.",
-                    seeAlso=[URIRef("https://doi.org/10.1007/978-3-030-78354-9"),
-                             URIRef("https://dx.doi.org/10.2139/ssrn.4452038")],
-                    conformsTo=[URIRef("https://doi.org/10.1007/978-3-030-78354-9"),
-                                URIRef("https://dx.doi.org/10.2139/ssrn.4452038")],
-                    value=bias_uncertainty_value,
-                    unit=bias_uncertainty_unit,
-                    comment=bias_uncertainty_comment,
-                    keywords_list=bias_uncertainty_keywords_list)
-
-    if (df_row["Sensitivity Uncertainty Unit"] is not None
-            and df_row["Sensitivity Uncertainty Unit"] in unit_dict.keys()):
-        sensitivity_uncertainty_unit = unit_dict[df_row["Sensitivity Uncertainty Unit"]]
-    elif (df_row["Sensitivity Uncertainty Unit"] is None
-          or (isinstance(df_row["Sensitivity Uncertainty"], str)
-              and df_row["Sensitivity Uncertainty"].lower() == 'unknown')):
-        sensitivity_uncertainty_unit = None
-    elif (df_row["Sensitivity Uncertainty Unit"] is not None
-          and df_row["Sensitivity Uncertainty Unit"] not in unit_dict.keys()):
-        sensitivity_uncertainty_unit = df_row["Sensitivity Uncertainty Unit"]
-
-    if (df_row["Sensitivity Uncertainty"] is None
-            or (isinstance(df_row["Sensitivity Uncertainty"], str)
-                and df_row["Sensitivity Uncertainty"].lower() == 'unknown')):
-        sensitivity_uncertainty_value = None
-    else:
-        sensitivity_uncertainty_value = Literal(str(df_row["Sensitivity Uncertainty"]), datatype=XSD.double)
-
-    if (df_row["Sensitivity Uncertainty Comment"] is None
-            or (isinstance(df_row["Sensitivity Uncertainty Comment"], str)
-                and df_row["Sensitivity Uncertainty Comment"].lower() == 'unknown')):
-        sensitivity_uncertainty_comment= None
-    else:
-        sensitivity_uncertainty_comment = Literal(str(df_row["Sensitivity Uncertainty Comment"]))
-
-    if (df_row["Sensitivity Uncertainty Keywords"] is None
-            or (isinstance(df_row["Sensitivity Uncertainty Keywords"], str)
-                and df_row["Sensitivity Uncertainty Keywords"].lower() == 'unknown')):
-        sensitivity_uncertainty_keywords_list = None
-    else:
-        temp_string = str(df_row["Sensitivity Uncertainty Keywords"])
-        sensitivity_uncertainty_keywords_list = temp_string.split(';')
-        del temp_string
-
-    sensitivity_uncertainty = Property(data, isPropertyOf=sensitivity.iri, iri=SENSOR[sensor_id + "/Sensitivity/SensitivityUncertainty"],
-                                        description="The sensitivity uncertainty of the linear transfer function of a sensor.",
-                                        name="sensitivity uncertainty",
-                                       seeAlso=[URIRef("https://doi.org/10.1007/978-3-030-78354-9"),
-                                                URIRef("https://dx.doi.org/10.2139/ssrn.4452038")],
-                                       conformsTo=[URIRef("https://doi.org/10.1007/978-3-030-78354-9"),
-                                                   URIRef("https://dx.doi.org/10.2139/ssrn.4452038")],
-                                        value=sensitivity_uncertainty_value,
-                                        unit=sensitivity_uncertainty_unit,
-                                        comment=sensitivity_uncertainty_comment,
-                                        keywords_list=sensitivity_uncertainty_keywords_list)
-
-    if (df_row["Linearity Uncertainty Unit"] is not None
-            and df_row["Linearity Uncertainty Unit"] in unit_dict.keys()):
-        linearity_uncertainty_unit = unit_dict[df_row["Linearity Uncertainty Unit"]]
-    elif (df_row["Linearity Uncertainty Unit"] is None
-            or (isinstance(df_row["Linearity Uncertainty Unit"], str)
-                and df_row["Linearity Uncertainty Unit"].lower() == 'unknown')):
-        linearity_uncertainty_unit = None
-    elif (df_row["Linearity Uncertainty Unit"] is not None
-          and df_row["Linearity Uncertainty Unit"] not in unit_dict.keys()):
-        linearity_uncertainty_unit = df_row["Linearity Uncertainty Unit"]
-
-    if (df_row["Linearity Uncertainty"] is None
-            or (isinstance(df_row["Linearity Uncertainty"], str)
-                and df_row["Linearity Uncertainty"].lower() == 'unknown')):
-        linearity_uncertainty_value = None
-    else:
-        linearity_uncertainty_value = Literal(str(df_row["Linearity Uncertainty"]), datatype=XSD.double)
-
-    if (df_row["Linearity Uncertainty Comment"] is None
-            or (isinstance(df_row["Linearity Uncertainty Comment"], str)
-                and df_row["Linearity Uncertainty Comment"].lower() == 'unknown')):
-        linearity_uncertainty_comment = None
-    else:
-        linearity_uncertainty_comment = Literal(str(df_row["Linearity Uncertainty Comment"]))
-
-    if (df_row["Linearity Uncertainty Keywords"] is None
-            or (isinstance(df_row["Linearity Uncertainty Keywords"], str)
-                and df_row["Linearity Uncertainty Keywords"].lower() == 'unknown')):
-        linearity_uncertainty_keywords_list = None
-    else:
-        temp_string = str(df_row["Linearity Uncertainty Keywords"])
-        linearity_uncertainty_keywords_list = temp_string.split(';')
-        del temp_string
-
-    linearity_uncertainty = Property(data, isPropertyOf=sys_capa.iri, iri=SENSOR[sensor_id + "/LinearityUncertainty"],
-                               name="linearity uncertainty",
-                               seeAlso=[URIRef("https://doi.org/10.1007/978-3-030-78354-9"),
-                                        URIRef("https://dx.doi.org/10.2139/ssrn.4452038")],
-                               conformsTo=[URIRef("https://doi.org/10.1007/978-3-030-78354-9"),
-                                           URIRef("https://dx.doi.org/10.2139/ssrn.4452038")],
-                               description="The linearity uncertainty of the linear transfer function of a sensor.",
-                               value=linearity_uncertainty_value,
-                               unit=linearity_uncertainty_unit,
-                               comment=linearity_uncertainty_comment,
-                               keywords_list=linearity_uncertainty_keywords_list)
-
-    if (df_row["Hysteresis Uncertainty Unit"] is not None
-            and df_row["Hysteresis Uncertainty Unit"] in unit_dict.keys()):
-        hysteresis_uncertainty_unit = unit_dict[df_row["Hysteresis Uncertainty Unit"]]
-    elif (df_row["Hysteresis Uncertainty Unit"] is None
-          or (isinstance(df_row["Hysteresis Uncertainty Unit"], str)
-              and df_row["Hysteresis Uncertainty Unit"].lower() == 'unknown')):
-        hysteresis_uncertainty_unit = None
-    elif (df_row["Hysteresis Uncertainty Unit"] is not None
-          and df_row["Hysteresis Uncertainty Unit"] not in unit_dict.keys()):
-        hysteresis_uncertainty_unit = df_row["Hysteresis Uncertainty Unit"]
-
-    if (df_row["Hysteresis Uncertainty"] is None
-            or (isinstance(df_row["Hysteresis Uncertainty"], str)
-                and df_row["Hysteresis Uncertainty"].lower() == 'unknown')):
-        hysteresis_uncertainty_value = None
-    else:
-        hysteresis_uncertainty_value = Literal(str(df_row["Hysteresis Uncertainty"]), datatype=XSD.double)
-
-    if (df_row["Hysteresis Uncertainty Comment"] is None
-            or (isinstance(df_row["Hysteresis Uncertainty Comment"], str)
-                and df_row["Hysteresis Uncertainty Comment"].lower() == 'unknown')):
-        hysteresis_uncertainty_comment = None
-    else:
-        hysteresis_uncertainty_comment = Literal(str(df_row["Hysteresis Uncertainty Comment"]))
-
-    if (df_row["Hysteresis Uncertainty Keywords"] is None
-            or (isinstance(df_row["Hysteresis Uncertainty Keywords"], str)
-                and df_row["Hysteresis Uncertainty Keywords"].lower() == 'unknown')):
-        hysteresis_uncertainty_keywords_list = None
-    else:
-        temp_string = str(df_row["Hysteresis Uncertainty Keywords"])
-        hysteresis_uncertainty_keywords_list = temp_string.split(';')
-        del temp_string
-
-    hysteresis_uncertainty = Property(data, isPropertyOf=sys_capa.iri, iri=SENSOR[sensor_id + "/HysteresisUncertainty"],
-                                name="hysteresis uncertainty",
-                                seeAlso=[URIRef("https://doi.org/10.1007/978-3-030-78354-9"),
-                                         URIRef("https://dx.doi.org/10.2139/ssrn.4452038")],
-                                conformsTo=[URIRef("https://doi.org/10.1007/978-3-030-78354-9"),
-                                            URIRef("https://dx.doi.org/10.2139/ssrn.4452038")],
-                                description="The hysteresis uncertainty of the linear transfer function of a sensor.",
-                                value=hysteresis_uncertainty_value,
-                                unit=hysteresis_uncertainty_unit,
-                                comment=hysteresis_uncertainty_comment,
-                                keywords_list=hysteresis_uncertainty_keywords_list)
+                    value=Literal(str(row.bias), datatype=XSD.double),
+                    unit=unit_iri(row.range_unit))
+
+    add_uncertainty(data, bias.iri, SENSOR[sensor_id + "/Bias/BiasUncertainty"], "bias uncertainty",
+                    "The bias uncertainty of the sensor of the linear transfer function of a sensor.",
+                    row.bias_uncertainty, row.bias_uncertainty_unit,
+                    row.bias_uncertainty_comment, row.bias_uncertainty_keywords)
+    add_uncertainty(data, sensitivity.iri, SENSOR[sensor_id + "/Sensitivity/SensitivityUncertainty"],
+                    "sensitivity uncertainty",
+                    "The sensitivity uncertainty of the linear transfer function of a sensor.",
+                    row.sensitivity_uncertainty, row.sensitivity_uncertainty_unit,
+                    row.sensitivity_uncertainty_comment, row.sensitivity_uncertainty_keywords)
+    add_uncertainty(data, sys_capa.iri, SENSOR[sensor_id + "/LinearityUncertainty"], "linearity uncertainty",
+                    "The linearity uncertainty of the linear transfer function of a sensor.",
+                    row.linearity_uncertainty, row.linearity_uncertainty_unit,
+                    row.linearity_uncertainty_comment, row.linearity_uncertainty_keywords)
+    add_uncertainty(data, sys_capa.iri, SENSOR[sensor_id + "/HysteresisUncertainty"], "hysteresis uncertainty",
+                    "The hysteresis uncertainty of the linear transfer function of a sensor.",
+                    row.hysteresis_uncertainty, row.hysteresis_uncertainty_unit,
+                    row.hysteresis_uncertainty_comment, row.hysteresis_uncertainty_keywords)
 
     # We got all info we want > make dirs if they don't exist
     rdfpath = sensor_dir + sensor_id + "/"
     docpath = rdfpath + "docs"
     imgpath = rdfpath + "img"
-    Path(docpath).mkdir(parents=True, exist_ok=True)
-    Path(imgpath).mkdir(parents=True, exist_ok=True)
+    if assets is not None:
+        assets.make_directory(sensor_id, "docs")
+        assets.make_directory(sensor_id, "img")
+        images = [name for name, _ in assets.files(sensor_id, "img")]
+        documents = [name for name, _ in assets.files(sensor_id, "docs")]
+    else:
+        Path(docpath).mkdir(parents=True, exist_ok=True)
+        Path(imgpath).mkdir(parents=True, exist_ok=True)
+        with os.scandir(imgpath) as it:
+            images = [entry.name for entry in it if entry.is_file()]
+        with os.scandir(docpath) as it:
+            documents = [entry.name for entry in it if entry.is_file()]
 
     # documentation
-    with os.scandir(imgpath) as it:
-        for entry in it:
-            if entry.name.lower().endswith((".png", ".jpg", "jpeg")) and entry.is_file():
-                img = URIRef("img/" + quote(entry.name))
-                sensor.subjectOf = img
-                sensor.image = img
-
-    docs = URIRef("docs/")
+    for name in images:
+        if name.lower().endswith((".png", ".jpg", "jpeg")):
+            img = local("img/" + quote(name))
+            sensor.subjectOf = img
+            sensor.image = img
+
+    docs = local("docs/")
     sensor.subjectOf = docs
     sensor.documentation = docs
 
-    with os.scandir(docpath) as it:
-        for entry in it:
-            if entry.is_file():
-                datasheet = URIRef("docs/" + quote(entry.name))
-                sensor.subjectOf = datasheet
-                sensor.documentation = datasheet
+    for name in documents:
+        datasheet = local("docs/" + quote(name))
+        sensor.subjectOf = datasheet
+        sensor.documentation = datasheet
 
     # rdf doc references
     docttl = SENSOR[sensor_id + "/rdf.ttl"]
-    data.g.add((docttl, RDF.type, FOAF.Document))  # schema:CreativeWork
-    data.g.add((docttl, RDF.type, SDO.TextObject))
-    data.g.add((docttl, FOAF.primaryTopic, sensor.iri))  # schema:about
-    data.g.add((docttl, SDO.encodingFormat, Literal('text/turtle')))
+    data.add((docttl, RDF.type, FOAF.Document))  # schema:CreativeWork
+    data.add((docttl, RDF.type, SDO.TextObject))
+    data.add((docttl, FOAF.primaryTopic, sensor.iri))  # schema:about
+    data.add((docttl, SDO.encodingFormat, Literal('text/turtle')))
 
     docxml = SENSOR[sensor_id + "/rdf.xml"]
-    data.g.add((docxml, RDF.type, FOAF.Document))
-    data.g.add((docxml, RDF.type, SDO.TextObject))
-    data.g.add((docxml, FOAF.primaryTopic, sensor.iri))
-    data.g.add((docxml, SDO.encodingFormat, Literal('application/rdf+xml')))
+    data.add((docxml, RDF.type, FOAF.Document))
+    data.add((docxml, RDF.type, SDO.TextObject))
+    data.add((docxml, FOAF.primaryTopic, sensor.iri))
+    data.add((docxml, SDO.encodingFormat, Literal('application/rdf+xml')))
 
     docjson = SENSOR[sensor_id + "/rdf.json"]
-    data.g.add((docjson, RDF.type, FOAF.Document))
-    data.g.add((docjson, RDF.type, SDO.TextObject))
-    data.g.add((docjson, FOAF.primaryTopic, sensor.iri))
+    data.add((docjson, RDF.type, FOAF.Document))
+    data.add((docjson, RDF.type, SDO.TextObject))
+    data.add((docjson, FOAF.primaryTopic, sensor.iri))
     # TODO: FIXME: Falls iana als seite bleibt oder älter ist könnte man auch kucken ob man die URL von dort als p_ID verwendet https://www.iana.org/assignments/media-types/media-types.xhtml
     # TODO: FIXME: auch n0ochmal kucken ob das sinnvoll ist beides anzugeben, oder nur die rdf sachen
-    data.g.add((docjson, SDO.encodingFormat, Literal('application/json')))
-    data.g.add((docjson, SDO.encodingFormat, Literal('application/ld+json')))
-
-    print(f'#### Sensor {sensor.identifier}')
-    print(data.g.serialize(destination=rdfpath + "rdf.json", format="json-ld", auto_compact=True))
-    print(data.g.serialize(destination=rdfpath + "rdf.ttl", base=SENSOR, format="longturtle"))
-    print(data.g.serialize(destination=rdfpath + "rdf.xml", base=SENSOR, format="xml"))
-
+    data.add((docjson, SDO.encodingFormat, Literal('application/json')))
+    data.add((docjson, SDO.encodingFormat, Literal('application/ld+json')))
 
+    if not quiet:
+        print(f'#### Sensor {sensor.identifier}')
+    if kraken is None:
+        data.write_all(rdfpath, base=SENSOR, workers=serialization_workers, quiet=quiet, writer=writer)
+    return data
 
-def run_script(sensor_table_path: [Path, str], generated_files_directory_path: [Path, str]):
-    SUPPORTED_SENSOR_TABLE_SHEET_NAMES = ["Druck",
-                                          "Kraft",
-                                          "Temperatur",
-                                          "Weg",
-                                          "Leistung",
-                                          "Volumenstrom"]
 
+def _listing(directory: str) -> List[Tuple[str, int, int]]:
+    # name, size and modification time of the files in directory, empty if it does not exist yet
+    try:
+        with os.scandir(directory) as it:
+            return sorted((entry.name, entry.stat().st_size, entry.stat().st_mtime_ns)
+                          for entry in it if entry.is_file())
+    except FileNotFoundError:
+        return []
+
+
+def sensor_hashes(rows: List[Tuple[str, SensorRow]], sensor_dir: str,
+                  assets: AssetIndex | None = None) -> Dict[str, str]:
+    """
+    content hash per sensor uuid over its normalized rows (with sheet name), the listings of its
+    img/ and docs/ folders and the source of this generator. validate_sensor_sheets rejects uuids used
+    more than once, so every uuid has one row.
+    with an AssetIndex the listings hold the content hashes of the files instead of their modification times.
+    """
+    generator = hashlib.sha256(Path(__file__).read_bytes()).hexdigest()
+    contents = {row.uuid: [generator, [sheet_name, list(row)]] for sheet_name, row in rows}
+    hashes = {}
+    for uuid, content in contents.items():
+        for folder in ("img", "docs"):
+            if assets is not None:
+                content.append([(name, entry.size, entry.sha256) for name, entry in assets.files(uuid, folder)])
+            else:
+                content.append(_listing(f"{sensor_dir}{uuid}/{folder}"))
+        hashes[uuid] = hashlib.sha256(json.dumps(content, default=str).encode("utf-8")).hexdigest()
+    return hashes
+
+
+def _is_written(sensor_dir: str, uuid: str, assets: AssetIndex | None = None) -> bool:
+    if assets is not None:
+        files = assets.resources.get(uuid, {})
+        return all(filename in files for filename, _ in SERIALIZATION_FORMATS.values())
+    return all(os.path.isfile(f"{sensor_dir}{uuid}/{filename}") for filename, _ in SERIALIZATION_FORMATS.values())
+
+
+def _generate_rows(sensor_dir: str, rows: List[Tuple[str, SensorRow]], profile: bool,
+                   assets: AssetIndex | None, catalog: bool = False) -> Tuple[list, list, Profiler | None]:
+    # runs in a worker process of run_script
+    # with catalog the catalog member of every generated row is returned as well (None for errors)
+    profiler = Profiler() if profile else None
+    errors = []
+    members = []
+    with instrumented(Thing) if profiler is not None else nullcontext():
+        for sheet_name, row in rows:
+            try:
+                with profiler.section("generate sensor") if profiler is not None else nullcontext():
+                    data = generate_sensor_files(sensor_dir, sheet_name, row, profiler=profiler,
+                                                 quiet=True, serialization_workers=1, assets=assets)
+                    member = resource_member(data.g, base=SENSOR[f"{row.uuid}/"]) if catalog else None
+            except ValueError as e:
+                errors.append(str(e))
+                members.append(None)
+            else:
+                errors.append(None)
+                members.append(member)
+    return errors, members, profiler
+
+
+def run_script(sensor_table_path: [Path, str], generated_files_directory_path: [Path, str],
+               profiler: Profiler | None = None, single_graph: bool = False, workers: int = 1,
+               manifest: [Path, str, None] = None, force: bool = False,
+               sheets: Dict[str, pd.DataFrame] | None = None, cache_dir: [Path, str, None] = None,
+               report: [Path, str, None] = None, assets: AssetIndex | None = None,
+               catalog: CatalogWriter | None = None) -> dict:
+    # with a profiler excel parsing, graph building and serialization of all sensors are collected in it,
+    # run_script must then not be called inside of profiling.instrumented() / Kraken.profiling()
+    # single_graph builds all sensors into one graph and writes the pID directories in one sharding pass
+    # workers > 1 spreads the rows over a process pool, the files are the same as with one worker
+    # all sheets are validated first (validate_sensor_sheets), invalid rows are skipped before any graph is built
+    # and reported together at the end, also as json file if report is given. the summary is returned
+    # with manifest (json file, uuid -> sensor_hashes) sensors whose rows, img/ and docs/ did not change
+    # since the last run are not generated again, force regenerates all of them
+    # sheets are the already parsed sheets of the table (see excel_cache.read_workbook), otherwise only
+    # the supported sheets and known columns are parsed, with cache_dir through the workbook cache
+    # assets is an AssetIndex of generated_files_directory_path used instead of scanning every sensor directory
+    # catalog gets every valid sensor, the ones left unchanged by the manifest are taken over with catalog.keep,
+    # it is written when the caller closes it
+    if workers > 1 and single_graph:
+        raise ValueError("single_graph builds one graph in this process and cannot be combined with workers")
 
     # Get the path of the direcotry of this file
     directory_path = Path(__file__).parent.resolve()
 
-    dfs = pd.read_excel(sensor_table_path, sheet_name=None, skiprows=[1])
+    with profiler.section("read excel") if profiler is not None else nullcontext():
+        dfs = sheets if sheets is not None else read_workbook(
+            sensor_table_path, sheet_names=SUPPORTED_SENSOR_TABLE_SHEET_NAMES, columns=SENSOR_TABLE_COLUMNS,
+            skiprows=[1], cache_dir=cache_dir)
     # sensor_dir = "C:/Users/NP/Documents/AIMS/metadata_hub/data/fst_measurement_equipment/"
     try:
         generated_files_directory_path.mkdir()
     except FileExistsError:
         pass
 
-    for sheet_name in SUPPORTED_SENSOR_TABLE_SHEET_NAMES:
-        df = dfs[sheet_name]
-        for idx in df.index:
-            row = df.iloc[idx]
-            row = row.replace({np.nan: None})
-
-            # TODO: Add some control code that checks if the necessary minimal set of information is present
-            try:
-                generate_sensor_files(f"{generated_files_directory_path}/", sheet_name, row)
-            except ValueError as e:
-                warnings.warn(f'There is a value error in one of the inputs in the {row["Ident-Nummer"]} line.\nSkipping Line..', category=Warning, stacklevel=1)
-                pass
+    sensor_dir = f"{generated_files_directory_path}/"
+    start = time.perf_counter()
+    with profiler.section("validate") if profiler is not None else nullcontext():
+        validation = validate_sensor_sheets(dfs, SUPPORTED_SENSOR_TABLE_SHEET_NAMES)
+    if report is not None:
+        with open(report, "w", encoding="utf-8") as f:
+            json.dump(validation, f, indent=2, ensure_ascii=False)
 
+    rows = []
+    for sheet_name in SUPPORTED_SENSOR_TABLE_SHEET_NAMES:
+        if sheet_name in validation["missing_sheets"]:
+            continue
+        invalid = set(validation["invalid"].get(sheet_name, ()))
+        rows.extend((sheet_name, row) for position, row in enumerate(normalize_sensor_sheet(dfs[sheet_name]))
+                    if position not in invalid)
+
+    number_of_rows = validation["rows"]
+    number_of_valid_rows = len(rows)
+    valid_uuids = [row.uuid for _, row in rows]
+    if manifest is not None:
+        manifest = Path(manifest)
+        hashes = sensor_hashes(rows, sensor_dir, assets)
+        previous = {}
+        if not force and manifest.is_file():
+            with open(manifest, encoding="utf-8") as f:
+                previous = json.load(f)
+        changed = {uuid for uuid, content_hash in hashes.items()
+                   if previous.get(uuid) != content_hash or not _is_written(sensor_dir, uuid, assets)}
+        rows = [(sheet_name, row) for sheet_name, row in rows if row.uuid in changed]
+
+    kraken = None
+    if single_graph:
+        kraken = Kraken(store="AppendOnly", profile=profiler, terms=True)
+        kraken.g.bind("fst", SENSOR)
+
+    if workers > 1:
+        # validation leaves one row per uuid, so the rows write distinct directories and need no ordering
+        errors: List[str | None] = []
+        task_assets = (assets.select([row.uuid]) if assets is not None else None for _, row in rows)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = pool.map(_generate_rows, repeat(sensor_dir), ([task] for task in rows),
+                               repeat(profiler is not None), task_assets, repeat(catalog is not None),
+                               chunksize=max(1, len(rows) // (4 * workers)))
+            for (_, row), (task_errors, task_members, task_profiler) in zip(rows, results):
+                errors.extend(task_errors)
+                if task_members[0] is not None:
+                    catalog.add(row.uuid, task_members[0])
+                if task_profiler is not None:
+                    profiler.merge(task_profiler)
+        if assets is not None:
+            # the workers created the folders in their copies of the index
+            for (_, row), error in zip(rows, errors):
+                if error is None:
+                    assets.make_directory(row.uuid, "docs")
+                    assets.make_directory(row.uuid, "img")
+    else:
+        # serialized here, the files are written by the threads of the writer meanwhile
+        errors = []
+        # constructors and setters are timed for this loop only, the entity classes are patched meanwhile
+        with OutputWriter() as writer, instrumented(Thing) if profiler is not None else nullcontext():
+            for sheet_name, row in rows:
+                # TODO: Add some control code that checks if the necessary minimal set of information is present
+                try:
+                    with profiler.section("generate sensor") if profiler is not None else nullcontext():
+                        data = generate_sensor_files(sensor_dir, sheet_name, row, profiler=profiler, kraken=kraken,
+                                                     assets=assets, serialization_workers=1, writer=writer)
+                        if catalog is not None and kraken is None:
+                            catalog.add_graph(row.uuid, data.g, base=SENSOR[f"{row.uuid}/"])
+                except ValueError as e:
+                    errors.append(str(e))
+                else:
+                    errors.append(None)
+
+    if kraken is not None:
+        kraken.write_shards(generated_files_directory_path, namespace=SENSOR, base=SENSOR)
+        if catalog is not None:
+            # the shared graph holds absolute iris already
+            for key, graph in kraken.shard_by_resource(SENSOR).items():
+                if key is not None:
+                    catalog.add_graph(key, graph)
+
+    seconds = time.perf_counter() - start
+    skipped = [{"sheet": sheet_name, "ident_number": row.ident_number, "uuid": row.uuid, "error": error}
+               for (sheet_name, row), error in zip(rows, errors) if error is not None]
+    unchanged = number_of_valid_rows - len(rows)
+    if catalog is not None:
+        generated_uuids = {row.uuid for _, row in rows}
+        for uuid in valid_uuids:
+            if uuid not in generated_uuids:
+                catalog.keep(uuid, f"{sensor_dir}{uuid}")
+    if manifest is not None:
+        # sensors with errors stay out of the manifest, so they are tried and reported again next run
+        failed = {entry["uuid"] for entry in skipped}
+        with open(manifest, "w", encoding="utf-8") as f:
+            json.dump({uuid: content_hash for uuid, content_hash in hashes.items() if uuid not in failed},
+                      f, indent=2, sort_keys=True)
+    if not validation["valid"]:
+        lines = [f'    sheet {sheet_name} is missing' for sheet_name in validation["missing_sheets"]]
+        lines += [f'    {sheet_name}: columns {", ".join(columns)} are missing'
+                  for sheet_name, columns in validation["missing_columns"].items()]
+        lines += [f'    {error["sheet"]}, line {error["line"]}, {error["column"]} = {error["value"]}: {error["error"]}'
+                  for error in validation["errors"]]
+        warnings.warn(f'{validation["invalid_rows"]} of {number_of_rows} lines of the sensor table are invalid, '
+                      f'skipping them:\n' + "\n".join(lines), category=Warning, stacklevel=2)
+    if skipped:
+        lines = "\n".join(f'    {entry["sheet"]}, {entry["ident_number"]}: {entry["error"]}' for entry in skipped)
+        warnings.warn(f'There are value errors in {len(skipped)} lines, skipping them:\n{lines}',
+                      category=Warning, stacklevel=2)
+    generated = len(rows) - len(skipped)
+    print(f"generated {generated} of {number_of_rows} sensors in {seconds:.3f} s "
+          f"({len(rows) / seconds:.1f} rows/s, {workers} worker{'s' if workers > 1 else ''})"
+          + (f", {unchanged} unchanged" if unchanged else "")
+          + (f", {validation['invalid_rows']} invalid" if validation["invalid_rows"] else ""))
+    return {"rows": number_of_rows, "generated": generated, "unchanged": unchanged,
+            "invalid": validation["invalid_rows"], "skipped": skipped, "validation": validation,
+            "seconds": seconds, "rows_per_second": len(rows) / seconds}
@@ -201,10 +201,7 @@ def main():
     except FileExistsError:
         pass
 
-    file_path = f"{dir_path}/rdf"
-    print(data.g.serialize(destination=f"{file_path}.json", format="json-ld", auto_compact=True))
-    print(data.g.serialize(destination=f"{file_path}.ttl", base=TEST_RIG, format="longturtle", encoding="utf-8"))
-    print(data.g.serialize(destination=f"{file_path}.xml", base=TEST_RIG, format="xml"))
+    data.write_all(dir_path, base=TEST_RIG)
 
     generate_sensor_md(f'{dir_path}/')
 
@@ -282,9 +282,7 @@ def main():
     data.g.add((docjson, RDF.type, FOAF.Document))
     data.g.add((docjson, FOAF.primaryTopic, sensor.iri))
 
-    print(data.g.serialize(destination=rdfpath + "rdf.json", format="json-ld", auto_compact=True))
-    print(data.g.serialize(destination=rdfpath + "rdf.ttl", base=SENSOR, format="longturtle"))
-    print(data.g.serialize(destination=rdfpath + "rdf.xml", base=SENSOR, format="xml"))
+    data.write_all(rdfpath, base=SENSOR)
 
     gitlab_db_mdgen.generate_sensor_md(rdfpath)
 
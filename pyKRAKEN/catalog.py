@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import gzip
+import re
+from pathlib import Path
+from typing import BinaryIO, Dict, Tuple
+from urllib.parse import urljoin, urlsplit
+
+from rdflib import Graph, Literal, Namespace, URIRef
+from rdflib.namespace import DCAT, DCTERMS, FOAF, RDF, XSD
+from rdflib.plugins.serializers.nt import _nt_row
+
+from pyKRAKEN.kraken import FST
+from pyKRAKEN.output import write_if_changed
+
+# all resources of a generator run in one file next to the pID directories, e.g.:
+#     with CatalogWriter("_generated/catalog/sensors.nt.gz") as catalog:
+#         for ...:
+#             catalog.add_graph(uuid, kraken.g, base=FST[f"{uuid}/"])
+# sensors.nt.gz holds one gzip member per resource (sorted n-triples, members sorted by resource), so
+# `zcat sensors.nt.gz` gives every triple and a single resource is read by decompressing only its bytes.
+# sensors.catalog.ttl is the dcat catalog with one dataset per resource, whose distribution
+# <sensors.nt.gz#bytes=<first>-<last>> names the byte range of its member (inclusive like an http range)
+
+MEDIA_TYPES = Namespace("https://www.iana.org/assignments/media-types/")
+CATALOG_SUFFIX = ".catalog.ttl"
+
+_BYTE_RANGE = re.compile(r"#bytes=(\d+)-(\d+)$")
+
+
+def _absolute(term, base: str | None):
+    # n-triples cannot hold relative iris like <docs/>, they are resolved against the resource directory
+    if base is not None and isinstance(term, URIRef) and not urlsplit(term).scheme:
+        return URIRef(urljoin(base, term))
+    return term
+
+
+def resource_member(graph: Graph, base: [Namespace, URIRef, str, None] = None) -> bytes:
+    """
+    the triples of graph as sorted n-triples in one gzip member, relative iris are resolved against base.
+    the member does not depend on the time it was written, the same graph always gives the same bytes.
+    """
+    base = str(base) if base is not None else None
+    lines = {_nt_row(tuple(_absolute(term, base) for term in triple)) for triple in graph}
+    return gzip.compress("".join(sorted(lines)).encode("utf-8"), compresslevel=9, mtime=0)
+
+
+def read_catalog_index(index: str | Path) -> Dict[str, Tuple[int, int]]:
+    """
+    resource -> (offset, size) of its gzip member in the catalog file, read from the dcat catalog index.
+    """
+    g = Graph().parse(index, format="turtle")
+    ranges = {}
+    for dataset in g.subjects(RDF.type, DCAT.Dataset):
+        key = g.value(dataset, DCTERMS.identifier)
+        for distribution in g.objects(dataset, DCAT.distribution):
+            match = _BYTE_RANGE.search(distribution)
+            if key is not None and match is not None:
+                first, last = int(match[1]), int(match[2])
+                ranges[str(key)] = (first, last - first + 1)
+    return ranges
+
+
+def read_resource(path: str | Path, offset: int, size: int, graph: Graph | None = None) -> Graph:
+    """
+    parse the member of one resource (offset and size from read_catalog_index) into graph.
+    """
+    with open(path, "rb") as f:
+        f.seek(offset)
+        member = f.read(size)
+    graph = graph if graph is not None else Graph()
+    return graph.parse(data=gzip.decompress(member).decode("utf-8"), format="nt")
+
+
+class CatalogWriter(object):
+    """
+    collects the gzip members of the resources of a run and writes the catalog file and its dcat index
+    (path with .catalog.ttl instead of .nt.gz unless index is given) on close. both are only replaced when
+    their content changes. resources not generated again in this run are taken over with keep.
+    """
+
+    def __init__(self, path: str | Path, index: str | Path | None = None, namespace: Namespace = FST,
+                 title: str | None = None) -> None:
+        self.path = Path(path)
+        self.index = Path(index) if index is not None else \
+            self.path.with_name(self.path.name.removesuffix(".gz").removesuffix(".nt") + CATALOG_SUFFIX)
+        self.namespace = namespace
+        self.title = title
+        self.members: Dict[str, bytes] = {}
+        self._previous: Dict[str, Tuple[int, int]] | None = None
+        self._previous_file: BinaryIO | None = None
+
+    def add(self, key: str, member: bytes) -> None:
+        # a resource added twice keeps the last member
+        self.members[key] = member
+
+    def add_graph(self, key: str, graph: Graph, base: [Namespace, URIRef, str, None] = None) -> None:
+        self.add(key, resource_member(graph, base))
+
+    def keep(self, key: str, directory: str | Path) -> None:
+        """
+        take over the resource unchanged: its member of the previous catalog, or its rdf.ttl in directory
+        if the previous catalog does not have it.
+        """
+        if self._previous is None:
+            self._previous = {}
+            if self.index.is_file() and self.path.is_file():
+                self._previous = read_catalog_index(self.index)
+                self._previous_file = open(self.path, "rb")
+        if key in self._previous:
+            offset, size = self._previous[key]
+            self._previous_file.seek(offset)
+            self.add(key, self._previous_file.read(size))
+            return
+        g = Graph().parse(Path(directory) / "rdf.ttl", format="turtle", publicID=self.namespace[f"{key}/"])
+        self.add_graph(key, g)
+
+    def close(self) -> dict:
+        """
+        write catalog file and index, returns their paths, the number of resources, bytes and whether
+        the catalog file was written.
+        """
+        if self._previous_file is not None:
+            self._previous_file.close()
+            self._previous_file = None
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        name = self.path.name
+        catalog = URIRef("#catalog")
+        g = Graph()
+        g.bind("dcat", DCAT)
+        g.bind("dcterms", DCTERMS)
+        g.bind("foaf", FOAF)
+        g.bind("fst", self.namespace)
+        g.add((catalog, RDF.type, DCAT.Catalog))
+        if self.title is not None:
+            g.add((catalog, DCTERMS.title, Literal(self.title)))
+        whole = URIRef(name)
+        g.add((catalog, DCAT.distribution, whole))
+
+        offset = 0
+        for key in sorted(self.members):
+            size = len(self.members[key])
+            dataset = URIRef(f"#{key}")
+            distribution = URIRef(f"{name}#bytes={offset}-{offset + size - 1}")
+            g.add((catalog, DCAT.dataset, dataset))
+            g.add((dataset, RDF.type, DCAT.Dataset))
+            g.add((dataset, DCTERMS.identifier, Literal(key)))
+            g.add((dataset, FOAF.primaryTopic, self.namespace[key]))
+            g.add((dataset, DCAT.distribution, distribution))
+            self._describe(g, distribution, whole, size)
+            offset += size
+        self._describe(g, whole, whole, offset)
+
+        data = b"".join(self.members[key] for key in sorted(self.members))
+        written = write_if_changed(self.path, data)
+        write_if_changed(self.index, g.serialize(format="longturtle", encoding="utf-8"))
+        return {"path": str(self.path), "index": str(self.index), "resources": len(self.members),
+                "bytes": len(data), "written": written}
+
+    @staticmethod
+    def _describe(g: Graph, distribution: URIRef, access: URIRef, size: int) -> None:
+        g.add((distribution, RDF.type, DCAT.Distribution))
+        g.add((distribution, DCAT.accessURL, access))
+        g.add((distribution, DCAT.byteSize, Literal(size, datatype=XSD.nonNegativeInteger)))
+        g.add((distribution, DCAT.mediaType, MEDIA_TYPES["application/n-triples"]))
+        g.add((distribution, DCAT.compressFormat, MEDIA_TYPES["application/gzip"]))
+
+    def __enter__(self) -> CatalogWriter:
+        return self
+
+    def __exit__(self, exc_type, *exc_info) -> None:
+        # an interrupted run would leave resources out of the catalog, the previous one stays then
+        if exc_type is None:
+            self.close()
+        elif self._previous_file is not None:
+            self._previous_file.close()
+            self._previous_file = None
@@ -1,11 +1,29 @@
 from __future__ import annotations
 
-from typing import List
-
-from rdflib import Graph, URIRef, Literal, Namespace
+import atexit
+import json
+import os
+import posixpath
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+import h5py
+import numpy as np
+from rdflib import BNode, Dataset, Graph, URIRef, Literal, Namespace
+from rdflib.exceptions import UniquenessError
 from rdflib.namespace import DCAT, DCMITYPE, DCTERMS, RDF, RDFS, SOSA, SSN, FOAF
+from rdflib.store import Store
 from uuid6 import uuid6
 
+import pyKRAKEN.stores  # noqa: F401, registers the store plugins
+from pyKRAKEN.stores import AppendOnlyStore, NTriplesLogStore, parse_log_lines, sorted_log_lines
+from pyKRAKEN.profiling import Profiler, instrument_subclass, instrumented
+from pyKRAKEN.terms import TermPool
+from pyKRAKEN.output import OutputWriter, write_if_changed
+
 H5PATH_RDF_METADATA = "/rdf-metadata"  # could be an input instead, necessary if multiple graphs allowed
 
 FST = Namespace("https://w3id.org/fst/resource/")
@@ -17,6 +35,138 @@ QUANTITYKIND = Namespace("https://qudt.org/vocab/quantitykind/")
 UNIT = Namespace("https://qudt.org/vocab/unit/")
 SSN_SYSTEM = Namespace("https://www.w3.org/ns/ssn/systems/")
 
+# format -> (file name, serialize arguments) of the files written for every resource
+SERIALIZATION_FORMATS = {"json-ld": ("rdf.json", {"auto_compact": True}),
+                         "longturtle": ("rdf.ttl", {"encoding": "utf-8"}),
+                         "xml": ("rdf.xml", {})}
+# formats that get the base passed to write_all, json-ld stays absolute
+_FORMATS_WITH_BASE = {"turtle", "longturtle", "xml", "pretty-xml", "n3", "trig"}
+
+# predicates Kraken keeps reverse lookups for, see Kraken._index_triple
+_INDEXED_PREDICATES = {RDF.type, DCTERMS.identifier, SDO.serialNumber, SOSA.observes, SSN.isPropertyOf}
+
+_serialization_pool = None
+_serialization_pool_workers = 0
+
+
+def _resource_of(subject, namespace: str) -> str | None:
+    # the first path segment after namespace, e.g. <uuid> for fst:<uuid>/SensorCapability
+    if isinstance(subject, URIRef) and subject.startswith(namespace):
+        return subject[len(namespace):].split("/", 1)[0]
+    return None
+
+
+def _get_serialization_pool(workers: int) -> ProcessPoolExecutor:
+    # one pool for the whole run, starting processes per resource would cost more than it saves.
+    # only started when workers > 1 is asked for, shut down at exit
+    global _serialization_pool, _serialization_pool_workers
+    if _serialization_pool is None or _serialization_pool_workers < workers:
+        if _serialization_pool is None:
+            atexit.register(_shutdown_serialization_pool)
+        else:
+            _serialization_pool.shutdown()
+        _serialization_pool = ProcessPoolExecutor(max_workers=workers)
+        _serialization_pool_workers = workers
+    return _serialization_pool
+
+
+def _shutdown_serialization_pool() -> None:
+    global _serialization_pool, _serialization_pool_workers
+    if _serialization_pool is not None:
+        _serialization_pool.shutdown()
+        _serialization_pool = None
+        _serialization_pool_workers = 0
+
+
+class _IndexedGraphMixin(object):
+    # the graph of a Kraken: triples added or removed directly, e.g. kraken.g.add(...), g.parse or g.remove,
+    # update the index of the Kraken as well once it is built. Kraken.add indexes itself and writes around
+    # these methods
+    _kraken = None
+
+    def add(self, triple):
+        if self._kraken is not None and self._kraken._index_ready:
+            self._kraken._index_triple(tuple(triple[:3]))
+        return super().add(triple)
+
+    def addN(self, quads):  # noqa: N802
+        if self._kraken is None or not self._kraken._index_ready:
+            return super().addN(quads)
+        kraken = self._kraken
+
+        def indexed():
+            for quad in quads:
+                kraken._index_triple(tuple(quad[:3]))
+                yield quad
+        return super().addN(indexed())
+
+    def remove(self, triple):
+        kraken = self._kraken
+        pattern = tuple(triple[:3])
+        if kraken is not None and kraken._index_ready:
+            if pattern == (None, None, None):
+                kraken._drop_index()
+            elif pattern[1] is None or pattern[1] in _INDEXED_PREDICATES:
+                for match in list(self.triples(pattern)):
+                    kraken._unindex_triple(match)
+        return super().remove(triple)
+
+
+class _IndexedGraph(_IndexedGraphMixin, Graph):
+    pass
+
+
+class _IndexedDataset(_IndexedGraphMixin, Dataset):
+    pass
+
+
+def _serialize(graph: Graph, format: str, kwargs: dict) -> bytes:
+    # the same bytes graph.serialize(destination=<path>) writes, which all files so far were written with.
+    # rdflib 6 drops base when serializing to a path, it is dropped here as well so unchanged graphs
+    # give unchanged files
+    kwargs = dict(kwargs)
+    encoding = kwargs.pop("encoding", "utf-8")
+    kwargs.pop("base", None)
+    if format in ("xml", "pretty-xml") and not isinstance(graph.store, AppendOnlyStore):
+        # rdf/xml follows the order of the store, which is the hash order of the terms in the Memory store.
+        # sorted once into an AppendOnly graph (insertion order) the same graph gives the same file
+        ordered = Graph(store="AppendOnly", namespace_manager=graph.namespace_manager)
+        ordered.addN((s, p, o, ordered) for s, p, o in sorted(graph.triples((None, None, None))))
+        graph = ordered
+    data = graph.serialize(format=format, encoding=encoding, **kwargs)
+    if format == "json-ld":
+        # rdflib orders the nodes by a set of the subjects, which differs from run to run.
+        # the arrays (except @list) are unordered in json-ld and get sorted, so the same graph gives the same file
+        data = json.dumps(_sorted_json(json.loads(data)), indent=2, separators=(",", ": "), sort_keys=True,
+                          ensure_ascii=False).encode(encoding, "replace")
+    return data
+
+
+def _sorted_json(value, ordered: bool = False):
+    if isinstance(value, dict):
+        return {key: _sorted_json(item, key == "@list") for key, item in value.items()}
+    if isinstance(value, list):
+        items = [_sorted_json(item) for item in value]
+        return items if ordered else sorted(items, key=lambda item: json.dumps(item, sort_keys=True))
+    return value
+
+
+def _serialize_snapshot(snapshot: list, namespaces: List[Tuple[str, str]], destination: str,
+                        format: str, kwargs: dict, store: str = "default") -> Tuple[float, int, bool]:
+    # runs in a worker process, rebuilds the graph from the pickled triples
+    # (not n-triples, the generators use relative iris like <docs/> which n-triples cannot hold).
+    # the serializers follow the order of the store (rdf/xml by subject), the same kind of store as the
+    # source graph gives the same files as serializing in the main process
+    start = time.perf_counter()
+    g = Graph(store=store)
+    for prefix, namespace in namespaces:
+        g.bind(prefix, namespace, override=True, replace=True)
+    g.addN((s, p, o, g) for s, p, o in snapshot)
+    data = _serialize(g, format, kwargs)
+    written = write_if_changed(destination, data)
+    return time.perf_counter() - start, len(data), written
+
+
 # wrapper for graph to automate configuration and possibly behavior
 class Kraken(object):
     """
@@ -25,11 +175,44 @@ class Kraken(object):
     """
     # iri strategy object / function as input
 
-    def __init__(self, filepath: str = None, base: [Namespace, URIRef] = None) -> None:
+    def __init__(self, filepath: str = None, base: [Namespace, URIRef] = None,
+                 store: str | Store = "default", configuration: str | None = None,
+                 profile: bool | Profiler = False, terms: bool | TermPool = False,
+                 dataset: bool = False, resource_namespace: Namespace = FST) -> None:
+        """
+        store is an rdflib store or plugin name, e.g. "SQLite" for the persistent SQLiteStore.
+        configuration is passed to the store on open, e.g. the path of the sqlite file.
+        profile=True collects construction and serialization metrics, see stats() and profiling(),
+        a Profiler instance can be passed instead to collect over many Krakens.
+        terms=True stores equal terms only once, a TermPool instance can be shared by many Krakens.
+        dataset=True keeps every resource under resource_namespace (everything under fst:<uuid>/) in its own
+        named graph fst:<uuid>/ of an rdflib Dataset, see resource(), replace_resource() and remove_resource().
+        all other triples go to the default graph, reads see the union of all graphs.
+        on a NTriplesLogStore the Kraken does not keep its entities and the typed index (lookup, instances),
+        so memory stays bounded by the working set of the store, only the reverse lookups of sosa:observes
+        and ssn:isPropertyOf are kept, they grow with the sensors and properties, not with the observations.
+        """
+        if profile is True:
+            profile = Profiler()
+        self.profiler: Profiler | None = profile if isinstance(profile, Profiler) else None
+        if terms is True:
+            terms = TermPool()
+        self.terms: TermPool | None = terms if isinstance(terms, TermPool) else None
+
         if filepath is None:
             filepath = ""
 
-        g = Graph(base=base)
+        if dataset:
+            try:
+                g = _IndexedDataset(store=store, default_union=True, default_graph_base=base)
+            except AssertionError:  # rdflib asserts a context aware store
+                g = None
+            if g is None or not g.store.context_aware:
+                raise ValueError("the dataset mode needs a context aware store, e.g. the default store")
+        else:
+            g = _IndexedGraph(store=store, base=base)
+        if configuration is not None:
+            g.open(configuration, create=True)
 
         # could separate binds via subclass of namespace manager, or wrapper?
         g.bind("fst", FST)
@@ -49,11 +232,775 @@ class Kraken(object):
         g.bind("ssn-system", SSN_SYSTEM)
         g.bind("foaf", FOAF)
 
-        self.g = g  # is this allowed? apparently
+        self._g = g
         self.filepath = filepath
+        # the index of an unbounded log would grow with every entity
+        self._indexed = not isinstance(g.store, NTriplesLogStore)
+
+        if configuration is not None:
+            g.commit()  # the binds
+
+        # dataset mode: resource -> named graph, blank node -> named graph of the subject referencing it
+        self.resource_namespace: str | None = str(resource_namespace) if dataset else None
+        self._resource_graphs: Dict[str, Graph] = {}
+        self._blank_graphs: Dict[BNode, Graph] = {}
+        # hdf5 file kept open by h5file()
+        self._h5file = None
+
+        # rdf:type -> {iri: entity}, the entity is the Thing created for the iri or None if only triples are known.
+        # the index is built from the graph on the first lookup and kept up to date from then on,
+        # Krakens that are only built and serialized never pay for it. read it through instances()
+        self.index: Dict[URIRef, Dict[URIRef, Thing | None]] = {}
+        self._things: Dict[URIRef, Thing] = {}
+        # identifier / serial number as string -> {iri: None}, dict instead of set to keep insertion order
+        self._identifiers: Dict[str, Dict[URIRef, None]] = {}
+        self._serial_numbers: Dict[str, Dict[URIRef, None]] = {}
+        # reverse lookups for observations: property -> {sensor observing it: None} / {feature it belongs to: None}
+        self._sensors_of: Dict[str, Dict[URIRef, None]] = {}
+        self._features_of: Dict[str, Dict[URIRef, None]] = {}
+        # the working set of the log store can not answer the reverse lookups later, they are kept from the start
+        self._index_ready = not self._indexed
+        g._kraken = self  # from now on direct writes to the graph are indexed as well
+        self._bind_add()
 
-        # something like: make new dict entry for each rdf:type, holding a new dict for entities of this type
-        self.index = []
+    @property
+    def g(self) -> Graph:
+        # g.add, g.addN, g.remove and g.parse keep the index up to date, triples written to a named graph
+        # of the dataset mode or to the store directly need reindex()
+        return self._g
+
+    def add(self, triple, origin: str = "Kraken") -> Kraken:
+        """
+        add a single triple, all entity constructors and property setters write through here.
+        origin is the class name the triple is counted for when profiling.
+        """
+        if self.profiler is not None:
+            self.profiler.count(origin)
+        if self.terms is not None:
+            triple = self.terms.intern_triple(triple)
+        if self._index_ready:
+            self._index_triple(triple)
+        Graph.add(self._context(triple), triple)  # indexed above already
+        return self
+
+    def _add_plain(self, triple, origin: str = "Kraken") -> Kraken:
+        # add() without profiler, term pool, dataset mode and index, see _bind_add
+        Graph.add(self._g, triple)
+        return self
+
+    def _bind_add(self) -> None:
+        # most Krakens use none of the features add() checks for, they get _add_plain until the index is built
+        if self.profiler is None and self.terms is None and self.resource_namespace is None \
+                and not self._index_ready:
+            self.add = self._add_plain
+        else:
+            self.__dict__.pop("add", None)
+
+    def _context(self, triple) -> Graph:
+        # the graph a triple goes to, in dataset mode the named graph of its resource
+        if self.resource_namespace is None:
+            return self._g
+        s, _, o = triple
+        if isinstance(s, BNode):
+            context = self._blank_graphs.get(s, self._g.default_context)
+        else:
+            key = _resource_of(s, self.resource_namespace)
+            context = self.resource(key) if key is not None else self._g.default_context
+        if isinstance(o, BNode):
+            self._blank_graphs.setdefault(o, context)
+        return context
+
+    # transactions, only persistent stores actually support them
+
+    def commit(self) -> Kraken:
+        """
+        make all changes durable in a transactional store.
+        """
+        self._g.commit()
+        return self
+
+    def rollback(self) -> Kraken:
+        """
+        drop all changes since the last commit in a transactional store, the index is rebuilt on the next lookup.
+        """
+        self._g.rollback()
+        self._drop_index()
+        return self
+
+    @contextmanager
+    def transaction(self) -> Iterator[Kraken]:
+        """
+        commit the changes made inside of the with block, or roll them back on error.
+        """
+        try:
+            yield self
+        except BaseException:
+            self.rollback()
+            raise
+        self.commit()
+
+    def close(self, commit_pending_transaction: bool = True) -> None:
+        """
+        close the store, by default pending changes are committed first.
+        """
+        self._g.close(commit_pending_transaction=commit_pending_transaction)
+
+    def reset(self) -> Kraken:
+        """
+        remove all triples and forget all entities, but keep the store with its prefixes and namespace manager,
+        so the Kraken can be reused for the next short-lived graph instead of creating a new one, see KrakenPool.
+        """
+        if self.resource_namespace is not None:
+            for context in self._resource_graphs.values():
+                self._g.remove_graph(context)
+            self._g.default_context.remove((None, None, None))
+            self._resource_graphs = {}
+            self._blank_graphs = {}
+        else:
+            self._g.remove((None, None, None))
+        self._things = {}
+        self._drop_index()
+        return self
+
+    def __iadd__(self, other: Kraken | Graph) -> Kraken:
+        """
+        add all triples of another Kraken or Graph, keeping the index up to date.
+        """
+        if isinstance(other, Kraken):
+            other = other.g
+        for triple in other.triples((None, None, None)):
+            self.add(triple)
+        return self
+
+    def parse(self, *args, **kwargs) -> Kraken:
+        """
+        parse into the graph like Graph.parse, the index is rebuilt on the next lookup.
+        """
+        self.g.parse(*args, **kwargs)
+        self._drop_index()
+        return self
+
+    # named graphs, only in dataset mode
+
+    def resource(self, key: str) -> Graph:
+        """
+        the named graph of a resource, e.g. kraken.resource(sensor_uuid), created empty if unknown.
+        """
+        if self.resource_namespace is None:
+            raise ValueError("the Kraken is not in dataset mode, create it with dataset=True")
+        context = self._resource_graphs.get(key)
+        if context is None:
+            context = self._resource_graphs[key] = self._g.graph(URIRef(f"{self.resource_namespace}{key}/"))
+        return context
+
+    def remove_resource(self, key: str) -> Kraken:
+        """
+        drop the named graph of a resource and its entries in the index, costs only the size of the resource.
+        """
+        context = self.resource(key)
+        for triple in context.triples((None, None, None)):
+            if self._index_ready:
+                self._unindex_triple(triple)
+            self._things.pop(triple[0], None)
+        self._blank_graphs = {node: graph for node, graph in self._blank_graphs.items() if graph is not context}
+        self._g.remove_graph(context)
+        del self._resource_graphs[key]
+        return self
+
+    def replace_resource(self, key: str, triples: Graph | Kraken) -> Kraken:
+        """
+        replace the named graph of a resource with the triples of another graph, e.g. a freshly
+        generated sensor. the triples are routed by their subjects like everything added, blank nodes
+        are added after the triples referencing them whatever the order of the other graph.
+        """
+        if isinstance(triples, Kraken):
+            triples = triples.g
+        self.remove_resource(key)
+        blank_triples = []
+        for triple in triples.triples((None, None, None)):
+            if isinstance(triple[0], BNode):
+                blank_triples.append(triple)
+            else:
+                self.add(triple)
+        # blank nodes nested in blank nodes need as many rounds as they are deep
+        while blank_triples:
+            routed = [triple for triple in blank_triples if triple[0] in self._blank_graphs]
+            remaining = [triple for triple in blank_triples if triple[0] not in self._blank_graphs]
+            if not routed:
+                routed, remaining = remaining, []  # unreferenced blank nodes end up in the default graph
+            for triple in routed:
+                self.add(triple)
+            blank_triples = remaining
+        return self
+
+    def write_nquads(self, destination: str | Path) -> dict:
+        """
+        dump the whole dataset with its named graphs into one n-quads file, e.g. for bulk loading into a
+        triplestore. returns path, seconds and bytes like write_all.
+        """
+        if self.resource_namespace is None:
+            raise ValueError("the Kraken is not in dataset mode, create it with dataset=True")
+        start = time.perf_counter()
+        destination = str(destination)
+        self.g.serialize(destination=destination, format="nquads")
+        report = {"path": destination, "seconds": time.perf_counter() - start, "bytes": os.path.getsize(destination)}
+        if self.profiler is not None:
+            self.profiler.serialized("nquads", destination, report["seconds"], report["bytes"])
+        return report
+
+    # tabular export
+
+    def to_frame(self, rdftype: URIRef, columns: List[str] | None = None):
+        """
+        pandas DataFrame with one row per entity of rdftype (index: iri) and one column per property,
+        e.g. "schema:name" or "schema:serialNumber". properties reached via ssn-system:hasSystemCapability
+        and ssn:hasProperty get prefixed columns named after their schema:name, e.g.
+        "sensor capabilities.measurement range.schema:minValue". multiple values end up as sorted list in one cell.
+        the columns are sorted by name, or exactly the given columns in their order (missing ones are empty),
+        so the same data always gives the same frame whatever the order of the triples in the store.
+        the graph is traversed once, instead of one scan per entity and getter.
+        """
+        import pandas as pd  # only needed for reporting
+
+        g = self.g
+        entities = list(self.instances(rdftype))
+        structural = {RDF.type, SSN.hasProperty, SSN.isPropertyOf, SSN_SYSTEM.hasSystemCapability}
+        links = (SSN_SYSTEM.hasSystemCapability, SSN.hasProperty)
+
+        # the one pass, everything else below are dictionary lookups
+        po_by_subject: Dict[URIRef, List[tuple]] = {}
+        for s, p, o in g.triples((None, None, None)):
+            po_by_subject.setdefault(s, []).append((p, o))
+
+        qnames = {}
+
+        def column(prefix: str, predicate: URIRef) -> str:
+            qname = qnames.get(predicate)
+            if qname is None:
+                qname = qnames[predicate] = g.namespace_manager.normalizeUri(predicate)
+            return prefix + qname
+
+        def collect(row: dict, subject, prefix: str, seen: set) -> None:
+            seen.add(subject)
+            for p, o in po_by_subject.get(subject, ()):
+                if p in links:
+                    if o in seen:
+                        continue
+                    label = next((str(name) for name_predicate, name in po_by_subject.get(o, ())
+                                  if name_predicate == SDO.name), str(o).rsplit("/", 1)[-1])
+                    collect(row, o, f"{prefix}{label}.", seen)
+                elif p not in structural:
+                    row.setdefault(column(prefix, p), []).append(o.toPython() if isinstance(o, Literal) else o)
+
+        rows = []
+        for entity in entities:
+            row = {}
+            collect(row, entity, "", set())
+            rows.append({key: values[0] if len(values) == 1 else sorted(values, key=str)
+                         for key, values in row.items()})
+
+        frame = pd.DataFrame(rows, index=pd.Index(entities, name="iri"))
+        return frame.reindex(columns=columns if columns is not None else sorted(frame.columns))
+
+    # serialization
+
+    def write_all(self, directory: str | Path, formats: List[str] | Tuple[str, ...] = tuple(SERIALIZATION_FORMATS),
+                  base: [Namespace, URIRef] = None, workers: int = 1,
+                  quiet: bool = False, writer: OutputWriter | None = None) -> Dict[str, dict]:
+        """
+        write the graph in every format into directory (rdf.json, rdf.ttl, rdf.xml by default).
+        by default the formats are serialized in this process, workers > 1 serializes them in parallel worker
+        processes of one pool shared by the whole run (from one snapshot of the triples), which only pays off
+        for large graphs. files whose content did not change are not touched.
+        with workers=1 and an OutputWriter the files are written by its threads, call writer.flush() before
+        reading them. returns path, seconds, bytes and whether the file was written (None if queued)
+        per format, which are also printed unless quiet.
+        """
+        start = time.perf_counter()
+        graph = self.g
+        if self.resource_namespace is not None:
+            # the named graphs would end up as quads in json-ld, the files hold the plain union
+            graph = Graph(store="AppendOnly", namespace_manager=graph.namespace_manager)
+            graph.addN((s, p, o, graph) for s, p, o in self._g.triples((None, None, None)))
+        report = self._write_graphs({None: (graph, Path(directory))}, formats, base, workers, writer)[None]
+        if not quiet:
+            print(f"wrote {len(report)} files to {directory} in {time.perf_counter() - start:.3f} s")
+            for format, entry in report.items():
+                print(f"    {Path(entry['path']).name} ({format}): {entry['seconds']:.3f} s, {entry['bytes']} bytes"
+                      + (", unchanged" if entry["written"] is False else ""))
+        return report
+
+    def shard_by_resource(self, namespace: Namespace = FST) -> Dict[str | None, Graph]:
+        """
+        split the graph into one graph per resource in a single pass over the triples.
+        the resource of a subject is the first path segment after namespace, e.g. everything under
+        fst:<uuid>/ belongs to <uuid>. blank nodes go with the subject referencing them,
+        all other subjects end up under None. the shards share the prefixes of this graph.
+        in dataset mode the named graphs are returned as they are.
+        """
+        g = self.g
+        namespace = str(namespace)
+        if namespace == self.resource_namespace:
+            shards = dict(self._resource_graphs)
+            if len(g.default_context):
+                shards[None] = g.default_context
+            return shards
+
+        keys: Dict[URIRef, str | None] = {}  # subject -> resource, computed once per subject
+        shards: Dict[str | None, Graph] = {}
+        blank_triples = []
+        blank_owners = {}
+
+        def shard(key):
+            graph = shards.get(key)
+            if graph is None:
+                graph = shards[key] = Graph(store="AppendOnly", namespace_manager=g.namespace_manager)
+            return graph
+
+        for s, p, o in g.triples((None, None, None)):
+            if isinstance(s, BNode):
+                blank_triples.append((s, p, o))
+                continue
+            key = keys.get(s, False)
+            if key is False:
+                key = keys[s] = _resource_of(s, namespace)
+            shard(key).add((s, p, o))
+            if isinstance(o, BNode):
+                blank_owners[o] = key
+
+        # blank nodes nested in blank nodes need as many rounds as they are deep
+        while blank_triples:
+            remaining = []
+            for s, p, o in blank_triples:
+                if s in blank_owners:
+                    shard(blank_owners[s]).add((s, p, o))
+                    if isinstance(o, BNode):
+                        blank_owners.setdefault(o, blank_owners[s])
+                else:
+                    remaining.append((s, p, o))
+            if len(remaining) == len(blank_triples):
+                for triple in remaining:  # unreferenced blank nodes
+                    shard(None).add(triple)
+                break
+            blank_triples = remaining
+
+        return shards
+
+    def write_shards(self, directory: str | Path, namespace: Namespace = FST,
+                     formats: List[str] | Tuple[str, ...] = tuple(SERIALIZATION_FORMATS),
+                     base: [Namespace, URIRef] = None, workers: int = 1,
+                     quiet: bool = False, writer: OutputWriter | None = None) -> Dict[str, Dict[str, dict]]:
+        """
+        shard_by_resource and write every resource into its own directory/<resource>/ like write_all,
+        with workers > 1 all files of all resources share the worker processes. triples of subjects outside of namespace
+        are not written. returns the report of write_all per resource.
+        """
+        start = time.perf_counter()
+        directory = Path(directory)
+        shards = self.shard_by_resource(namespace)
+        shards.pop(None, None)
+        reports = self._write_graphs({key: (graph, directory / key) for key, graph in shards.items()},
+                                     formats, base, workers, writer)
+        if not quiet:
+            files = sum(len(report) for report in reports.values())
+            unchanged = sum(entry["written"] is False for report in reports.values() for entry in report.values())
+            print(f"wrote {files} files for {len(reports)} resources to {directory} "
+                  f"in {time.perf_counter() - start:.3f} s" + (f", {unchanged} unchanged" if unchanged else ""))
+        return reports
+
+    def write_log(self, destination: str | Path, format: str = "longturtle", base: [Namespace, URIRef] = None,
+                  chunk_lines: int = 1000000) -> dict:
+        """
+        write the complete graph of a Kraken on a NTriplesLogStore into one file, the log is sorted externally
+        and every subject is serialized on its own, so memory stays bounded by chunk_lines and the largest subject.
+        formats are nt, turtle, longturtle and json-ld. returns path, seconds and bytes like write_all.
+        """
+        store = self._g.store
+        if not isinstance(store, NTriplesLogStore):
+            raise ValueError("write_log needs a Kraken on a NTriplesLogStore")
+        if format not in ("nt", "ntriples", "turtle", "longturtle", "json-ld"):
+            raise ValueError(f"format {format} can not be written subject by subject")
+        self.commit()  # everything pending ends up in the log file
+
+        start = time.perf_counter()
+        namespaces = list(self._g.namespaces())
+        destination = str(destination)
+        lines = sorted_log_lines(store.path, chunk_lines=chunk_lines)
+
+        def subjects() -> Iterator[Graph]:
+            # consecutive lines with the same subject token form one graph
+            group = []
+            subject = None
+            for line in lines:
+                token = line[:line.index(" ")]
+                if token != subject and group:
+                    yield parse_log_lines(group, Graph(store="AppendOnly", namespace_manager=self._g.namespace_manager))
+                    group = []
+                subject = token
+                group.append(line)
+            if group:
+                yield parse_log_lines(group, Graph(store="AppendOnly", namespace_manager=self._g.namespace_manager))
+
+        def check_blank_nodes(graph: Graph) -> Graph:
+            # every subject is serialized on its own, a blank node would lose its identity
+            if any(isinstance(term, BNode) for triple in graph for term in triple):
+                raise ValueError("write_log does not support blank nodes, use iris")
+            return graph
+
+        with open(destination, "w", encoding="utf-8") as f:
+            if format in ("nt", "ntriples"):
+                f.writelines(lines)
+            elif format == "json-ld":
+                context = {prefix: str(namespace) for prefix, namespace in namespaces}
+                f.write('{\n"@context": ' + json.dumps(context, indent=2) + ',\n"@graph": [\n')
+                first = True
+                for graph in subjects():
+                    node = json.loads(check_blank_nodes(graph).serialize(format="json-ld", context=context))
+                    node.pop("@context", None)
+                    for element in node.pop("@graph", [node]):
+                        f.write(("" if first else ",\n") + json.dumps(element, indent=2))
+                        first = False
+                f.write("\n]\n}\n")
+            else:
+                if format == "longturtle":
+                    header = ([f"BASE <{base}>"] if base is not None else []) + \
+                             [f"PREFIX {prefix}: <{namespace}>" for prefix, namespace in namespaces]
+                else:
+                    header = ([f"@base <{base}> ."] if base is not None else []) + \
+                             [f"@prefix {prefix}: <{namespace}> ." for prefix, namespace in namespaces]
+                f.write("\n".join(header) + "\n")
+                for graph in subjects():
+                    body = check_blank_nodes(graph).serialize(format=format, base=base)
+                    f.writelines(line + "\n" for line in body.splitlines()
+                                 if not line.startswith(("@prefix", "@base", "PREFIX", "BASE")))
+
+        report = {"path": destination, "seconds": time.perf_counter() - start, "bytes": os.path.getsize(destination)}
+        if self.profiler is not None:
+            self.profiler.serialized(format, destination, report["seconds"], report["bytes"])
+        return report
+
+    def _write_graphs(self, graphs: Dict, formats: List[str] | Tuple[str, ...], base: [Namespace, URIRef],
+                      workers: int, writer: OutputWriter | None = None) -> Dict:
+        # graphs: key -> (graph, directory), returns key -> {format: {path, seconds, bytes, written}}
+        # worker processes write their files themselves, the writer is used when serializing in this process
+        jobs = {}
+        for key, (graph, directory) in graphs.items():
+            directory.mkdir(parents=True, exist_ok=True)
+            for format in formats:
+                filename, kwargs = SERIALIZATION_FORMATS.get(format, (f"rdf.{format}", {}))
+                kwargs = dict(kwargs)
+                if base is not None and format in _FORMATS_WITH_BASE:
+                    kwargs["base"] = base
+                jobs[key, format] = (graph, str(directory / filename), kwargs)
+
+        reports = {key: {} for key in graphs}
+        if workers <= 1:
+            for (key, format), (graph, destination, kwargs) in jobs.items():
+                format_start = time.perf_counter()
+                data = _serialize(graph, format, kwargs)
+                if writer is not None:
+                    writer.write(destination, data)
+                    written = None
+                else:
+                    written = write_if_changed(destination, data)
+                reports[key][format] = {"path": destination,
+                                        "seconds": time.perf_counter() - format_start,
+                                        "bytes": len(data), "written": written}
+        else:
+            snapshots = {key: list(graph.triples((None, None, None))) for key, (graph, _) in graphs.items()}
+            namespaces = [(prefix, str(namespace)) for prefix, namespace in self.g.namespaces()]
+            pool = _get_serialization_pool(workers)
+            stores = {key: "AppendOnly" if isinstance(graph.store, AppendOnlyStore) else "default"
+                      for key, (graph, _) in graphs.items()}
+            futures = {(key, format): pool.submit(_serialize_snapshot, snapshots[key], namespaces,
+                                                  destination, format, kwargs, stores[key])
+                       for (key, format), (_, destination, kwargs) in jobs.items()}
+            for (key, format), future in futures.items():
+                seconds, size, written = future.result()
+                reports[key][format] = {"path": jobs[key, format][1], "seconds": seconds, "bytes": size,
+                                        "written": written}
+
+        if self.profiler is not None:
+            for report in reports.values():
+                for format, entry in report.items():
+                    self.profiler.serialized(format, entry["path"], entry["seconds"], entry["bytes"])
+        return reports
+
+    # hdf5
+
+    @contextmanager
+    def h5file(self, mode: str = "a") -> Iterator[h5py.File]:
+        """
+        the hdf5 file at filepath, opened once and shared by everything inside the with block.
+        """
+        if self._h5file is not None:
+            yield self._h5file
+            return
+        if not self.filepath:
+            raise ValueError("the Kraken has no filepath to an hdf5 file")
+
+        with h5py.File(self.filepath, mode) as f:
+            self._h5file = f
+            try:
+                yield f
+            finally:
+                self._h5file = None
+
+    def save_h5(self, filepath: str | None = None, format: str = "turtle",
+                compression: str = "gzip", compression_opts: int | None = 9) -> Kraken:
+        """
+        store the serialized graph as compressed bytes at H5PATH_RDF_METADATA inside of the hdf5 file,
+        next to the measurement data. the file is created if it does not exist, all other objects stay untouched.
+        """
+        if filepath is None:
+            filepath = self.filepath
+        if not filepath:
+            raise ValueError("input argument \"filepath\" is missing and the Kraken has no filepath")
+
+        start = time.perf_counter()
+        serialized = np.frombuffer(self.g.serialize(format=format, encoding="utf-8"), dtype=np.uint8)
+
+        if filepath != self.filepath:
+            if self._h5file is not None:
+                raise ValueError("cannot save to another file while the hdf5 file of the Kraken is open")
+            self.filepath = filepath
+
+        with self.h5file() as f:
+            dset = f.get(H5PATH_RDF_METADATA)
+            if dset is not None and dset.maxshape == (None,) and dset.compression == compression:
+                # resize in place, deleting would leave the old bytes as dead space in the file
+                dset.resize(serialized.shape)
+                dset[...] = serialized
+            else:
+                if dset is not None:
+                    del f[H5PATH_RDF_METADATA]
+                dset = f.create_dataset(H5PATH_RDF_METADATA, data=serialized, maxshape=(None,), chunks=True,
+                                        compression=compression, compression_opts=compression_opts)
+            dset.attrs["format"] = format
+            dset.attrs["encoding"] = "utf-8"
+
+        if self.profiler is not None:
+            self.profiler.serialized(f"hdf5:{format}", f"{filepath}/{H5PATH_RDF_METADATA}",
+                                     time.perf_counter() - start, serialized.nbytes)
+        return self
+
+    @classmethod
+    def open_h5(cls, filepath: str, base: [Namespace, URIRef] = None) -> Kraken:
+        """
+        load the graph stored by save_h5, only the metadata dataset is read from the file.
+        """
+        with h5py.File(filepath, "r") as f:
+            dset = f.get(H5PATH_RDF_METADATA)
+            if dset is None:
+                raise LookupError(f"file {filepath} contains no rdf metadata at {H5PATH_RDF_METADATA}")
+            serialized = dset[()].tobytes()
+            format = dset.attrs.get("format", "turtle")
+            encoding = dset.attrs.get("encoding", "utf-8")
+
+        kraken = cls(filepath=filepath, base=base)
+        return kraken.parse(data=serialized.decode(encoding), format=format)
+
+    def results(self) -> List[Result]:
+        """
+        Result objects for all sosa:Result in the graph, e.g. after open_h5, with lazy access to their data.
+        """
+        results = []
+        for iri, entity in self.instances(SOSA.Result).items():
+            if entity is None:
+                entity = Result.from_graph(self, iri)
+            results.append(entity)
+        return results
+
+    # profiling
+
+    @contextmanager
+    def profiling(self) -> Iterator[None]:
+        """
+        time constructors and property setters of the entity classes inside the with block.
+        the classes are patched process wide until the block is left, see profiling.instrumented,
+        so the block is not re-entrant.
+        """
+        if self.profiler is None:
+            raise ValueError("profiling is not enabled, create the Kraken with profile=True")
+        with instrumented(Thing):
+            yield
+
+    def stats(self) -> dict:
+        """
+        triples added per class, time per constructor / property setter and time and bytes per serialization,
+        only available for Krakens created with profile.
+        """
+        if self.profiler is None:
+            raise ValueError("profiling is not enabled, create the Kraken with profile=True")
+        return self.profiler.stats()
+
+    def dump_stats(self, path: str | Path) -> None:
+        """
+        write stats() as json file.
+        """
+        if self.profiler is None:
+            raise ValueError("profiling is not enabled, create the Kraken with profile=True")
+        self.profiler.dump(path)
+
+    # index
+
+    def _index_triple(self, triple) -> None:
+        s, p, o = triple
+        if p == SOSA.observes:
+            self._sensors_of.setdefault(str(o), {})[s] = None
+        elif p == SSN.isPropertyOf:
+            self._features_of.setdefault(str(s), {})[o] = None
+        elif not self._indexed:
+            return
+        elif p == RDF.type:
+            self.index.setdefault(o, {}).setdefault(s, self._things.get(s))
+        elif p == DCTERMS.identifier:
+            self._identifiers.setdefault(str(o), {})[s] = None
+        elif p == SDO.serialNumber:
+            self._serial_numbers.setdefault(str(o), {})[s] = None
+
+    def _unindex_triple(self, triple) -> None:
+        s, p, o = triple
+        if p == RDF.type:
+            self.index.get(o, {}).pop(s, None)
+        elif p == DCTERMS.identifier:
+            self._identifiers.get(str(o), {}).pop(s, None)
+        elif p == SDO.serialNumber:
+            self._serial_numbers.get(str(o), {}).pop(s, None)
+        elif p == SOSA.observes:
+            self._sensors_of.get(str(o), {}).pop(s, None)
+        elif p == SSN.isPropertyOf:
+            self._features_of.get(str(s), {}).pop(o, None)
+
+    def _clear_index(self) -> None:
+        # in place, _find is handed the lookups before it builds the index
+        for lookup in (self.index, self._identifiers, self._serial_numbers, self._sensors_of, self._features_of):
+            lookup.clear()
+
+    def _drop_index(self) -> None:
+        # the next lookup builds the index from the graph again
+        self._clear_index()
+        self._index_ready = not self._indexed
+        self._bind_add()
+
+    def _build_index(self) -> None:
+        if not self._index_ready:
+            self.reindex()
+
+    def reindex(self) -> Kraken:
+        """
+        rebuild the index from the graph, needed after triples were written around the Kraken and its graph,
+        e.g. into a named graph of the dataset mode or into the store directly. entities created before stay registered.
+        """
+        g = self.g
+        self._clear_index()
+        for predicate in _INDEXED_PREDICATES:
+            for triple in g.triples((None, predicate, None)):
+                self._index_triple(triple)
+        self._index_ready = True
+        self._bind_add()
+        return self
+
+    def register(self, thing: Thing) -> None:
+        """
+        make an entity known to the index, called by Thing.__init__.
+        """
+        if not self._indexed:
+            return
+        self._things[thing.iri] = thing
+        for entities in self.index.values():
+            if thing.iri in entities:
+                entities[thing.iri] = thing
+
+    def lookup(self, iri: URIRef) -> Thing | None:
+        """
+        the entity created for the iri, None if there is none.
+        """
+        self._check_indexed()
+        return self._things.get(iri)
+
+    def instances(self, rdftype: URIRef) -> Dict[URIRef, Thing | None]:
+        """
+        all iris with the given rdf:type mapped to their entities (None for iris without entity).
+        """
+        self._check_indexed()
+        self._build_index()
+        return self.index.get(rdftype, {})
+
+    def _check_indexed(self) -> None:
+        if not self._indexed:
+            raise ValueError("a Kraken on a NTriplesLogStore keeps no entities and no typed index")
+
+    def find_by_identifier(self, identifier: URIRef | str, any: bool = True) -> URIRef | None:
+        """
+        iri of the resource with the given dcterms:identifier, like Graph.value any=False raises a
+        UniquenessError if more than one resource matches. the graph is queried if the index has no entry.
+        """
+        term = identifier if isinstance(identifier, URIRef) else Literal(identifier)
+        return self._find(self._identifiers, identifier, any, (None, DCTERMS.identifier, term))
+
+    def find_by_serial_number(self, serial_number: str, any: bool = True) -> URIRef | None:
+        """
+        iri of the resource with the given schema:serialNumber, like Graph.value any=False raises a
+        UniquenessError if more than one resource matches. the graph is queried if the index has no entry.
+        """
+        return self._find(self._serial_numbers, serial_number, any, (None, SDO.serialNumber, Literal(serial_number)))
+
+    def sensor_of(self, prop: URIRef, any: bool = True) -> URIRef | None:
+        """
+        iri of the sensor that sosa:observes the property, same semantics as find_by_identifier.
+        """
+        return self._find(self._sensors_of, prop, any, (None, SOSA.observes, prop))
+
+    def feature_of(self, prop: URIRef, any: bool = True) -> URIRef | None:
+        """
+        iri of the feature of interest the property ssn:isPropertyOf, same semantics as find_by_identifier.
+        """
+        return self._find(self._features_of, prop, any, (prop, SSN.isPropertyOf, None))
+
+    def _find(self, lookup: Dict[str, Dict[URIRef, None]], key, any: bool, pattern: tuple) -> URIRef | None:
+        self._build_index()
+        iris = lookup.get(str(key))
+        if not iris:
+            # written around the index, e.g. into a named graph or into the store directly
+            s, p, o = pattern
+            return self.g.value(s, p, o, any=any)
+        if not any and len(iris) > 1:
+            raise UniquenessError(list(iris))
+        return next(iter(iris))
+
+
+class KrakenPool(object):
+    """
+    reuses Krakens for many short-lived graphs, acquire() hands out a reset Kraken that already has
+    its store and prefixes, release() gives it back. at most size Krakens are kept.
+    all Krakens are created with the keyword arguments given to the pool.
+
+    with pool.kraken() as tmp:
+        PhysicalObject(tmp, ...)
+    """
+
+    def __init__(self, size: int = 8, **kwargs) -> None:
+        self.size = size
+        self.kwargs = kwargs
+        self._free: List[Kraken] = []
+
+    def acquire(self) -> Kraken:
+        if self._free:
+            return self._free.pop()
+        return Kraken(**self.kwargs)
+
+    def release(self, kraken: Kraken) -> None:
+        if len(self._free) < self.size:
+            self._free.append(kraken.reset())
+
+    @contextmanager
+    def kraken(self) -> Iterator[Kraken]:
+        kraken = self.acquire()
+        try:
+            yield kraken
+        finally:
+            self.release(kraken)
 
 
 class Thing(object):
@@ -77,8 +1024,9 @@ class Thing(object):
         # always add and remove duplicates?
         # always overwrite?
         # can we do methods with flag on setter?
-        self.g = kraken.g
+        self.kraken = kraken
         self.iri = iri
+        kraken.register(self)
         self.identifier = identifier  # maybe needs to be renamed because of collision with rdflib resource
         self.name = name
         self.comment = comment
@@ -92,6 +1040,17 @@ class Thing(object):
         self.isHostedBy = isHostedBy
         self.keywords_list = keywords_list
 
+    @property
+    def g(self) -> Graph:
+        return self.kraken._g
+
+    def _add(self, triple) -> None:
+        self.kraken.add(triple, self.__class__.__name__)
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        instrument_subclass(cls)
+
     @property
     def iri(self):
         return self._iri
@@ -120,7 +1079,7 @@ class Thing(object):
         if not isinstance(identifier, URIRef):
             identifier = Literal(identifier)
 
-        self.g.add((self.iri, DCTERMS.identifier, identifier))
+        self._add((self.iri, DCTERMS.identifier, identifier))
 
     @property
     def name(self):
@@ -133,7 +1092,7 @@ class Thing(object):
         if name is None:
             name = self.__class__.__name__ + "-" + str(self.identifier[0])
 
-        self.g.add((self.iri, SDO.name, Literal(name)))
+        self._add((self.iri, SDO.name, Literal(name)))
 
     @property
     def comment(self):
@@ -144,7 +1103,7 @@ class Thing(object):
     def comment(self, comment: str | None):
         if comment is None:
             return
-        self.g.add((self.iri, RDFS.comment, Literal(comment)))
+        self._add((self.iri, RDFS.comment, Literal(comment)))
 
     @property
     def description(self):
@@ -155,7 +1114,7 @@ class Thing(object):
     def description(self, description: str | None):
         if description is None:
             return
-        self.g.add((self.iri, SDO.description, Literal(description)))
+        self._add((self.iri, SDO.description, Literal(description)))
 
     @property
     def seeAlso(self):
@@ -169,9 +1128,9 @@ class Thing(object):
 
         for item in seeAlso:
             if isinstance(item, URIRef):
-                self.g.add((self.iri, RDFS.seeAlso, item))
+                self._add((self.iri, RDFS.seeAlso, item))
             elif isinstance(item, str):
-                self.g.add((self.iri, RDFS.seeAlso, Literal(item)))
+                self._add((self.iri, RDFS.seeAlso, Literal(item)))
             else:
                 # TODO:
                 raise ValueError
@@ -188,9 +1147,9 @@ class Thing(object):
 
         for item in conformsTo:
             if isinstance(item, URIRef):
-                self.g.add((self.iri, DCTERMS.conformsTo, item))
+                self._add((self.iri, DCTERMS.conformsTo, item))
             elif isinstance(item, str):
-                self.g.add((self.iri, DCTERMS.conformsTo, Literal(item)))
+                self._add((self.iri, DCTERMS.conformsTo, Literal(item)))
             else:
                 # TODO:
                 raise ValueError
@@ -207,7 +1166,7 @@ class Thing(object):
         if not isinstance(subjectOf, URIRef):
             raise ValueError("input argument \"subjectOf\" must be a valid IRI")
 
-        self.g.add((self.iri, SDO.subjectOf, subjectOf))
+        self._add((self.iri, SDO.subjectOf, subjectOf))
 
     @property
     def image(self):
@@ -221,7 +1180,7 @@ class Thing(object):
         if not isinstance(image, URIRef):
             raise ValueError("input argument \"image\" must be a valid IRI")
 
-        self.g.add((self.iri, SDO.image, image))
+        self._add((self.iri, SDO.image, image))
 
     @property
     def documentation(self):
@@ -235,7 +1194,7 @@ class Thing(object):
         if not isinstance(documentation, URIRef):
             raise ValueError("input argument \"documentation\" must be a valid IRI")
 
-        self.g.add((self.iri, SDO.documentation, documentation))
+        self._add((self.iri, SDO.documentation, documentation))
 
     @property
     def rdftype(self):
@@ -249,7 +1208,7 @@ class Thing(object):
         if not isinstance(rdftype, URIRef):
             raise ValueError("input argument \"rdftype\" must be a valid IRI")
 
-        self.g.add((self.iri, RDF.type, rdftype))
+        self._add((self.iri, RDF.type, rdftype))
 
     @property
     def isHostedBy(self):
@@ -263,9 +1222,9 @@ class Thing(object):
         if not isinstance(iri, URIRef):
             raise ValueError("value of \"isHostedBy\" must be a valid IRI")
 
-        self.g.add((self.iri, SOSA.isHostedBy, iri))
-        self.g.add((iri, SOSA.hosts, self.iri))
-        self.g.add((iri, RDF.type, SOSA.Platform))
+        self._add((self.iri, SOSA.isHostedBy, iri))
+        self._add((iri, SOSA.hosts, self.iri))
+        self._add((iri, RDF.type, SOSA.Platform))
 
     @property
     def keywords_list(self):
@@ -280,7 +1239,7 @@ class Thing(object):
             # TODO: Could keywords also be URIRefs? technical that should be possible but is there a relevant use case?
             #  -> terms with efficient multi language lookup and broad search (broader topic search through different keywords connected to the selected one(s))
 
-            self.g.add((self.iri, SDO.keywords, Literal(keyword.strip())))
+            self._add((self.iri, SDO.keywords, Literal(keyword.strip())))
 
 
 class PhysicalObject(Thing):
@@ -304,11 +1263,11 @@ class PhysicalObject(Thing):
         self.manufacturer = manufacturer  # alternatively use schema:provider
         self.serialNumber = serialNumber
 
-        self.g.add((self.iri, RDF.type, DCMITYPE.PhysicalObject))
+        self._add((self.iri, RDF.type, DCMITYPE.PhysicalObject))
 
-        self.g.add((self.iri, DBO.owner, Literal(self.owner)))
-        self.g.add((self.iri, SDO.manufacturer, Literal(self.manufacturer)))
-        self.g.add((self.iri, SDO.serialNumber, Literal(self.serialNumber)))
+        self._add((self.iri, DBO.owner, Literal(self.owner)))
+        self._add((self.iri, SDO.manufacturer, Literal(self.manufacturer)))
+        self._add((self.iri, SDO.serialNumber, Literal(self.serialNumber)))
 
 
 class Sensor(PhysicalObject):  # Sensor(System), System(Thing) in the future
@@ -333,7 +1292,7 @@ class Sensor(PhysicalObject):  # Sensor(System), System(Thing) in the future
         self.hasSensorCapability = hasSensorCapability
         self.location = location
         # observes
-        self.g.add((self.iri, SDO.location, Literal(self.location)))
+        self._add((self.iri, SDO.location, Literal(self.location)))
 
     @property
     def hasSensorCapability(self):
@@ -350,15 +1309,15 @@ class Sensor(PhysicalObject):  # Sensor(System), System(Thing) in the future
         if not isinstance(hasSensorCapability, URIRef):  # assume its string
             hasSensorCapability = URIRef("/".join([self.iri, hasSensorCapability.strip("/")]))
 
-        self.g.add((self.iri, RDF.type, SOSA.Sensor))
-        self.g.add((self.iri, SSN_SYSTEM.hasSystemCapability, hasSensorCapability))
+        self._add((self.iri, RDF.type, SOSA.Sensor))
+        self._add((self.iri, SSN_SYSTEM.hasSystemCapability, hasSensorCapability))
 
     def observes(self, prop: URIRef) -> Sensor:
-        self.g.add((self.iri, SOSA.observes, prop))
+        self._add((self.iri, SOSA.observes, prop))
 
-        self.g.add((prop, RDF.type, SOSA.ObservableProperty))
-        feature = self.g.value(subject=prop, predicate=SSN.isPropertyOf)
-        self.g.add((feature, RDF.type, SOSA.FeatureOfInterest))
+        self._add((prop, RDF.type, SOSA.ObservableProperty))
+        feature = self.kraken.feature_of(prop)
+        self._add((feature, RDF.type, SOSA.FeatureOfInterest))
         return self
 
 
@@ -377,8 +1336,8 @@ class SensorCapability(Thing):
 
         self.hasSystemProperty = hasSystemProperty
 
-        self.g.add((self.iri, RDF.type, SSN.Property))
-        self.g.add((self.iri, RDF.type, SSN_SYSTEM.SystemCapability))
+        self._add((self.iri, RDF.type, SSN.Property))
+        self._add((self.iri, RDF.type, SSN_SYSTEM.SystemCapability))
 
     @property
     def hasSystemProperty(self):
@@ -392,7 +1351,7 @@ class SensorCapability(Thing):
         if not isinstance(hasSystemProperty, URIRef):  # assume its string
             hasSystemProperty = Literal("/".join([self.iri, hasSystemProperty.strip("/")]))
 
-        self.g.add((self.iri, SSN_SYSTEM.hasSystemProperty, hasSystemProperty))
+        self._add((self.iri, SSN_SYSTEM.hasSystemProperty, hasSystemProperty))
 
 
 class Property(Thing):
@@ -432,7 +1391,7 @@ class Property(Thing):
         # location
         # propertyID
 
-        self.g.add((self.iri, RDF.type, SSN.Property))
+        self._add((self.iri, RDF.type, SSN.Property))
 
     @property
     def isPropertyOf(self):
@@ -444,8 +1403,8 @@ class Property(Thing):
         if isPropertyOf is None:
             raise ValueError("input argument \"isPropertyOf\" is missing")
 
-        self.g.add((self.iri, SSN.isPropertyOf, isPropertyOf))
-        self.g.add((isPropertyOf, SSN.hasProperty, self.iri))
+        self._add((self.iri, SSN.isPropertyOf, isPropertyOf))
+        self._add((isPropertyOf, SSN.hasProperty, self.iri))
 
     @property
     def value(self):
@@ -456,7 +1415,7 @@ class Property(Thing):
         if value is None:
             return
 
-        self.g.add((self.iri, SDO.value, Literal(value)))
+        self._add((self.iri, SDO.value, Literal(value)))
 
     @property
     def minValue(self):
@@ -467,7 +1426,7 @@ class Property(Thing):
         if minValue is None:
             return
 
-        self.g.add((self.iri, SDO.minValue, Literal(minValue)))
+        self._add((self.iri, SDO.minValue, Literal(minValue)))
 
     @property
     def maxValue(self):
@@ -478,7 +1437,7 @@ class Property(Thing):
         if maxValue is None:
             return
 
-        self.g.add((self.iri, SDO.maxValue, Literal(maxValue)))
+        self._add((self.iri, SDO.maxValue, Literal(maxValue)))
 
     @property
     def unit(self):
@@ -489,9 +1448,9 @@ class Property(Thing):
         if unit is None:
             return
         elif isinstance(unit, URIRef):
-            self.g.add((self.iri, QUDT.unit, unit))
+            self._add((self.iri, QUDT.unit, unit))
         elif isinstance(unit, str):
-            self.g.add((self.iri, QUDT.unit, Literal(unit)))
+            self._add((self.iri, QUDT.unit, Literal(unit)))
         else:
             # TODO:
             raise ValueError
@@ -532,7 +1491,7 @@ class Quantity(Property):
         self.unit = unit
         self.symbol = symbol
 
-        self.g.add((self.iri, RDF.type, QUDT.Quantity))
+        self._add((self.iri, RDF.type, QUDT.Quantity))
 
     @property
     def hasQuantityKind(self):
@@ -543,7 +1502,7 @@ class Quantity(Property):
         if hasQuantityKind is None:
             raise ValueError("input argument \"hasQuantityKind\" is missing")
 
-        self.g.add((self.iri, QUDT.hasQuantityKind, hasQuantityKind))
+        self._add((self.iri, QUDT.hasQuantityKind, hasQuantityKind))
 
     @property
     def unit(self):
@@ -554,9 +1513,9 @@ class Quantity(Property):
         if unit is None:
             return
         elif isinstance(unit, URIRef):
-            self.g.add((self.iri, QUDT.unit, unit))
+            self._add((self.iri, QUDT.unit, unit))
         elif isinstance(unit, str):
-            self.g.add((self.iri, QUDT.unit, Literal(unit)))
+            self._add((self.iri, QUDT.unit, Literal(unit)))
         else:
             # TODO:
             raise ValueError
@@ -570,7 +1529,7 @@ class Quantity(Property):
         if symbol is None:
             return
 
-        self.g.add((self.iri, QUDT.symbol, Literal(symbol)))
+        self._add((self.iri, QUDT.symbol, Literal(symbol)))
 
 
 class Observation(Thing):
@@ -595,22 +1554,20 @@ class Observation(Thing):
         self.observedProperty = observedProperty
         self.hasResult = hasResult
 
-        self.g.add((self.iri, RDF.type, SOSA.Observation))
-        self.g.add((self.iri, SOSA.observedProperty, self.observedProperty))
+        self._add((self.iri, RDF.type, SOSA.Observation))
+        self._add((self.iri, SOSA.observedProperty, self.observedProperty))
 
-        self.madeBySensor = self.g.value(
-            predicate=SOSA.observes, object=self.observedProperty, any=False)
-        self.hasFeatureOfInterest = self.g.value(
-            subject=self.observedProperty, predicate=SSN.isPropertyOf, any=False)
+        self.madeBySensor = self.kraken.sensor_of(self.observedProperty, any=False)
+        self.hasFeatureOfInterest = self.kraken.feature_of(self.observedProperty, any=False)
 
-        self.g.add((self.iri, SOSA.madeBySensor, self.madeBySensor))
-        self.g.add((self.iri, SOSA.hasFeatureOfInterest, self.hasFeatureOfInterest))
+        self._add((self.iri, SOSA.madeBySensor, self.madeBySensor))
+        self._add((self.iri, SOSA.hasFeatureOfInterest, self.hasFeatureOfInterest))
 
         for element in self.hasResult:
-            self.g.add((self.iri, SOSA.hasResult, element))
+            self._add((self.iri, SOSA.hasResult, element))
 
     def isMemberOf(self, iri: URIRef) -> Observation:
-        self.g.add((iri, SOSA.hasMember, self.iri))
+        self._add((iri, SOSA.hasMember, self.iri))
         return self
 
 
@@ -632,10 +1589,10 @@ class ObservationCollection(Thing):
         # after those are implemented it may make sense to do ObservationCollection(Observation)
         super().__init__(kraken, iri, identifier, name, comment, subjectOf, image, documentation, rdftype)
 
-        self.g.add((self.iri, RDF.type, SOSA.ObservationCollection))
+        self._add((self.iri, RDF.type, SOSA.ObservationCollection))
 
     def isMemberOf(self, iri: URIRef) -> Observation:
-        self.g.add((iri, SOSA.hasMember, self.iri))
+        self._add((iri, SOSA.hasMember, self.iri))
         return self
 
 
@@ -652,30 +1609,164 @@ class Result(Thing):
                  image: URIRef | None = None,
                  documentation: URIRef | None = None,
                  rdftype: URIRef | None = None,
-                 creator: str | None = None):
+                 creator: str | None = None,
+                 stream: bool = False,
+                 chunks: bool | tuple | None = True,
+                 compression: str | None = "gzip",
+                 compression_opts: int | None = 4):
         super().__init__(kraken, iri, identifier, name, comment, subjectOf, image, documentation, rdftype)
         accessurl = ""  # for now we only support same document references
 
         self.title = name
         self.creator = creator  # move to ObservationCollection = DatasetCollection
         self.unit = unit
+        # chunks=None and compression=None write contiguous datasets
+        self.chunks = chunks
+        self.compression = compression
+        self.compression_opts = compression_opts
         self.h5path = h5path  # we assume data is already at name = h5path
-        if data is not None:  # if data is provided we assert name = uuid
-            self.h5path += self.identifier
-        self.data = data
+        if data is not None or stream:  # if data is provided or streamed we assert name = uuid
+            # the generated uuid, or the identifier given with the iri. not self.identifier[0],
+            # the order of several dcterms:identifier values is up to the store
+            dataset_name = str(self._uuid) if iri is None else identifier
+            if dataset_name is None:
+                raise ValueError("a Result with data or stream and an iri needs an identifier to name its dataset")
+            self.h5path = posixpath.join(self.h5path, str(dataset_name))
+        if data is not None:
+            self.write(data)
 
         d = URIRef(accessurl + "#" + H5PATH_RDF_METADATA + self.h5path)
 
-        self.g.add((self.iri, RDF.type, SOSA.Result))
-        self.g.add((self.iri, RDF.type, QUDT.QuantityValue))
-        self.g.add((self.iri, RDF.type, DCAT.Dataset))
-        self.g.add((self.iri, DCTERMS.title, Literal(self.title)))
-        self.g.add((self.iri, DCTERMS.creator, Literal(self.creator)))
-        self.g.add((self.iri, QUDT.unit, self.unit))
-        # use DCAT.distribution also?
-        self.g.add((self.iri, QUDT.numericValue, d))
+        self._add((self.iri, RDF.type, SOSA.Result))
+        self._add((self.iri, RDF.type, QUDT.QuantityValue))
+        self._add((self.iri, RDF.type, DCAT.Dataset))
+        self._add((self.iri, DCTERMS.title, Literal(self.title)))
+        self._add((self.iri, DCTERMS.creator, Literal(self.creator)))
+        self._add((self.iri, QUDT.unit, self.unit))
+        self._add((self.iri, QUDT.numericValue, d))
+        self._add((self.iri, DCAT.distribution, d))
         # timestamp, t0, dt
         # maybe this needs to be a result collection ?
 
-        self.g.add((d, RDF.type, DCAT.Distribution))
-        self.g.add((d, DCAT.accessURL, URIRef(accessurl + "#" + self.h5path)))
+        self._add((d, RDF.type, DCAT.Distribution))
+        self._add((d, DCAT.accessURL, URIRef(accessurl + "#" + self.h5path)))
+
+    @classmethod
+    def from_graph(cls, kraken: Kraken, iri: URIRef) -> Result:
+        """
+        the Result for an iri of a loaded graph, nothing is added to the graph.
+        h5path is taken from the fragment of the dcat:accessURL of its distribution.
+        """
+        g = kraken.g
+        distribution = g.value(subject=iri, predicate=QUDT.numericValue, any=False)
+        accessurl = g.value(subject=distribution, predicate=DCAT.accessURL, any=False)
+        if accessurl is None:
+            raise LookupError(f"result {iri} has no distribution with a dcat:accessURL")
+
+        result = cls.__new__(cls)
+        result.kraken = kraken
+        result._iri = iri
+        result.title = g.value(subject=iri, predicate=DCTERMS.title)
+        result.creator = g.value(subject=iri, predicate=DCTERMS.creator)
+        result.unit = g.value(subject=iri, predicate=QUDT.unit)
+        result.chunks = True
+        result.compression = "gzip"
+        result.compression_opts = 4
+        result.h5path = str(accessurl).partition("#")[2]
+        kraken.register(result)
+        return result
+
+    @property
+    def data(self) -> ResultData:
+        """
+        lazy view on the dataset, nothing is read before it is sliced, e.g. result.data[t0:t1]
+        """
+        return ResultData(self.kraken, self.h5path)
+
+    def _create_dataset(self, f: h5py.File, shape: tuple, dtype, resizable: bool) -> h5py.Dataset:
+        if self.h5path in f:
+            del f[self.h5path]
+        chunks = self.chunks
+        if resizable and not chunks:
+            chunks = True  # resizable datasets are always chunked
+        return f.create_dataset(self.h5path, shape=shape, dtype=dtype,
+                                maxshape=(None,) + shape[1:] if resizable else None,
+                                chunks=chunks or None,
+                                compression=self.compression,
+                                compression_opts=self.compression_opts if self.compression else None)
+
+    def write(self, data) -> Result:
+        """
+        write the whole array to h5path in the file of the Kraken, replacing what is there.
+        """
+        data = np.asarray(data)
+        with self.kraken.h5file() as f:
+            dset = self._create_dataset(f, data.shape, data.dtype, resizable=False)
+            dset[...] = data
+        return self
+
+    def append(self, block) -> Result:
+        """
+        append a block of samples along the first axis, the dataset is created on the first call.
+        keep the file open with kraken.h5file() while streaming many blocks.
+
+        with kraken.h5file():
+            for block in blocks:
+                result.append(block)
+        """
+        block = np.asarray(block)
+        if block.ndim == 0:
+            block = block.reshape(1)
+        with self.kraken.h5file() as f:
+            dset = f.get(self.h5path)
+            if dset is None:
+                dset = self._create_dataset(f, (0,) + block.shape[1:], block.dtype, resizable=True)
+            start = dset.shape[0]
+            dset.resize(start + block.shape[0], axis=0)
+            dset[start:] = block
+        return self
+
+
+class ResultData(object):
+    """
+    lazy, sliceable view on the dataset of a Result.
+    contiguous datasets are memory-mapped, chunked (and compressed) ones are read through h5py,
+    which only reads the chunks touched by the slice.
+    """
+    def __init__(self, kraken: Kraken, h5path: str):
+        self.kraken = kraken
+        self.h5path = h5path
+
+        with kraken.h5file("r") as f:
+            dset = f[h5path]
+            self.shape = dset.shape
+            self.dtype = dset.dtype
+            offset = None
+            if dset.chunks is None and dset.compression is None:
+                offset = dset.id.get_offset()  # None if the storage is not allocated yet
+
+        if offset is not None and self.shape and 0 not in self.shape:
+            self._memmap = np.memmap(kraken.filepath, mode="r", dtype=self.dtype, shape=self.shape, offset=offset)
+        else:
+            self._memmap = None
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    @property
+    def ndim(self) -> int:
+        return len(self.shape)
+
+    @property
+    def is_memmap(self) -> bool:
+        return self._memmap is not None
+
+    def __getitem__(self, key) -> np.ndarray:
+        if self._memmap is not None:
+            return self._memmap[key]
+        with self.kraken.h5file("r") as f:
+            return f[self.h5path][key]
+
+    def __array__(self, dtype=None) -> np.ndarray:
+        data = self[...]
+        return data if dtype is None else data.astype(dtype)
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import List
+
+# files are only replaced when their content changes, so unchanged resources keep their mtimes
+# and the metadata hub repository does not rescan them, e.g. for a whole generator run:
+#     with OutputWriter() as writer:
+#         for ...:
+#             kraken.write_all(directory, writer=writer)
+
+# mkstemp creates files readable only by the owner, written files get the usual permissions instead
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def _file_hash(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def write_if_changed(path: str | Path, data: bytes | str, encoding: str = "utf-8") -> bool:
+    """
+    write data to path unless the file already holds exactly these bytes, returns whether it was written.
+    the file is replaced atomically: data goes to a temporary file in the same directory which is renamed.
+    """
+    path = Path(path)
+    if isinstance(data, str):
+        data = data.encode(encoding)
+    try:
+        # a different size needs no hashing
+        if path.stat().st_size == len(data) and _file_hash(path) == hashlib.sha256(data).hexdigest():
+            return False
+    except FileNotFoundError:
+        pass
+
+    descriptor, temporary = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(descriptor, "wb") as f:
+            f.write(data)
+        os.chmod(temporary, 0o666 & ~_UMASK)
+        os.replace(temporary, path)
+    except BaseException:
+        try:
+            os.unlink(temporary)
+        except FileNotFoundError:
+            pass
+        raise
+    return True
+
+
+class OutputWriter(object):
+    """
+    runs write_if_changed in a pool of worker threads, so serializing the next resource does not wait for the disk.
+    at most max_pending writes are queued, write() blocks until one of them is done.
+    errors of the writes are raised by flush() and close().
+    """
+
+    def __init__(self, workers: int = 4, max_pending: int = 64) -> None:
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="OutputWriter")
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._futures: List[Future] = []
+        self.written = 0
+        self.unchanged = 0
+
+    def write(self, path: str | Path, data: bytes | str, encoding: str = "utf-8") -> Future:
+        """
+        queue data for path, the future tells whether the file was written.
+        """
+        self._slots.acquire()
+        try:
+            future = self._pool.submit(write_if_changed, path, data, encoding)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(self._done)
+        with self._lock:
+            self._futures.append(future)
+        return future
+
+    def _done(self, future: Future) -> None:
+        self._slots.release()
+        if future.cancelled() or future.exception() is not None:
+            return
+        with self._lock:
+            if future.result():
+                self.written += 1
+            else:
+                self.unchanged += 1
+
+    def flush(self) -> None:
+        """
+        wait for every queued write.
+        """
+        with self._lock:
+            futures, self._futures = self._futures, []
+        for future in futures:
+            future.result()
+
+    def close(self) -> None:
+        try:
+            self.flush()
+        finally:
+            self._pool.shutdown()
+
+    def __enter__(self) -> OutputWriter:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import json
+import time
+from contextlib import contextmanager
+from functools import wraps
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+# opt-in instrumentation of Kraken, e.g. Kraken(profile=True) or one Profiler shared by many Krakens:
+#     kraken = Kraken(profile=True)
+#     with kraken.profiling():  # constructors and setters are only timed inside the block
+#         ...
+#     profiler = Profiler()
+#     run_script(sensor_table, out_dir, profiler=profiler)
+#     profiler.dump("stats.json")
+
+
+class Profiler(object):
+    """
+    collects triples added per class, time per constructor / property setter,
+    time of named sections (e.g. excel parsing) and time and bytes per serialization.
+    constructors and setters are only timed inside of instrumented() / Kraken.profiling(), their times are
+    inclusive, Sensor.__init__ contains the Thing.__init__ it calls.
+    """
+
+    def __init__(self) -> None:
+        self.triples: Dict[str, int] = {}
+        self.calls: Dict[str, List[float]] = {}  # "Class.member" -> [calls, seconds]
+        self.sections: Dict[str, List[float]] = {}  # name -> [calls, seconds]
+        self.serializations: List[dict] = []
+
+    def count(self, origin: str) -> None:
+        self.triples[origin] = self.triples.get(origin, 0) + 1
+
+    def record(self, label: str, seconds: float) -> None:
+        entry = self.calls.get(label)
+        if entry is None:
+            entry = self.calls[label] = [0, 0.0]
+        entry[0] += 1
+        entry[1] += seconds
+
+    @contextmanager
+    def section(self, name: str) -> Iterator[None]:
+        """
+        time the code inside the with block under name.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            entry = self.sections.setdefault(name, [0, 0.0])
+            entry[0] += 1
+            entry[1] += time.perf_counter() - start
+
+    def serialized(self, format: str, path: str, seconds: float, size: int) -> None:
+        self.serializations.append({"format": format, "path": path, "seconds": seconds, "bytes": size})
+
+    def merge(self, other: Profiler) -> None:
+        """
+        add everything other collected, e.g. the profilers of worker processes.
+        """
+        for origin, count in other.triples.items():
+            self.triples[origin] = self.triples.get(origin, 0) + count
+        for mine, theirs in ((self.calls, other.calls), (self.sections, other.sections)):
+            for label, (calls, seconds) in theirs.items():
+                entry = mine.setdefault(label, [0, 0.0])
+                entry[0] += calls
+                entry[1] += seconds
+        self.serializations.extend(other.serializations)
+
+    def stats(self) -> dict:
+        """
+        everything collected so far as plain dict, slowest entries first.
+        """
+        def timings(entries: Dict[str, List[float]]) -> Dict[str, dict]:
+            ordered = sorted(entries.items(), key=lambda item: item[1][1], reverse=True)
+            return {label: {"calls": calls, "seconds": seconds} for label, (calls, seconds) in ordered}
+
+        per_format = {}
+        for entry in self.serializations:
+            total = per_format.setdefault(entry["format"], {"files": 0, "seconds": 0.0, "bytes": 0})
+            total["files"] += 1
+            total["seconds"] += entry["seconds"]
+            total["bytes"] += entry["bytes"]
+
+        return {"triples": dict(sorted(self.triples.items(), key=lambda item: item[1], reverse=True)),
+                "triples_total": sum(self.triples.values()),
+                "calls": timings(self.calls),
+                "sections": timings(self.sections),
+                "serialization": per_format}
+
+    def dump(self, path: str | Path, indent: int = 2) -> None:
+        """
+        write stats() as json file.
+        """
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.stats(), f, indent=indent)
+
+
+# class -> its members as they were before instrumented() wrapped them, empty outside of instrumented()
+_instrumented: Dict[type, Dict[str, object]] = {}
+
+
+@contextmanager
+def instrumented(root: type) -> Iterator[None]:
+    """
+    wrap __init__ and all property setters of root and its subclasses inside the with block to report their
+    time to the Profiler of the Kraken they belong to, the wrappers of Krakens without Profiler only cost
+    one attribute lookup per call. the classes are patched process wide and restored on leaving the block,
+    so it is not re-entrant: blocks must not be nested or run in several threads at once.
+    """
+    if _instrumented:
+        raise ValueError("the entity classes are already instrumented, instrumented() is not re-entrant")
+    try:
+        _instrument(root)
+        yield
+    finally:
+        for cls, members in _instrumented.items():
+            for name, member in members.items():
+                setattr(cls, name, member)
+        _instrumented.clear()
+
+
+def instrument_subclass(cls: type) -> None:
+    """
+    wrap a class defined inside of instrumented(), meant for __init_subclass__.
+    """
+    if any(base in _instrumented for base in cls.__mro__[1:]):
+        _instrument(cls)
+
+
+def _instrument(root: type) -> None:
+    classes = [root]
+    while classes:
+        cls = classes.pop()
+        if cls not in _instrumented:
+            _wrap(cls)
+        classes.extend(cls.__subclasses__())
+
+
+def _wrap(cls: type) -> None:
+    def timed(function, label: str, kraken_of):
+        @wraps(function)
+        def wrapper(self, *args, **kwargs):
+            profiler = getattr(kraken_of(self, args, kwargs), "profiler", None)
+            if profiler is None:
+                return function(self, *args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return function(self, *args, **kwargs)
+            finally:
+                profiler.record(label, time.perf_counter() - start)
+        return wrapper
+
+    def kraken_of_init(self, args, kwargs):
+        # the kraken is the first argument of every entity constructor
+        return args[0] if args else kwargs.get("kraken")
+
+    def kraken_of_setter(self, args, kwargs):
+        return getattr(self, "kraken", None)
+
+    originals = _instrumented[cls] = {}
+    for name, member in list(vars(cls).items()):
+        if name == "__init__":
+            originals[name] = member
+            setattr(cls, name, timed(member, f"{cls.__name__}.__init__", kraken_of_init))
+        elif isinstance(member, property) and member.fset is not None:
+            originals[name] = member
+            fset = timed(member.fset, f"{cls.__name__}.{name}", kraken_of_setter)
+            setattr(cls, name, property(member.fget, fset, member.fdel, member.__doc__))
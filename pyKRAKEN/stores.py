@@ -0,0 +1,378 @@
+from __future__ import annotations
+
+import gzip
+import heapq
+import os
+import re
+import sqlite3
+import tempfile
+from itertools import islice
+from typing import Callable, Iterator, Tuple
+from urllib.parse import unquote
+
+from rdflib import BNode, Literal, URIRef
+from rdflib.plugin import register
+from rdflib.plugins.parsers.ntriples import W3CNTriplesParser, uriquote
+from rdflib.plugins.serializers.nt import _nt_row
+from rdflib.store import NO_STORE, VALID_STORE, Store
+
+# store plugins of pyKRAKEN, usable by name e.g. Kraken(store="SQLite", configuration="registry.sqlite")
+# or Kraken(store="AppendOnly") for generators that only build and serialize
+# or Kraken(store="NTriplesLog", configuration="run.nt.gz") for conversions too large for memory
+
+
+def _encode(term) -> str:
+    # one text column per term: kind character + payload, literals as lang \0 datatype \0 lexical form
+    if isinstance(term, Literal):
+        return f"L{term.language or ''}\0{term.datatype or ''}\0{term}"
+    if isinstance(term, BNode):
+        return "B" + term
+    return "U" + term
+
+
+def _decode(value: str):
+    kind, payload = value[0], value[1:]
+    if kind == "U":
+        return URIRef(payload)
+    if kind == "B":
+        return BNode(payload)
+    language, datatype, lexical = payload.split("\0", 2)
+    return Literal(lexical, lang=language or None, datatype=URIRef(datatype) if datatype else None)
+
+
+class SQLiteStore(Store):
+    """
+    persistent, transactional triple store in a single sqlite file.
+    changes become durable on commit(), rollback() drops everything since the last commit.
+    the store is not context aware, every Graph on it sees the same triples.
+    """
+    context_aware = False
+    formula_aware = False
+    transaction_aware = True
+    graph_aware = False
+
+    def __init__(self, configuration: str | None = None, identifier=None):
+        self._connection = None
+        super().__init__(configuration, identifier)
+
+    def open(self, configuration: str, create: bool = False) -> int:
+        if not create and not os.path.exists(configuration):
+            return NO_STORE
+
+        self._connection = sqlite3.connect(configuration)
+        self._connection.executescript("""
+            PRAGMA journal_mode = WAL;
+            PRAGMA synchronous = NORMAL;
+            CREATE TABLE IF NOT EXISTS triples (s TEXT NOT NULL, p TEXT NOT NULL, o TEXT NOT NULL,
+                                                PRIMARY KEY (s, p, o)) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS triples_pos ON triples (p, o, s);
+            CREATE INDEX IF NOT EXISTS triples_osp ON triples (o, s, p);
+            CREATE TABLE IF NOT EXISTS namespaces (prefix TEXT PRIMARY KEY, uri TEXT NOT NULL UNIQUE);
+        """)
+        return VALID_STORE
+
+    def close(self, commit_pending_transaction: bool = False) -> None:
+        if self._connection is None:
+            return
+        if commit_pending_transaction:
+            self._connection.commit()
+        else:
+            self._connection.rollback()
+        self._connection.close()
+        self._connection = None
+
+    def destroy(self, configuration: str) -> None:
+        self.close()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(configuration + suffix):
+                os.remove(configuration + suffix)
+
+    def commit(self) -> None:
+        self._connection.commit()
+
+    def rollback(self) -> None:
+        self._connection.rollback()
+
+    # triples
+
+    def add(self, triple, context, quoted: bool = False) -> None:
+        Store.add(self, triple, context, quoted)
+        self._connection.execute("INSERT OR IGNORE INTO triples VALUES (?, ?, ?)",
+                                 tuple(_encode(term) for term in triple))
+
+    def addN(self, quads) -> None:  # noqa: N802
+        self._connection.executemany("INSERT OR IGNORE INTO triples VALUES (?, ?, ?)",
+                                     ((_encode(s), _encode(p), _encode(o)) for s, p, o, _ in quads))
+
+    @staticmethod
+    def _where(triple_pattern) -> Tuple[str, tuple]:
+        clauses = []
+        values = []
+        for column, term in zip("spo", triple_pattern):
+            if term is not None:
+                clauses.append(f"{column} = ?")
+                values.append(_encode(term))
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", tuple(values)
+
+    def remove(self, triple_pattern, context=None) -> None:
+        where, values = self._where(triple_pattern)
+        self._connection.execute("DELETE FROM triples" + where, values)
+
+    def triples(self, triple_pattern, context=None) -> Iterator:
+        where, values = self._where(triple_pattern)
+        # fetch everything first, callers are allowed to change the graph while iterating
+        rows = self._connection.execute("SELECT s, p, o FROM triples" + where, values).fetchall()
+        for s, p, o in rows:
+            yield (_decode(s), _decode(p), _decode(o)), iter(())
+
+    def __len__(self, context=None) -> int:
+        return self._connection.execute("SELECT COUNT(*) FROM triples").fetchone()[0]
+
+    def contexts(self, triple=None) -> Iterator:
+        return iter(())
+
+    # namespaces, same override semantics as the Memory store
+
+    def bind(self, prefix: str, namespace: URIRef, override: bool = True) -> None:
+        bound_prefix = self.prefix(namespace)
+        bound_namespace = self.namespace(prefix)
+        if override:
+            self._connection.execute("DELETE FROM namespaces WHERE prefix = ? OR uri = ?", (prefix, str(namespace)))
+            self._connection.execute("INSERT INTO namespaces VALUES (?, ?)", (prefix, str(namespace)))
+        elif bound_prefix is None and bound_namespace is None:
+            self._connection.execute("INSERT INTO namespaces VALUES (?, ?)", (prefix, str(namespace)))
+
+    def namespace(self, prefix: str) -> URIRef | None:
+        row = self._connection.execute("SELECT uri FROM namespaces WHERE prefix = ?", (prefix,)).fetchone()
+        return URIRef(row[0]) if row is not None else None
+
+    def prefix(self, namespace: URIRef) -> str | None:
+        row = self._connection.execute("SELECT prefix FROM namespaces WHERE uri = ?", (str(namespace),)).fetchone()
+        return row[0] if row is not None else None
+
+    def namespaces(self) -> Iterator[Tuple[str, URIRef]]:
+        for prefix, uri in self._connection.execute("SELECT prefix, uri FROM namespaces").fetchall():
+            yield prefix, URIRef(uri)
+
+
+class AppendOnlyStore(Store):
+    """
+    lightweight in-memory store for graphs that are only built and then serialized.
+    the triples are kept once, grouped by subject in insertion order, instead of the three indexes plus
+    context bookkeeping of the Memory store. lookups with a bound subject are direct (this is what the
+    serializers and the entity getters use), all other patterns are answered by a linear scan.
+    """
+    context_aware = False
+    formula_aware = False
+    transaction_aware = False
+    graph_aware = False
+
+    def __init__(self, configuration: str | None = None, identifier=None):
+        super().__init__(configuration, identifier)
+        self._spo = {}  # subject -> {(predicate, object): None}
+        self._len = 0
+        self._namespace = {}
+        self._prefix = {}
+
+    def add(self, triple, context, quoted: bool = False) -> None:
+        s, p, o = triple
+        po = self._spo.get(s)
+        if po is None:
+            po = self._spo[s] = {}
+        if (p, o) not in po:
+            po[(p, o)] = None
+            self._len += 1
+
+    def addN(self, quads) -> None:  # noqa: N802
+        for s, p, o, _ in quads:
+            self.add((s, p, o), None)
+
+    def remove(self, triple_pattern, context=None) -> None:
+        if triple_pattern == (None, None, None):
+            self._spo.clear()
+            self._len = 0
+            return
+        for (s, p, o), _ in list(self.triples(triple_pattern)):
+            po = self._spo[s]
+            del po[(p, o)]
+            if not po:
+                del self._spo[s]
+            self._len -= 1
+
+    def triples(self, triple_pattern, context=None) -> Iterator:
+        subject, predicate, object_ = triple_pattern
+        if subject is not None:
+            po = self._spo.get(subject)
+            candidates = [(subject, po)] if po else []
+        else:
+            candidates = self._spo.items()
+        for s, po in candidates:
+            for p, o in po:
+                if (predicate is None or p == predicate) and (object_ is None or o == object_):
+                    yield (s, p, o), iter(())
+
+    def __len__(self, context=None) -> int:
+        return self._len
+
+    def contexts(self, triple=None) -> Iterator:
+        return iter(())
+
+    # namespaces, same semantics as the Memory store
+
+    def bind(self, prefix: str, namespace: URIRef, override: bool = True) -> None:
+        bound_namespace = self._namespace.get(prefix)
+        bound_prefix = self._prefix.get(namespace)
+        if bound_prefix is None and bound_namespace is not None:
+            bound_prefix = self._prefix.get(bound_namespace)
+        if override:
+            if bound_prefix is not None:
+                del self._namespace[bound_prefix]
+            if bound_namespace is not None:
+                del self._prefix[bound_namespace]
+            self._prefix[namespace] = prefix
+            self._namespace[prefix] = namespace
+        else:
+            self._prefix[bound_namespace if bound_namespace is not None else namespace] = \
+                bound_prefix if bound_prefix is not None else prefix
+            self._namespace[bound_prefix if bound_prefix is not None else prefix] = \
+                bound_namespace if bound_namespace is not None else namespace
+
+    def namespace(self, prefix: str) -> URIRef | None:
+        return self._namespace.get(prefix)
+
+    def prefix(self, namespace: URIRef) -> str | None:
+        return self._prefix.get(namespace)
+
+    def namespaces(self) -> Iterator[Tuple[str, URIRef]]:
+        yield from self._namespace.items()
+
+
+def _open_log(path: str, mode: str):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+class NTriplesLogStore(AppendOnlyStore):
+    """
+    write-only store for unbounded conversions. every added triple is appended as n-triples line to the
+    log file given as configuration (gzip compressed if it ends with .gz), in memory are only the triples of
+    the working_set most recently used subjects. reads are answered from that working set only,
+    the complete graph is produced afterwards from the log by Kraken.write_log.
+    duplicates are only dropped within the working set, the sort pass drops the rest.
+    opening the store starts a new log, an existing one is only continued with append=True.
+    triples can not be removed, remove raises a TypeError.
+    """
+    transaction_aware = False
+
+    def __init__(self, configuration: str | None = None, identifier=None, working_set: int = 10000,
+                 append: bool = False):
+        self._file = None
+        self.path = None
+        self.working_set = working_set
+        self.append = append
+        super().__init__(configuration, identifier)
+
+    def open(self, configuration: str, create: bool = False) -> int:
+        if self._file is not None:
+            return VALID_STORE
+        if not create and not os.path.exists(configuration):
+            return NO_STORE
+        self.path = configuration
+        # the log of an earlier run would end up in write_log of this one
+        self._file = _open_log(configuration, "a" if self.append else "w")
+        return VALID_STORE
+
+    def close(self, commit_pending_transaction: bool = False) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def commit(self) -> None:
+        # nothing to roll back, but everything added so far is on disk and readable afterwards
+        if self._file is None:
+            return
+        if self.path.endswith(".gz"):
+            # only a finished gzip member can be read, appending starts the next one
+            self._file.close()
+            self._file = _open_log(self.path, "a")
+        else:
+            self._file.flush()
+
+    def add(self, triple, context, quoted: bool = False) -> None:
+        s, p, o = triple
+        po = self._spo.pop(s, None)
+        if po is None:
+            po = {}
+            if len(self._spo) >= self.working_set:
+                del self._spo[next(iter(self._spo))]  # least recently used subject
+        self._spo[s] = po
+        if (p, o) not in po:
+            po[(p, o)] = None
+            self._file.write(_nt_row(triple))
+            self._len += 1
+
+    def remove(self, triple_pattern, context=None) -> None:
+        raise TypeError("the NTriplesLogStore is append only, triples can not be removed")
+
+
+def sorted_log_lines(path: str, key: Callable[[str], object] | None = None,
+                     chunk_lines: int = 1000000) -> Iterator[str]:
+    """
+    the distinct lines of an n-triples log in sorted order by an external merge sort, at most chunk_lines
+    lines are in memory at a time. sorted by the plain line all lines of one subject are next to each other.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        chunks = []
+        with _open_log(path, "r") as log:
+            while True:
+                lines = sorted(set(islice(log, chunk_lines)), key=key)
+                if not lines:
+                    break
+                chunk = os.path.join(directory, f"{len(chunks)}.nt")
+                with open(chunk, "w", encoding="utf-8") as f:
+                    f.writelines(lines)
+                chunks.append(chunk)
+
+        files = [open(chunk, encoding="utf-8") for chunk in chunks]
+        try:
+            previous = None
+            for line in heapq.merge(*files, key=key):
+                if line != previous:
+                    yield line
+                    previous = line
+        finally:
+            for f in files:
+                f.close()
+
+
+# the generators use relative iris like <docs/> or <#/rdf-metadata/...>, which n-triples itself does not allow
+_r_any_uriref = re.compile(r'<([^\s"<>]*)>')
+
+
+class _LogLineParser(W3CNTriplesParser):
+    def uriref(self):
+        if self.peek("<"):
+            return URIRef(uriquote(unquote(self.eat(_r_any_uriref).group(1))))
+        return False
+
+
+class _GraphSink(object):
+    def __init__(self, graph) -> None:
+        self.graph = graph
+
+    def triple(self, s, p, o) -> None:
+        self.graph.add((s, p, o))
+
+
+def parse_log_lines(lines, graph, bnode_context: dict | None = None):
+    """
+    add n-triples lines of a log to graph, blank nodes are shared via bnode_context.
+    """
+    _LogLineParser(_GraphSink(graph), bnode_context=bnode_context).parsestring("".join(lines))
+    return graph
+
+
+register("SQLite", Store, "pyKRAKEN.stores", "SQLiteStore")
+register("AppendOnly", Store, "pyKRAKEN.stores", "AppendOnlyStore")
+register("NTriplesLog", Store, "pyKRAKEN.stores", "NTriplesLogStore")
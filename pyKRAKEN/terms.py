@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from typing import Dict, Tuple
+
+from rdflib.term import Node
+
+# interning of rdf terms, e.g. one pool for a whole generator run:
+#     terms = TermPool()
+#     for row in rows:
+#         data = Kraken(terms=terms)
+#         ...
+
+
+class TermPool(object):
+    """
+    hands out one shared object per distinct rdf term, so equal terms created over and over
+    (Literal("FST"), unit iris, doi iris, and every namespace attribute access like SDO.name)
+    are stored only once in the graphs of all Krakens using the pool.
+    the pool keeps its terms alive until clear() or until the pool itself is dropped.
+    """
+
+    def __init__(self) -> None:
+        # keyed by type and term, terms of different type may compare equal as str
+        self._terms: Dict[Tuple[type, Node], Node] = {}
+
+    def intern(self, term: Node) -> Node:
+        key = (term.__class__, term)
+        shared = self._terms.get(key)
+        if shared is None:
+            shared = self._terms[key] = term
+        return shared
+
+    def intern_triple(self, triple: Tuple[Node, Node, Node]) -> Tuple[Node, Node, Node]:
+        s, p, o = triple
+        return self.intern(s), self.intern(p), self.intern(o)
+
+    def clear(self) -> None:
+        self._terms.clear()
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def __contains__(self, term: Node) -> bool:
+        return (term.__class__, term) in self._terms
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import unicodedata
+from collections import namedtuple
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Tuple
+
+from rdflib import Graph, URIRef
+from rdflib.namespace import RDF, RDFS, SKOS
+
+from pyKRAKEN.kraken import QUDT, UNIT, QUANTITYKIND
+
+# units and quantity kinds of the local qudt snapshot (qudt_units.ttl), e.g. in a generator:
+#     Quantity(..., hasQuantityKind=quantity_kind(sheet_name), unit=unit_iri(row.range_unit))
+#     convert(10, "bar", "MPa")
+
+QUDT_SNAPSHOT = Path(__file__).parent / "qudt_units.ttl"
+
+Unit = namedtuple("Unit", "iri symbol quantity_kinds multiplier offset")
+
+
+def spelling_key(spelling: str) -> str:
+    """
+    the form spellings of units are compared in: unicode compatibility normalized (µ and μ, ³ and 3),
+    without whitespace and ^, with . as multiplication sign, e.g. "m^3 / s" -> "m3/s".
+    """
+    key = unicodedata.normalize("NFKC", str(spelling))
+    for sign in ("⋅", "·", "*"):
+        key = key.replace(sign, ".")
+    return "".join(key.split()).replace("^", "")
+
+
+@lru_cache(maxsize=None)
+def _tables() -> Tuple[Dict[str, Unit], Dict[str, Unit], Dict[str, URIRef]]:
+    # parsed once per process: units by symbol, ucum code, local name and label exactly as written
+    # (case sensitive, mV is not MV and k is not K), units by label of more than one character in lower case
+    # ("bar", "percent") and quantity kinds by label / local name (lower case)
+    g = Graph().parse(QUDT_SNAPSHOT, format="turtle")
+    by_symbol: Dict[str, Unit] = {}
+    by_name: Dict[str, Unit] = {}
+    for iri in g.subjects(RDF.type, QUDT.Unit):
+        symbol = g.value(iri, QUDT.symbol)
+        unit = Unit(iri=iri, symbol=str(symbol) if symbol is not None else None,
+                    quantity_kinds=frozenset(g.objects(iri, QUDT.hasQuantityKind)),
+                    multiplier=float(g.value(iri, QUDT.conversionMultiplier, default=1.0)),
+                    offset=float(g.value(iri, QUDT.conversionOffset, default=0.0)))
+        labels = [*g.objects(iri, RDFS.label), *g.objects(iri, SKOS.altLabel)]
+        for code in (symbol, g.value(iri, QUDT.ucumCode), iri.removeprefix(str(UNIT)), *labels):
+            if code is not None:
+                by_symbol.setdefault(spelling_key(code), unit)
+        for label in labels:
+            # a single letter in the wrong case is another unit or a typo, never a label
+            if len(spelling_key(label)) > 1:
+                by_name.setdefault(spelling_key(label).lower(), unit)
+
+    quantity_kinds: Dict[str, URIRef] = {}
+    for iri in g.subjects(RDF.type, QUDT.QuantityKind):
+        names = [iri.removeprefix(str(QUANTITYKIND)), *g.objects(iri, RDFS.label), *g.objects(iri, SKOS.altLabel)]
+        for name in names:
+            quantity_kinds.setdefault(spelling_key(name).lower(), iri)
+    return by_symbol, by_name, quantity_kinds
+
+
+def find_unit(spelling: str | URIRef | None) -> Unit | None:
+    """
+    the unit written as spelling (symbol, ucum code, label or qudt iri), None if the snapshot does not know it.
+    only labels of more than one character are found in any case, "k" is neither unit:K nor a prefix.
+    """
+    if spelling is None:
+        return None
+    by_symbol, by_name, _ = _tables()
+    if isinstance(spelling, URIRef):
+        spelling = spelling.removeprefix(str(UNIT))
+    key = spelling_key(spelling)
+    found = by_symbol.get(key)
+    if found is None:
+        found = by_name.get(key.lower())
+    return found
+
+
+def unit(spelling: str | URIRef) -> Unit:
+    found = find_unit(spelling)
+    if found is None:
+        raise LookupError(f"unit {spelling!r} is not in the qudt snapshot {QUDT_SNAPSHOT.name}")
+    return found
+
+
+def unit_iri(spelling: str | URIRef) -> URIRef:
+    return unit(spelling).iri
+
+
+def quantity_kind(name: str | URIRef) -> URIRef:
+    """
+    the qudt quantity kind of name (label, german sheet name like "Druck" or qudt iri).
+    """
+    _, _, quantity_kinds = _tables()
+    if isinstance(name, URIRef):
+        name = name.removeprefix(str(QUANTITYKIND))
+    found = quantity_kinds.get(spelling_key(name).lower())
+    if found is None:
+        raise LookupError(f"quantity kind {name!r} is not in the qudt snapshot {QUDT_SNAPSHOT.name}")
+    return found
+
+
+def _compatible(source: Unit, target: Unit) -> None:
+    if not source.quantity_kinds & target.quantity_kinds:
+        raise ValueError(f"{source.iri} and {target.iri} share no quantity kind")
+
+
+def conversion_factor(source: str | URIRef, target: str | URIRef) -> float:
+    """
+    factor from source to target unit, value in target = value in source * factor.
+    raises ValueError for units of other quantity kinds or with offsets (°C to K, use convert).
+    """
+    source, target = unit(source), unit(target)
+    _compatible(source, target)
+    if (source.offset or target.offset) and source != target:
+        raise ValueError(f"{source.iri} to {target.iri} is no factor because of the offsets, use convert")
+    return source.multiplier / target.multiplier
+
+
+def convert(value: float, source: str | URIRef, target: str | URIRef) -> float:
+    """
+    value in source unit converted to target unit, through the si unit of the quantity kind.
+    qudt defines value in si unit = (value + conversionOffset) * conversionMultiplier.
+    """
+    source, target = unit(source), unit(target)
+    _compatible(source, target)
+    return (value + source.offset) * source.multiplier / target.multiplier - target.offset
@@ -0,0 +1,79 @@
+import hashlib
+import os
+
+from hardcoded_generate_scripts import asset_index
+from hardcoded_generate_scripts.asset_index import AssetIndex
+
+
+def make_tree(root):
+    (root / "a" / "img").mkdir(parents=True)
+    (root / "a" / "docs").mkdir()
+    (root / "a" / "img" / "photo.png").write_bytes(b"png")
+    (root / "a" / "docs" / "sheet.pdf").write_bytes(b"pdf")
+    (root / "a" / "rdf.ttl").write_bytes(b"ttl")
+    (root / "b" / ".git").mkdir(parents=True)
+    (root / "b" / ".git" / "HEAD").write_bytes(b"ref")
+    (root / "b" / "rdf.ttl").write_bytes(b"other ttl")
+
+
+def test_scan(tmp_path):
+    make_tree(tmp_path)
+    assets = AssetIndex.scan(tmp_path)
+    assert assets.resource_names() == ["a", "b"]
+    assert sorted(assets.resources["a"]) == ["docs/sheet.pdf", "img/photo.png", "rdf.ttl"]
+    assert sorted(assets.resources["b"]) == ["rdf.ttl"]
+    assert assets.directories["a"] == {"", "img", "docs"}
+    name, entry = assets.files("a", "img")[0]
+    assert name == "photo.png" and entry.size == 3 and entry.sha256 == hashlib.sha256(b"png").hexdigest()
+    assert [name for name, _ in assets.files("a")] == ["rdf.ttl"]
+    assert AssetIndex.scan(tmp_path / "missing").resources == {}
+
+
+def test_cache_rehashes_only_changed_files(tmp_path, monkeypatch):
+    root, cache = tmp_path / "root", tmp_path / "assets.json"
+    make_tree(root)
+    first = AssetIndex.scan(root, cache=cache)
+    assert cache.is_file()
+
+    hashed = []
+
+    def counting_hash(path):
+        hashed.append(os.path.relpath(path, root).replace(os.sep, "/"))
+        return hashlib.sha256(open(path, "rb").read()).hexdigest()
+
+    monkeypatch.setattr(asset_index, "file_hash", counting_hash)
+    assert AssetIndex.scan(root, cache=cache).resources == first.resources
+    assert hashed == []
+
+    photo = root / "a" / "img" / "photo.png"
+    stat = photo.stat()
+    os.utime(photo, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    rescanned = AssetIndex.scan(root, cache=cache)
+    assert hashed == ["a/img/photo.png"]
+    assert rescanned.resources["a"]["img/photo.png"].mtime_ns == stat.st_mtime_ns + 1_000_000_000
+    assert rescanned.resources["b"] == first.resources["b"]
+
+
+def test_make_directory(tmp_path):
+    make_tree(tmp_path)
+    assets = AssetIndex.scan(tmp_path)
+    assets.make_directory("c", "docs/old")
+    assert (tmp_path / "c" / "docs" / "old").is_dir()
+    assert assets.directories["c"] == {"", "docs", "docs/old"}
+    assert assets.has_directory("c", "docs/") and assets.files("c", "docs") == []
+
+    # known folders are not created again
+    (tmp_path / "a" / "img" / "photo.png").unlink()
+    (tmp_path / "a" / "img").rmdir()
+    assets.make_directory("a", "img")
+    assert not (tmp_path / "a" / "img").exists()
+
+
+def test_select(tmp_path):
+    make_tree(tmp_path)
+    assets = AssetIndex.scan(tmp_path)
+    selected = assets.select(["a", "unknown"])
+    assert selected.resource_names() == ["a"]
+    assert selected.resources["a"] == assets.resources["a"]
+    selected.make_directory("a", "new")
+    assert not assets.has_directory("a", "new")
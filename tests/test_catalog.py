@@ -0,0 +1,63 @@
+import gzip
+
+from rdflib import Graph, Literal, URIRef
+from rdflib.namespace import RDFS
+
+from pyKRAKEN.catalog import CatalogWriter, read_catalog_index, read_resource, resource_member
+from pyKRAKEN.kraken import FST
+
+
+def resource(key):
+    g = Graph()
+    g.add((FST[key], RDFS.label, Literal(f"sensor {key}")))
+    g.add((FST[key], RDFS.seeAlso, URIRef("docs/")))  # relative, resolved against the resource directory
+    return g
+
+
+def test_byte_ranges_give_back_every_resource(tmp_path):
+    path = tmp_path / "sensors.nt.gz"
+    with CatalogWriter(path, title="sensors") as catalog:
+        for key in ("b", "a", "c"):
+            catalog.add_graph(key, resource(key), base=FST[f"{key}/"])
+
+    ranges = read_catalog_index(tmp_path / "sensors.catalog.ttl")
+    assert sorted(ranges) == ["a", "b", "c"]
+    assert ranges["a"][0] == 0 and sum(size for _, size in ranges.values()) == path.stat().st_size
+    for key, (offset, size) in ranges.items():
+        g = read_resource(path, offset, size)
+        assert (FST[key], RDFS.seeAlso, FST[f"{key}/docs/"]) in g
+        assert len(g) == 2
+
+    # the members together are one gzip file of all triples
+    whole = Graph().parse(data=gzip.decompress(path.read_bytes()).decode("utf-8"), format="nt")
+    assert len(whole) == 6
+
+
+def test_members_are_reproducible_and_kept(tmp_path):
+    assert resource_member(resource("a"), FST["a/"]) == resource_member(resource("a"), FST["a/"])
+
+    path = tmp_path / "sensors.nt.gz"
+    with CatalogWriter(path) as catalog:
+        catalog.add_graph("a", resource("a"), base=FST["a/"])
+        catalog.add_graph("b", resource("b"), base=FST["b/"])
+    data = path.read_bytes()
+
+    # a kept from the previous catalog, b generated again: nothing changes
+    catalog = CatalogWriter(path)
+    catalog.keep("a", tmp_path / "a")
+    catalog.add_graph("b", resource("b"), base=FST["b/"])
+    assert catalog.close()["written"] is False
+    assert path.read_bytes() == data
+
+
+def test_keep_falls_back_to_the_resource_directory(tmp_path):
+    directory = tmp_path / "c"
+    directory.mkdir()
+    (directory / "rdf.ttl").write_text(
+        "@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .\n"
+        "<../c> rdfs:label \"sensor c\" ; rdfs:seeAlso <docs/> .\n", encoding="utf-8")
+    with CatalogWriter(tmp_path / "sensors.nt.gz") as catalog:
+        catalog.keep("c", directory)
+    (offset, size), = read_catalog_index(tmp_path / "sensors.catalog.ttl").values()
+    member = (tmp_path / "sensors.nt.gz").read_bytes()[offset:offset + size]
+    assert member == resource_member(resource("c"), FST["c/"])
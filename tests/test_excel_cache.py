@@ -0,0 +1,58 @@
+import os
+import pickle
+import shutil
+from pathlib import Path
+
+import pandas as pd
+
+from hardcoded_generate_scripts.excel_cache import read_workbook
+from hardcoded_generate_scripts.gitlab_db_sensor import SENSOR_TABLE_COLUMNS, SUPPORTED_SENSOR_TABLE_SHEET_NAMES
+
+TABLE = Path(__file__).parent.parent / "excel_tables" / "sensor_table_EXAMPLE.xlsx"
+
+
+def test_cached_sheets_equal_the_parsed_ones(tmp_path):
+    table = tmp_path / TABLE.name
+    shutil.copy(TABLE, table)
+    arguments = dict(sheet_names=SUPPORTED_SENSOR_TABLE_SHEET_NAMES, columns=SENSOR_TABLE_COLUMNS, skiprows=[1])
+    parsed = read_workbook(table, **arguments)
+    assert sorted(parsed) == sorted(SUPPORTED_SENSOR_TABLE_SHEET_NAMES)
+    assert all(set(frame.columns) <= set(SENSOR_TABLE_COLUMNS) for frame in parsed.values())
+
+    cache = tmp_path / "cache"
+    first = read_workbook(table, cache_dir=cache, **arguments)
+    cache_file, = cache.iterdir()
+    os.utime(cache_file, (0, 0))
+    second = read_workbook(table, cache_dir=cache, **arguments)
+    assert cache_file.stat().st_mtime == 0  # read, not written again
+    for sheets in (first, second):
+        for name, frame in parsed.items():
+            assert sheets[name].equals(frame)
+
+    # a changed workbook is parsed again
+    os.utime(table, ns=(0, 0))
+    read_workbook(table, cache_dir=cache, **arguments)
+    assert cache_file.stat().st_mtime != 0
+
+
+
+def test_unreadable_cache_is_a_miss(tmp_path):
+    cache = tmp_path / "cache"
+    parsed = read_workbook(TABLE, sheet_names=["Druck"], cache_dir=cache)["Druck"]
+    cache_file, = cache.iterdir()
+    with open(cache_file, "rb") as f:
+        size, mtime, _ = pickle.load(f)
+
+    # written by another pandas version, its sheets are not even unpickled
+    with open(cache_file, "wb") as f:
+        pickle.dump((size, mtime, "0.0.0"), f)
+        f.write(b"sheets pickled by pandas 0.0.0")
+    assert read_workbook(TABLE, sheet_names=["Druck"], cache_dir=cache)["Druck"].equals(parsed)
+
+    # truncated, with the right signature
+    data = cache_file.read_bytes()
+    cache_file.write_bytes(data[:len(data) // 2])
+    assert read_workbook(TABLE, sheet_names=["Druck"], cache_dir=cache)["Druck"].equals(parsed)
+    with open(cache_file, "rb") as f:
+        assert pickle.load(f) == (size, mtime, pd.__version__)
+        assert pickle.load(f)["Druck"].equals(parsed)
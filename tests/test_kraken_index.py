@@ -0,0 +1,90 @@
+import pytest
+from rdflib import URIRef
+from rdflib.exceptions import UniquenessError
+from rdflib.namespace import RDF, SOSA, SSN
+
+from pyKRAKEN.kraken import FST, Kraken, KrakenPool, Observation, Thing
+
+T = URIRef("http://example.org/T")
+
+
+def test_entities_are_indexed():
+    k = Kraken()
+    thing = Thing(k, iri=FST["a"], identifier="a", rdftype=T)
+    assert k.instances(T) == {FST["a"]: thing}
+    assert k.lookup(FST["a"]) is thing
+    assert k.find_by_identifier("a") == FST["a"]
+
+
+def test_direct_graph_writes_are_indexed():
+    for store in ("default", "AppendOnly"):
+        k = Kraken(store=store)
+        k.g.add((FST["a"], RDF.type, T))
+        k.g.addN([(FST["b"], RDF.type, T, k.g)])
+        assert list(k.instances(T)) == [FST["a"], FST["b"]]
+        k.g.remove((FST["a"], RDF.type, None))
+        assert list(k.instances(T)) == [FST["b"]]
+
+
+def test_parse_is_indexed():
+    k = Kraken()
+    k.g.parse(data=f"<{FST['a']}> a <{T}> ; <http://purl.org/dc/terms/identifier> 'a' .", format="turtle")
+    assert list(k.instances(T)) == [FST["a"]]
+    assert k.find_by_identifier("a") == FST["a"]
+
+
+def test_reset_clears_the_index():
+    pool = KrakenPool(size=1)
+    with pool.kraken() as k:
+        Thing(k, iri=FST["a"], identifier="a", rdftype=SOSA.Platform)
+    with pool.kraken() as k:
+        assert k.instances(SOSA.Platform) == {}
+        assert len(k.g) == 0
+
+
+def test_reverse_lookups_of_direct_writes():
+    k = Kraken()
+    k.g.add((FST["s"], SOSA.observes, FST["p"]))
+    k.g.add((FST["p"], SSN.isPropertyOf, FST["f"]))
+    assert k.sensor_of(FST["p"]) == FST["s"]
+    assert k.feature_of(FST["p"]) == FST["f"]
+
+
+def test_reverse_lookups_fall_back_to_the_graph():
+    # a named graph of the dataset mode is written around the index
+    k = Kraken(dataset=True)
+    k.resource("s").add((FST["s"], SOSA.observes, FST["p"]))
+    k.resource("s").add((FST["s2"], SOSA.observes, FST["p"]))
+    assert k.sensor_of(FST["p"]) in (FST["s"], FST["s2"])
+    with pytest.raises(UniquenessError):
+        k.sensor_of(FST["p"], any=False)
+    assert k.sensor_of(FST["q"]) is None
+
+
+def test_observation_of_directly_added_sensor():
+    k = Kraken()
+    k.g.add((FST["s"], SOSA.observes, FST["p"]))
+    k.g.add((FST["p"], SSN.isPropertyOf, FST["f"]))
+    observation = Observation(k, hasResult=FST["r"], observedProperty=FST["p"])
+    assert (observation.iri, SOSA.madeBySensor, FST["s"]) in k.g
+    assert (observation.iri, SOSA.hasFeatureOfInterest, FST["f"]) in k.g
+
+
+def test_index_is_built_on_the_first_lookup():
+    k = Kraken()
+    Thing(k, iri=FST["a"], identifier="a", rdftype=T)
+    assert k.index == {} and "add" in vars(k)  # only built and serialized Krakens never index
+    assert k.find_by_identifier("a") == FST["a"]
+    assert k._identifiers == {"a": {FST["a"]: None}}
+    assert "add" not in vars(k)
+
+    # kept up to date from then on, also for direct writes and removals
+    Thing(k, iri=FST["b"], identifier="b", rdftype=T)
+    k.g.add((FST["c"], RDF.type, T))
+    k.g.remove((FST["a"], None, None))
+    assert list(k.instances(T)) == [FST["b"], FST["c"]]
+
+    k.reset()
+    assert "add" in vars(k)
+    Thing(k, iri=FST["d"], identifier="d", rdftype=T)
+    assert list(k.instances(T)) == [FST["d"]]
@@ -0,0 +1,86 @@
+import pytest
+from rdflib import Graph, Literal
+from rdflib.compare import isomorphic
+from rdflib.namespace import RDF, SOSA, SSN, SDO
+
+from pyKRAKEN.kraken import FST, Kraken, Thing
+from pyKRAKEN.stores import NTriplesLogStore
+
+
+def log_kraken(path, **kwargs):
+    return Kraken(store=NTriplesLogStore(**kwargs), configuration=str(path))
+
+
+def fill(kraken, start, stop):
+    for number in range(start, stop):
+        kraken.add((FST[f"s{number}"], SDO.name, Literal(f"name {number}")))
+        kraken.add((FST[f"s{number}"], RDF.type, SOSA.Sensor))
+
+
+def expected(start, stop):
+    g = Graph()
+    for number in range(start, stop):
+        g.add((FST[f"s{number}"], SDO.name, Literal(f"name {number}")))
+        g.add((FST[f"s{number}"], RDF.type, SOSA.Sensor))
+    return g
+
+
+@pytest.mark.parametrize("name", ["log.nt", "log.nt.gz"])
+def test_write_log_merges_all_subjects(tmp_path, name):
+    k = log_kraken(tmp_path / name, working_set=3)
+    fill(k, 0, 20)
+    fill(k, 5, 10)  # evicted from the working set, written to the log twice
+    k.commit()
+    fill(k, 20, 25)
+    report = k.write_log(tmp_path / "out.nt", format="nt", chunk_lines=7)
+    lines = (tmp_path / "out.nt").read_text(encoding="utf-8").splitlines()
+    assert lines == sorted(set(lines))
+    assert isomorphic(Graph().parse(report["path"], format="nt"), expected(0, 25))
+    k.write_log(tmp_path / "out.ttl", base=FST)
+    assert isomorphic(Graph().parse(tmp_path / "out.ttl", format="turtle"), expected(0, 25))
+    k.close()
+
+
+def test_reopening_starts_a_new_log(tmp_path):
+    k = log_kraken(tmp_path / "log.nt.gz")
+    fill(k, 0, 5)
+    k.close()
+    k = log_kraken(tmp_path / "log.nt.gz")
+    fill(k, 5, 7)
+    k.write_log(tmp_path / "out.nt", format="nt")
+    k.close()
+    assert isomorphic(Graph().parse(tmp_path / "out.nt", format="nt"), expected(5, 7))
+
+
+def test_append_continues_the_log(tmp_path):
+    k = log_kraken(tmp_path / "log.nt")
+    fill(k, 0, 5)
+    k.close()
+    k = log_kraken(tmp_path / "log.nt", append=True)
+    fill(k, 5, 7)
+    k.write_log(tmp_path / "out.nt", format="nt")
+    k.close()
+    assert isomorphic(Graph().parse(tmp_path / "out.nt", format="nt"), expected(0, 7))
+
+
+def test_remove_is_refused(tmp_path):
+    k = log_kraken(tmp_path / "log.nt")
+    fill(k, 0, 1)
+    with pytest.raises(TypeError, match="append only"):
+        k.g.remove((FST["s0"], None, None))
+    k.close()
+
+
+def test_no_entities_are_kept(tmp_path):
+    k = log_kraken(tmp_path / "log.nt", working_set=2)
+    k.add((FST["p"], SSN.isPropertyOf, FST["f"]))
+    k.add((FST["s"], SOSA.observes, FST["p"]))
+    for number in range(10):
+        Thing(k, iri=FST[f"t{number}"], identifier=f"t{number}", rdftype=SOSA.Sensor)
+    assert k._things == {} and k.index == {} and k._identifiers == {}
+    with pytest.raises(ValueError):
+        k.instances(SOSA.Sensor)
+    # the reverse lookups of observations survive the eviction of the sensor
+    assert k.sensor_of(FST["p"], any=False) == FST["s"]
+    assert k.feature_of(FST["p"], any=False) == FST["f"]
+    k.close()
@@ -0,0 +1,59 @@
+import json
+import warnings
+from pathlib import Path
+
+import pytest
+
+from hardcoded_generate_scripts.excel_cache import read_workbook
+from hardcoded_generate_scripts.gitlab_db_sensor import (
+    SENSOR_TABLE_COLUMNS,
+    SUPPORTED_SENSOR_TABLE_SHEET_NAMES,
+    run_script
+)
+
+TABLE = Path(__file__).parent.parent / "excel_tables" / "sensor_table_EXAMPLE.xlsx"
+
+
+@pytest.fixture(scope="module")
+def sheets():
+    return read_workbook(TABLE, sheet_names=SUPPORTED_SENSOR_TABLE_SHEET_NAMES, columns=SENSOR_TABLE_COLUMNS,
+                         skiprows=[1])
+
+
+def run(out, manifest, sheets, **kwargs):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return run_script(TABLE, out, manifest=manifest, sheets=sheets, **kwargs)
+
+
+def test_unchanged_sensors_are_skipped(tmp_path, sheets):
+    out, manifest = tmp_path / "out", tmp_path / "manifest.json"
+    first = run(out, manifest, sheets)
+    assert first["generated"] > 0 and first["unchanged"] == 0
+    hashes = json.loads(manifest.read_text(encoding="utf-8"))
+    assert set(hashes) == {path.name for path in out.iterdir()}
+
+    second = run(out, manifest, sheets)
+    assert second["generated"] == 0
+    assert second["unchanged"] == first["generated"]
+    assert json.loads(manifest.read_text(encoding="utf-8")) == hashes
+
+
+def test_changed_sensors_are_regenerated(tmp_path, sheets):
+    out, manifest = tmp_path / "out", tmp_path / "manifest.json"
+    first = run(out, manifest, sheets)
+    hashes = json.loads(manifest.read_text(encoding="utf-8"))
+    uuids = sorted(hashes)
+
+    # a new image, a deleted serialization
+    (out / uuids[0] / "img" / "photo.jpg").write_bytes(b"jpg")
+    (out / uuids[1] / "rdf.ttl").unlink()
+    second = run(out, manifest, sheets)
+    assert second["generated"] == 2
+    assert (out / uuids[1] / "rdf.ttl").is_file()
+    changed = json.loads(manifest.read_text(encoding="utf-8"))
+    assert changed[uuids[0]] != hashes[uuids[0]]
+    assert changed[uuids[1]] == hashes[uuids[1]] and changed[uuids[2]] == hashes[uuids[2]]
+
+    forced = run(out, manifest, sheets, force=True)
+    assert forced["generated"] == first["generated"] and forced["unchanged"] == 0
@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+
+from hardcoded_generate_scripts.gitlab_db_sensor import SENSOR_TABLE_COLUMNS, SensorRow, normalize_sensor_sheet
+
+
+def test_rows_have_every_field():
+    row, = normalize_sensor_sheet(pd.DataFrame({"uuid": ["a"], "not a table column": [1]}))
+    assert isinstance(row, SensorRow)
+    assert row.uuid == "a"
+    assert all(value is None for field, value in row._asdict().items() if field != "uuid")
+    assert len(row) == len(SENSOR_TABLE_COLUMNS)
+
+
+def test_unknown_and_missing_become_none():
+    rows = normalize_sensor_sheet(pd.DataFrame({"uuid": ["a", "b", "c"],
+                                                "Hersteller": ["Unknown", np.nan, "HBM"],
+                                                "Messbereich von": ["unknown", np.nan, 0]}))
+    assert [row.manufacturer for row in rows] == [None, None, "HBM"]
+    assert [row.range_min for row in rows] == [None, None, 0]
+
+
+def test_numbers():
+    rows = normalize_sensor_sheet(pd.DataFrame({"uuid": ["a", "b", "c", "d"],
+                                                "Messbereich bis": ["2,5", " 10 ", 7, "nicht erkennbar"],
+                                                "Kennlinie Offset _ Bias": [0.5, 1, 2, 3]}))
+    assert [row.range_max for row in rows] == [2.5, 10.0, 7, None]
+    # numbers from the sheet keep their type, 0 stays 0 in the literals instead of becoming 0.0
+    assert [row.bias for row in rows] == [0.5, 1, 2, 3]
+    assert type(rows[2].range_max) is int
+
+
+def test_keywords_are_split():
+    rows = normalize_sensor_sheet(pd.DataFrame({"uuid": ["a", "b", "c"],
+                                                "Bias Uncertainty Keywords": ["GUM;type B", "single", np.nan]}))
+    assert [row.bias_uncertainty_keywords for row in rows] == [["GUM", "type B"], ["single"], None]
@@ -0,0 +1,47 @@
+import os
+import stat
+
+import pytest
+
+from pyKRAKEN.output import OutputWriter, write_if_changed
+
+
+def test_unchanged_content_is_not_written(tmp_path):
+    path = tmp_path / "rdf.ttl"
+    assert write_if_changed(path, "a") is True
+    os.utime(path, (0, 0))
+    assert write_if_changed(path, b"a") is False
+    assert path.stat().st_mtime == 0
+
+    assert write_if_changed(path, "b") is True
+    assert path.read_bytes() == b"b"
+    assert path.stat().st_mtime != 0
+    assert sorted(os.listdir(tmp_path)) == ["rdf.ttl"]  # no temporary files left
+
+
+def test_written_files_get_the_usual_permissions(tmp_path):
+    umask = os.umask(0)
+    os.umask(umask)
+    path = tmp_path / "rdf.ttl"
+    write_if_changed(path, "a")
+    assert stat.S_IMODE(path.stat().st_mode) == 0o666 & ~umask
+
+
+def test_failed_write_keeps_nothing(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        write_if_changed(tmp_path / "missing" / "rdf.ttl", "a")
+    assert os.listdir(tmp_path) == []
+
+
+def test_writer_counts_and_raises(tmp_path):
+    write_if_changed(tmp_path / "0", "0")
+    with OutputWriter(workers=2, max_pending=2) as writer:
+        for number in range(5):
+            writer.write(tmp_path / str(number), str(number))
+    assert (writer.written, writer.unchanged) == (4, 1)
+    assert (tmp_path / "4").read_text() == "4"
+
+    writer = OutputWriter()
+    writer.write(tmp_path / "missing" / "rdf.ttl", "a")
+    with pytest.raises(FileNotFoundError):
+        writer.close()
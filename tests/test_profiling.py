@@ -0,0 +1,47 @@
+import pytest
+
+from pyKRAKEN.kraken import FST, Kraken, Thing
+from pyKRAKEN.profiling import instrumented
+
+
+def test_constructors_are_only_timed_inside_profiling():
+    k = Kraken(profile=True)
+    Thing(k, iri=FST["a"], identifier="a", name="a")
+    assert k.stats()["calls"] == {}
+    assert k.stats()["triples"]["Thing"] == 2
+
+    with k.profiling():
+        Thing(k, iri=FST["b"], identifier="b", name="b")
+    calls = k.stats()["calls"]
+    assert calls["Thing.__init__"]["calls"] == 1
+    assert calls["Thing.identifier"]["calls"] == 1
+
+
+def test_classes_are_restored_after_the_block():
+    init, identifier = Thing.__init__, vars(Thing)["identifier"]
+    k = Kraken(profile=True)
+    with pytest.raises(RuntimeError):
+        with k.profiling():
+            assert Thing.__init__ is not init
+            raise RuntimeError("interrupted")
+    assert Thing.__init__ is init
+    assert vars(Thing)["identifier"] is identifier
+
+    Thing(k, iri=FST["a"], identifier="a", name="a")
+    assert k.stats()["calls"] == {}
+
+
+def test_nested_blocks_are_refused():
+    init = Thing.__init__
+    with instrumented(Thing):
+        with pytest.raises(ValueError):
+            with instrumented(Thing):
+                pass
+        assert Thing.__init__ is not init
+    assert Thing.__init__ is init
+
+
+def test_profiling_needs_a_profiler():
+    with pytest.raises(ValueError):
+        with Kraken().profiling():
+            pass
@@ -0,0 +1,121 @@
+import h5py
+import numpy as np
+import pytest
+from rdflib import Graph, URIRef
+from rdflib.compare import isomorphic
+from rdflib.namespace import SOSA
+
+from pyKRAKEN.kraken import FST, H5PATH_RDF_METADATA, UNIT, Kraken, Result, ResultData, Thing
+
+
+def relative(graph):
+    # the dataset iris are stored relative to the file, parsing resolves them against the working directory
+    def strip(term):
+        return URIRef(term[term.index("#/"):]) if isinstance(term, URIRef) and "#/" in term else term
+
+    stripped = Graph()
+    for s, p, o in graph:
+        stripped.add((strip(s), strip(p), strip(o)))
+    return stripped
+
+
+def test_dataset_is_named_after_the_uuid(tmp_path):
+    k = Kraken(filepath=str(tmp_path / "run.h5"))
+    result = Result(k, unit=UNIT.BAR, h5path="/data", data=np.arange(10.0), identifier="pressure")
+    assert result.h5path == f"/data/{result._uuid}"
+    assert sorted(result.identifier) == sorted([str(result._uuid), "pressure"])
+    np.testing.assert_array_equal(result.data[2:4], [2.0, 3.0])
+
+
+def test_dataset_is_named_after_the_given_identifier(tmp_path):
+    k = Kraken(filepath=str(tmp_path / "run.h5"))
+    result = Result(k, unit=UNIT.BAR, h5path="/data", iri=FST["r"], identifier="pressure", stream=True)
+    assert result.h5path == "/data/pressure"
+    with k.h5file():
+        result.append(np.zeros(3))
+        result.append(np.ones(2))
+    np.testing.assert_array_equal(result.data[:], [0, 0, 0, 1, 1])
+    assert Result.from_graph(k, FST["r"]).h5path == "/data/pressure"
+    assert FST["r"] in k.instances(SOSA.Result)
+
+
+def test_iri_without_identifier_is_refused(tmp_path):
+    k = Kraken(filepath=str(tmp_path / "run.h5"))
+    with pytest.raises(ValueError):
+        Result(k, unit=UNIT.BAR, h5path="/data", iri=FST["r"], data=np.zeros(2), name="r")
+
+
+def test_save_and_open_h5(tmp_path):
+    path = str(tmp_path / "run.h5")
+    k = Kraken(filepath=path)
+    Thing(k, iri=FST["sensor"], identifier="sensor", name="sensor", rdftype=SOSA.Sensor)
+    pressure = Result(k, unit=UNIT.BAR, h5path="/data", data=np.arange(100.0), name="pressure")
+    k.save_h5()
+
+    opened = Kraken.open_h5(path)
+    assert isomorphic(relative(opened.g), relative(k.g))
+    result, = opened.results()
+    assert result.iri == pressure.iri and result.h5path == pressure.h5path
+    assert result.unit == UNIT.BAR
+    np.testing.assert_array_equal(result.data[10:13], [10.0, 11.0, 12.0])
+
+
+def test_saving_twice_resizes_the_metadata(tmp_path):
+    path = str(tmp_path / "run.h5")
+    k = Kraken(filepath=path)
+    Result(k, unit=UNIT.BAR, h5path="/data", data=np.ones(5))
+    k.save_h5()
+    with h5py.File(path, "r") as f:
+        first = f[H5PATH_RDF_METADATA].shape
+
+    Thing(k, iri=FST["sensor"], identifier="sensor", name="a sensor added after the first save")
+    k.save_h5()
+    with h5py.File(path, "r") as f:
+        dset = f[H5PATH_RDF_METADATA]
+        assert dset.maxshape == (None,) and dset.shape[0] > first[0]
+        assert dset.attrs["format"] == "turtle"
+        np.testing.assert_array_equal(f[k.results()[0].h5path][:], np.ones(5))  # measurement data untouched
+    assert isomorphic(relative(Kraken.open_h5(path).g), relative(k.g))
+
+
+def test_open_h5_without_metadata(tmp_path):
+    path = str(tmp_path / "run.h5")
+    h5py.File(path, "w").close()
+    with pytest.raises(LookupError):
+        Kraken.open_h5(path)
+
+
+def test_contiguous_data_is_memory_mapped(tmp_path):
+    path = str(tmp_path / "run.h5")
+    k = Kraken(filepath=path)
+    data = np.arange(1000.0).reshape(500, 2)
+    contiguous = Result(k, unit=UNIT.BAR, h5path="/data", data=data, chunks=None, compression=None)
+    compressed = Result(k, unit=UNIT.BAR, h5path="/data", data=data)
+    k.save_h5()
+
+    by_iri = {result.iri: result for result in Kraken.open_h5(path).results()}
+    lazy_contiguous = by_iri[contiguous.iri].data
+    lazy_compressed = by_iri[compressed.iri].data
+    assert isinstance(lazy_contiguous, ResultData) and lazy_contiguous.is_memmap
+    assert not lazy_compressed.is_memmap
+    for lazy in (lazy_contiguous, lazy_compressed):
+        assert lazy.shape == (500, 2) and len(lazy) == 500 and lazy.ndim == 2
+        np.testing.assert_array_equal(lazy[100:103, 1], data[100:103, 1])
+        np.testing.assert_array_equal(np.asarray(lazy), data)
+
+
+def test_write_replaces_and_append_streams(tmp_path):
+    k = Kraken(filepath=str(tmp_path / "run.h5"))
+    result = Result(k, unit=UNIT.BAR, h5path="/data", data=np.zeros(10))
+    result.write(np.ones(3))
+    np.testing.assert_array_equal(result.data[:], np.ones(3))
+
+    stream = Result(k, unit=UNIT.V, h5path="/data", stream=True)
+    with k.h5file():
+        for number in range(4):
+            stream.append(np.full((5, 2), number))
+        stream.append(np.array([[9, 9]]))
+    samples = stream.data
+    assert samples.shape == (21, 2)
+    np.testing.assert_array_equal(samples[4:6, 0], [0, 1])
+    np.testing.assert_array_equal(samples[-1], [9, 9])
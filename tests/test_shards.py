@@ -0,0 +1,83 @@
+from rdflib import BNode, Dataset, Graph, Literal, URIRef
+from rdflib.compare import isomorphic
+from rdflib.namespace import RDF, SDO
+
+from pyKRAKEN.kraken import FST, Kraken
+
+OTHER = URIRef("http://example.org/other")
+
+
+def fill(k):
+    # a with a nested blank node, b, a subject outside of FST and an unreferenced blank node.
+    # the dataset mode routes a blank node when its referencing triple is added, so they come first
+    outer, inner, loose = BNode(), BNode(), BNode()
+    triples = {
+        "a": [(FST["a"], RDF.type, SDO.Thing), (FST["a/Capability"], SDO.name, Literal("capability")),
+              (FST["a"], SDO.subjectOf, outer), (outer, SDO.hasPart, inner), (inner, SDO.name, Literal("inner"))],
+        "b": [(FST["b"], SDO.name, Literal("b"))],
+        None: [(OTHER, SDO.about, FST["a"]), (loose, SDO.name, Literal("loose"))],
+    }
+    for shard in triples.values():
+        for triple in shard:
+            k.add(triple)
+    return {key: set(shard) for key, shard in triples.items()}
+
+
+def test_shard_by_resource():
+    k = Kraken()
+    triples = fill(k)
+    shards = k.shard_by_resource(FST)
+    assert set(shards) == {"a", "b", None}
+    for key, graph in shards.items():
+        assert set(graph) == triples[key]
+    assert dict(shards["a"].namespaces())["fst"] == URIRef(str(FST))
+
+
+def test_write_shards(tmp_path):
+    k = Kraken()
+    triples = fill(k)
+    reports = k.write_shards(tmp_path, quiet=True)
+    assert set(reports) == {"a", "b"}
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["a", "b"]
+    for key in ("a", "b"):
+        assert sorted(path.name for path in (tmp_path / key).iterdir()) == ["rdf.json", "rdf.ttl", "rdf.xml"]
+        expected = Graph()
+        for triple in triples[key]:
+            expected.add(triple)
+        assert isomorphic(Graph().parse(tmp_path / key / "rdf.json", format="json-ld"), expected)
+
+
+def test_dataset_mode_routes_triples_into_named_graphs():
+    k = Kraken(dataset=True)
+    triples = fill(k)
+    shards = k.shard_by_resource(FST)
+    assert set(shards) == {"a", "b", None}
+    assert shards["a"].identifier == URIRef(f"{FST}a/")
+    for key, graph in shards.items():
+        assert set(graph) == triples[key]
+    assert len(k.g) == sum(len(shard) for shard in triples.values())
+
+
+def test_remove_and_replace_resource(tmp_path):
+    k = Kraken(dataset=True)
+    triples = fill(k)
+    k.remove_resource("a")
+    assert set(k.g.triples((None, None, None))) == triples["b"] | triples[None]
+
+    fresh = Graph()
+    blank = BNode()
+    fresh.add((FST["a"], SDO.name, Literal("new a")))
+    fresh.add((FST["a"], SDO.subjectOf, blank))
+    fresh.add((blank, SDO.name, Literal("new part")))
+    k.replace_resource("a", fresh)
+    assert set(k.resource("a")) == set(fresh)
+
+    report = k.write_nquads(tmp_path / "all.nq")
+    assert report["bytes"] == (tmp_path / "all.nq").stat().st_size
+    written = Dataset()
+    written.parse(tmp_path / "all.nq", format="nquads")
+    graphs = {graph.identifier: graph for graph in written.graphs() if len(graph)}
+    assert len(graphs[URIRef(f"{FST}a/")]) == 3
+    assert {o for o in graphs[URIRef(f"{FST}a/")].objects(None, SDO.name)} == {Literal("new a"), Literal("new part")}
+    assert len(graphs[URIRef(f"{FST}b/")]) == 1
+    assert sum(len(graph) for graph in graphs.values()) == len(k.g)
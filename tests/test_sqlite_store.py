@@ -0,0 +1,51 @@
+import pytest
+from rdflib import Literal, URIRef
+from rdflib.namespace import DCTERMS
+
+from pyKRAKEN.kraken import FST, Kraken, Thing
+
+T = URIRef("http://example.org/T")
+
+
+def test_committed_triples_survive_reopening(tmp_path):
+    path = str(tmp_path / "graph.sqlite")
+    k = Kraken(store="SQLite", configuration=path)
+    Thing(k, iri=FST["a"], identifier="a", name="a", rdftype=T)
+    k.commit()
+    k.close()
+
+    k = Kraken(store="SQLite", configuration=path)
+    assert (FST["a"], DCTERMS.identifier, Literal("a")) in k.g
+    assert list(k.instances(T)) == [FST["a"]]
+    assert k.find_by_identifier("a") == FST["a"]
+    assert k.g.namespace_manager.store.namespace("fst") == URIRef(str(FST))
+    k.close()
+
+
+def test_rollback_drops_uncommitted_triples_and_their_index(tmp_path):
+    k = Kraken(store="SQLite", configuration=str(tmp_path / "graph.sqlite"))
+    Thing(k, iri=FST["a"], identifier="a", rdftype=T)
+    k.commit()
+    Thing(k, iri=FST["b"], identifier="b", rdftype=T)
+    assert len(k.instances(T)) == 2
+    k.rollback()
+    assert (FST["b"], DCTERMS.identifier, Literal("b")) not in k.g
+    assert list(k.instances(T)) == [FST["a"]]
+    assert k.find_by_identifier("b") is None
+    k.close()
+
+
+def test_transaction_rolls_back_on_error(tmp_path):
+    path = str(tmp_path / "graph.sqlite")
+    k = Kraken(store="SQLite", configuration=path)
+    with pytest.raises(RuntimeError):
+        with k.transaction():
+            Thing(k, iri=FST["a"], identifier="a", rdftype=T)
+            raise RuntimeError("interrupted")
+    with k.transaction():
+        Thing(k, iri=FST["b"], identifier="b", rdftype=T)
+    k.close(commit_pending_transaction=False)
+
+    k = Kraken(store="SQLite", configuration=path)
+    assert list(k.instances(T)) == [FST["b"]]
+    k.close()
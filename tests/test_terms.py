@@ -0,0 +1,42 @@
+from rdflib import Literal, URIRef
+from rdflib.namespace import SDO, XSD
+
+from pyKRAKEN.kraken import FST, Kraken, Thing
+from pyKRAKEN.terms import TermPool
+
+
+def test_equal_terms_are_shared():
+    terms = TermPool()
+    first = terms.intern(Literal("FST"))
+    assert terms.intern(Literal("FST")) is first
+    assert terms.intern(URIRef(str(SDO.name))) is terms.intern(SDO.name)
+    assert terms.intern_triple((FST["a"], SDO.name, Literal("FST")))[2] is first
+    assert len(terms) == 3 and Literal("FST") in terms
+
+
+def test_unequal_terms_stay_apart():
+    terms = TermPool()
+    # equal as str, but other terms
+    assert terms.intern(Literal("http://example.org/")) is not terms.intern(URIRef("http://example.org/"))
+    assert terms.intern(Literal("1")) is not terms.intern(Literal("1", datatype=XSD.integer))
+    assert terms.intern(Literal("1", lang="en")) is not terms.intern(Literal("1", lang="de"))
+    assert len(terms) == 6
+    terms.clear()
+    assert len(terms) == 0
+
+
+def build(**kwargs):
+    k = Kraken(**kwargs)
+    for number in range(3):
+        Thing(k, iri=FST[f"thing/{number}"], identifier=str(number), name="thing", comment="FST")
+    return k
+
+
+def test_pooled_graphs_are_equal():
+    terms = TermPool()
+    plain, other_plain, pooled, other = build(), build(), build(terms=terms), build(terms=terms)
+    assert set(pooled.g) == set(plain.g)
+    assert set(other.g) == set(plain.g)
+    # one literal object in the graphs sharing the pool, one per graph without it
+    assert len({id(o) for k in (pooled, other) for o in k.g.objects(None, SDO.name)}) == 1
+    assert len({id(o) for k in (plain, other_plain) for o in k.g.objects(None, SDO.name)}) == 2
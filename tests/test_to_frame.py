@@ -0,0 +1,28 @@
+from rdflib import Literal
+from rdflib.namespace import RDF, SDO, SOSA
+
+from pyKRAKEN.kraken import FST, Kraken
+
+
+def example(reverse=False):
+    triples = [(FST["s"], RDF.type, SOSA.Sensor), (FST["s"], SDO.name, Literal("sensor")),
+               (FST["s"], SDO.serialNumber, Literal("123")), (FST["s"], SDO.keywords, Literal("b")),
+               (FST["s"], SDO.keywords, Literal("a")), (FST["s"], SDO.manufacturer, Literal("FST"))]
+    k = Kraken()
+    for triple in reversed(triples) if reverse else triples:
+        k.add(triple)
+    return k
+
+
+def test_columns_are_sorted():
+    frame = example().to_frame(SOSA.Sensor)
+    assert list(frame.columns) == ["schema:keywords", "schema:manufacturer", "schema:name", "schema:serialNumber"]
+    assert frame.loc[FST["s"], "schema:keywords"] == ["a", "b"]
+    assert frame.equals(example(reverse=True).to_frame(SOSA.Sensor))
+
+
+def test_given_columns():
+    frame = example().to_frame(SOSA.Sensor, columns=["schema:serialNumber", "schema:name", "schema:description"])
+    assert list(frame.columns) == ["schema:serialNumber", "schema:name", "schema:description"]
+    assert frame.loc[FST["s"], "schema:name"] == "sensor"
+    assert frame["schema:description"].isna().all()
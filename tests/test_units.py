@@ -0,0 +1,48 @@
+import pytest
+
+from pyKRAKEN.units import UNIT, QUANTITYKIND, convert, conversion_factor, find_unit, quantity_kind, unit_iri
+
+
+@pytest.mark.parametrize("spelling", ["k", "a", "n", "MV", "mv", "kpa"])
+def test_wrong_case_symbols_are_unknown(spelling):
+    assert find_unit(spelling) is None
+
+
+@pytest.mark.parametrize("spelling, iri", [("K", UNIT.K), ("A", UNIT.A), ("N", UNIT.N), ("mV", UNIT.MilliV),
+                                           ("kPa", UNIT.KiloPA), ("KiloPA", UNIT.KiloPA), ("l", UNIT.L),
+                                           ("m^3 / s", UNIT["M3-PER-SEC"]), ("µV", UNIT.MicroV)])
+def test_symbols_codes_and_local_names(spelling, iri):
+    assert find_unit(spelling).iri == iri
+
+
+@pytest.mark.parametrize("spelling, iri", [("bar", UNIT.BAR), ("BAR", UNIT.BAR), ("percent", UNIT.PERCENT),
+                                           ("kilopascal", UNIT.KiloPA), ("Grad Celsius", UNIT.DEG_C)])
+def test_labels_in_any_case(spelling, iri):
+    assert find_unit(spelling).iri == iri
+
+
+def test_unknown_unit_raises():
+    with pytest.raises(LookupError):
+        unit_iri("furlong")
+
+
+def test_quantity_kind_of_sheet_name():
+    assert quantity_kind("Druck") == QUANTITYKIND.Pressure
+    with pytest.raises(LookupError):
+        quantity_kind("Geschmack")
+
+
+def test_conversion():
+    assert conversion_factor("bar", "kPa") == pytest.approx(100)
+    assert convert(20, "°C", "K") == pytest.approx(293.15)
+    # qudt offsets are added before multiplying: si value = (value + offset) * multiplier
+    assert convert(212, "°F", "°C") == pytest.approx(100, abs=1e-3)
+    assert convert(-40, "°C", "°F") == pytest.approx(-40, abs=1e-3)
+    assert convert(0, "K", "°F") == pytest.approx(-459.669607)
+    with pytest.raises(ValueError):
+        conversion_factor("bar", "m")
+    with pytest.raises(ValueError):
+        conversion_factor("°C", "K")
+    with pytest.raises(ValueError):
+        conversion_factor("°F", "°C")
+    assert conversion_factor("°C", "°C") == 1
@@ -0,0 +1,61 @@
+import json
+
+import pandas as pd
+
+from hardcoded_generate_scripts.gitlab_db_sensor import FIRST_DATA_LINE, validate_sensor_sheets
+
+
+def row(uuid, ident_number, **values):
+    return {"uuid": uuid, "Ident-Nummer": ident_number, "Messbereich von": 0, "Messbereich bis": 10,
+            "Messbereich Einheit": "bar", "Ausgabebereich von": 0, "Ausgabebereich bis": "5,0",
+            "Ausgabebereich Einheit": "V", **values}
+
+
+def test_valid_sheets():
+    dfs = {"Druck": pd.DataFrame([row("a", 1), row("b", 2)]), "Kraft": pd.DataFrame([row("c", 3)])}
+    report = validate_sensor_sheets(dfs, ["Druck", "Kraft"])
+    assert report == {"valid": True, "rows": 3, "invalid_rows": 0, "missing_sheets": [], "missing_columns": {},
+                      "errors": [], "invalid": {}}
+    json.dumps(report)
+
+
+def test_bad_rows_are_reported():
+    dfs = {"Druck": pd.DataFrame([row("a", 1),
+                                  row("b", 2, **{"Messbereich bis": "nicht erkennbar"}),
+                                  row("c", 3, **{"Ausgabebereich Einheit": "furlong"}),
+                                  row(None, 4)])}
+    report = validate_sensor_sheets(dfs, ["Druck"])
+    assert not report["valid"]
+    assert report["rows"] == 4 and report["invalid_rows"] == 3
+    assert report["invalid"] == {"Druck": [1, 2, 3]}
+    assert [(error["line"], error["column"], error["error"]) for error in report["errors"]] == [
+        (FIRST_DATA_LINE + 1, "Messbereich bis", "not a number"),
+        (FIRST_DATA_LINE + 2, "Ausgabebereich Einheit", "unit not in the qudt snapshot"),
+        (FIRST_DATA_LINE + 3, "uuid", "missing uuid"),
+    ]
+    assert report["errors"][0] == {"sheet": "Druck", "line": FIRST_DATA_LINE + 1, "uuid": "b",
+                                   "column": "Messbereich bis", "value": "nicht erkennbar", "error": "not a number"}
+
+
+def test_missing_sheets_and_columns():
+    dfs = {"Druck": pd.DataFrame([row("a", 1)]).drop(columns=["Messbereich Einheit"]),
+           "Weg": pd.DataFrame()}
+    report = validate_sensor_sheets(dfs, ["Druck", "Kraft", "Weg"])
+    assert not report["valid"]
+    assert report["missing_sheets"] == ["Kraft"]
+    assert report["missing_columns"] == {"Druck": ["Messbereich Einheit"]}
+    assert report["invalid"] == {"Druck": [0]}
+
+
+def test_duplicates_over_all_sheets_are_rejected():
+    dfs = {"Druck": pd.DataFrame([row("a", 1), row("b", 2)]),
+           "Kraft": pd.DataFrame([row("c", 3), row("a", 4), row("d", 2)])}
+    report = validate_sensor_sheets(dfs, ["Druck", "Kraft"])
+    # every occurrence is invalid, not only the later ones
+    assert report["invalid"] == {"Druck": [0, 1], "Kraft": [1, 2]}
+    assert sorted((error["sheet"], error["line"], error["error"]) for error in report["errors"]) == [
+        ("Druck", FIRST_DATA_LINE, "uuid used more than once"),
+        ("Druck", FIRST_DATA_LINE + 1, "Ident-Nummer used more than once"),
+        ("Kraft", FIRST_DATA_LINE + 1, "uuid used more than once"),
+        ("Kraft", FIRST_DATA_LINE + 2, "Ident-Nummer used more than once"),
+    ]
@@ -0,0 +1,33 @@
+import warnings
+from pathlib import Path
+
+from hardcoded_generate_scripts.excel_cache import read_workbook
+from hardcoded_generate_scripts.gitlab_db_sensor import (
+    SENSOR_TABLE_COLUMNS,
+    SUPPORTED_SENSOR_TABLE_SHEET_NAMES,
+    run_script
+)
+
+TABLE = Path(__file__).parent.parent / "excel_tables" / "sensor_table_EXAMPLE.xlsx"
+
+
+def files(directory):
+    return {str(path.relative_to(directory)): path.read_bytes() for path in sorted(directory.rglob("*"))
+            if path.is_file()}
+
+
+def test_workers_write_the_same_files(tmp_path):
+    sheets = read_workbook(TABLE, sheet_names=SUPPORTED_SENSOR_TABLE_SHEET_NAMES, columns=SENSOR_TABLE_COLUMNS,
+                           skiprows=[1])
+    summaries = {}
+    for workers in (1, 2):
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            summaries[workers] = run_script(TABLE, tmp_path / f"{workers}", sheets=sheets, workers=workers)
+        summaries[workers].pop("seconds")
+        summaries[workers].pop("rows_per_second")
+    assert summaries[1] == summaries[2]
+    assert summaries[1]["generated"] > 0
+    sequential, parallel = files(tmp_path / "1"), files(tmp_path / "2")
+    assert len(sequential) == 3 * summaries[1]["generated"]
+    assert sequential == parallel
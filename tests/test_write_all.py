@@ -0,0 +1,32 @@
+import pytest
+from rdflib import Literal, URIRef
+from rdflib.namespace import SDO
+
+import pyKRAKEN.kraken
+from pyKRAKEN.kraken import FST, SERIALIZATION_FORMATS, Kraken
+
+
+def example(store="AppendOnly"):
+    k = Kraken(store=store)
+    for number in range(20):
+        k.add((FST[f"a/{number}"], SDO.name, Literal(f"name {number}")))
+        k.add((FST[f"a/{number}"], SDO.image, URIRef("img/photo.png")))
+    return k
+
+
+def test_serializes_in_process_by_default(tmp_path):
+    pyKRAKEN.kraken._shutdown_serialization_pool()
+    report = example().write_all(tmp_path, base=FST["a/"], quiet=True)
+    assert pyKRAKEN.kraken._serialization_pool is None
+    assert sorted(report) == sorted(SERIALIZATION_FORMATS)
+    assert all(entry["written"] for entry in report.values())
+
+
+@pytest.mark.parametrize("store", ["AppendOnly", "default"])
+def test_workers_write_the_same_files(tmp_path, store):
+    example(store).write_all(tmp_path / "one", base=FST["a/"], quiet=True)
+    example(store).write_all(tmp_path / "pool", base=FST["a/"], workers=2, quiet=True)
+    for filename, _ in SERIALIZATION_FORMATS.values():
+        assert (tmp_path / "one" / filename).read_bytes() == (tmp_path / "pool" / filename).read_bytes()
+    report = example(store).write_all(tmp_path / "pool", base=FST["a/"], quiet=True)
+    assert not any(entry["written"] for entry in report.values())